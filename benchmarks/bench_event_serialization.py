@@ -0,0 +1,81 @@
+"""Microbenchmark: hardware event body serialization, events per second on one core.
+
+Compares the former path (build the 9-key event dict, str(datetime.now(UTC)),
+json.dumps, encode) with the pre-serialized per-bit template used by
+OpenA3XXMessagingService.publish_hardware_event. Both produce identical bytes;
+the spool append itself is not included.
+
+Usage:
+    python benchmarks/bench_event_serialization.py [--iterations 200000]
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from opena3xx.amqp.opena3xx_event_templates import OpenA3XXHardwareEventTemplate  # noqa: E402
+
+BIT_DETAILS = dict(
+    extender_bus_id=2,
+    extender_bus_name="Bus2",
+    extender_bit_id=37,
+    extender_bit_name="Bit5",
+    bus_bit=5,
+    is_input=True,
+    input_selector_name="Overhead Panel - APU Master Switch",
+    input_selector_id=137,
+    last_value=True,
+)
+
+
+def dict_and_json(pressed: bool) -> bytes:
+    """The former publish path: dict copy, datetime string and JSON encoding."""
+    message = {
+        "hardware_board_id": 1,
+        "extender_bit_id": BIT_DETAILS["extender_bit_id"],
+        "extender_bit_name": BIT_DETAILS["extender_bit_name"],
+        "extender_bus_id": BIT_DETAILS["extender_bus_id"],
+        "extender_bus_name": BIT_DETAILS["extender_bus_name"],
+        "input_selector_name": BIT_DETAILS["input_selector_name"],
+        "input_selector_id": BIT_DETAILS["input_selector_id"],
+        "pressed": bool(pressed),
+        "timestamp": str(dt.datetime.now(dt.UTC)),
+    }
+    return json.dumps(message).encode("utf-8")
+
+
+def _events_per_second(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i & 1)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    template = OpenA3XXHardwareEventTemplate(1, BIT_DETAILS)
+    # Same instant rendered both ways must give the same bytes
+    now_ns = time.time_ns()
+    now = dt.datetime.fromtimestamp(now_ns // 1_000_000_000, dt.UTC).replace(
+        microsecond=(now_ns % 1_000_000_000) // 1000)
+    expected = json.loads(dict_and_json(True))
+    expected["timestamp"] = str(now)
+    assert template.render(True, now_ns) == json.dumps(expected).encode("utf-8")
+
+    before = _events_per_second(dict_and_json, args.iterations)
+    after = _events_per_second(template.render, args.iterations)
+    print(f"dict + json.dumps : {before:12.0f} events/s")
+    print(f"byte template     : {after:12.0f} events/s")
+    print(f"speedup           : {after / before:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
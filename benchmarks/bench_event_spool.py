@@ -0,0 +1,160 @@
+"""Benchmark: event spooling, file-per-event directory vs segmented log tiers.
+
+Compares the former directory spool with the event log in the "event"
+(fsync per event, group commit) and "periodic" (fsync every 50 ms) durability
+tiers and with the memory-only ring buffer.
+
+Enqueue side: N producer threads each spool --events messages and the per-call
+latency is recorded (p50/p99) together with the aggregate events/s. Drain side:
+one consumer reads and acknowledges every spooled event in FIFO order, the way
+the publisher thread does (AMQP publishing itself is not included).
+
+Usage:
+    python benchmarks/bench_event_spool.py [--events 2000] [--producers 1 4] [--dir /tmp]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from opena3xx.spool import OpenA3XXEventLog, OpenA3XXMemoryEventQueue  # noqa: E402
+
+
+def _message(i: int) -> dict:
+    return {
+        "hardware_board_id": 1,
+        "extender_bit_id": i % 128,
+        "extender_bit_name": f"Bit{i % 16}",
+        "extender_bus_id": (i // 16) % 8,
+        "extender_bus_name": f"Bus{(i // 16) % 8}",
+        "input_selector_name": f"Selector {i % 128}",
+        "input_selector_id": i % 128,
+        "pressed": bool(i & 1),
+        "timestamp": "2024-01-01 00:00:00.000000+00:00",
+    }
+
+
+class DirectorySpool:
+    """The former spool: one fsynced JSON file per event, FIFO by file name."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def append(self, message: dict) -> None:
+        ts_ms = int(time.time() * 1000)
+        name = f"{ts_ms:013d}_{uuid.uuid4().hex}.json"
+        tmp = self.path / (name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(message, separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path / name)
+
+    def drain(self) -> int:
+        count = 0
+        while True:
+            files = sorted((p for p in self.path.iterdir() if p.suffix == ".json"), key=lambda p: p.name)
+            if not files:
+                return count
+            with open(files[0], "r", encoding="utf-8") as f:
+                json.dumps(json.loads(f.read()))
+            files[0].unlink()
+            count += 1
+
+
+class LogSpool:
+    sync_interval_ms = 0
+
+    def __init__(self, path: Path):
+        self.log = self._open(path)
+
+    def _open(self, path: Path):
+        return OpenA3XXEventLog(path, sync_interval_ms=self.sync_interval_ms)
+
+    def append(self, message: dict) -> None:
+        self.log.append(json.dumps(message).encode("utf-8"), key=message["input_selector_id"],
+                        sync=not self.sync_interval_ms)
+
+    def drain(self) -> int:
+        count = 0
+        while True:
+            records = self.log.read(1)
+            if not records:
+                return count
+            self.log.ack(records[0].seq)
+            count += 1
+
+    def close(self) -> None:
+        self.log.close()
+
+
+class PeriodicLogSpool(LogSpool):
+    sync_interval_ms = 50
+
+
+class MemorySpool(LogSpool):
+    def _open(self, path: Path):
+        return OpenA3XXMemoryEventQueue(1_000_000)
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def _run(spool, producers: int, events: int):
+    latencies = [[] for _ in range(producers)]
+
+    def produce(slot: int):
+        out = latencies[slot]
+        for i in range(events):
+            message = _message(i)
+            start = time.perf_counter_ns()
+            spool.append(message)
+            out.append(time.perf_counter_ns() - start)
+
+    threads = [threading.Thread(target=produce, args=(slot,)) for slot in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    enqueue_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drained = spool.drain()
+    drain_s = time.perf_counter() - start
+
+    if hasattr(spool, "close"):
+        spool.close()
+    samples = [x for out in latencies for x in out]
+    return (len(samples) / enqueue_s, _percentile(samples, 50) / 1000.0, _percentile(samples, 99) / 1000.0,
+            drained / drain_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000, help="events per producer")
+    parser.add_argument("--producers", type=int, nargs="*", default=[1, 4])
+    parser.add_argument("--dir", default=None, help="directory on the filesystem to test")
+    args = parser.parse_args()
+
+    print(f"{'spool':<14} {'producers':>9} {'enqueue/s':>11} {'p50 us':>9} {'p99 us':>9} {'drain/s':>11}")
+    for producers in args.producers:
+        for name, factory in (("directory", DirectorySpool), ("log/event", LogSpool),
+                              ("log/periodic", PeriodicLogSpool), ("memory", MemorySpool)):
+            with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+                rate, p50, p99, drain = _run(factory(Path(tmp)), producers, args.events)
+            print(f"{name:<14} {producers:>9} {rate:>11.0f} {p50:>9.1f} {p99:>9.1f} {drain:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
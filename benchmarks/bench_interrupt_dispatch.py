@@ -0,0 +1,176 @@
+"""Microbenchmark: per-interrupt lookup cost in OpenA3XXHardwareService.bus_interrupt.
+
+Compares the previous linear scans (bus list, full bit list, nested int()
+matching) with the real OpenA3XXHardwareService.bus_interrupt, which goes
+through the precomputed InterruptDispatchIndex, the INTF/INTCAP snapshot,
+debouncing and change detection. The I2C device, GPIO LEDs and publishing
+are replaced by no-ops so only the dispatch work is measured. Every
+interrupt toggles the flagged bits, so each one publishes.
+
+Needs the hardware service dependencies (requirements.txt) to import.
+
+Usage:
+    python benchmarks/bench_interrupt_dispatch.py [--buses 8] [--iterations 200000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from opena3xx.hardware.gpio_shim import GPIO, _BackendBase  # noqa: E402
+from opena3xx.hardware.opena3xx_debounce import BitDebouncer  # noqa: E402
+from opena3xx.hardware.opena3xx_dispatch import ExtenderBusRecord  # noqa: E402
+from opena3xx.hardware.opena3xx_mcp23017 import OpenA3XXHardwareService  # noqa: E402
+
+INTERRUPT_PINS = [16, 17, 22, 23, 24, 25, 26, 27]
+
+
+class _FakePin:
+    value = False
+
+
+class _FakeI2CDevice:
+    """INTF/INTCAP block read: the flagged bits, with levels toggling on every read."""
+
+    def __init__(self, flag_mask: int):
+        self.flag_mask = flag_mask
+        self.levels = 0xFFFF
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def write_then_readinto(self, _out, buffer):
+        self.levels ^= self.flag_mask
+        buffer[0] = self.flag_mask & 0xFF
+        buffer[1] = self.flag_mask >> 8
+        buffer[2] = self.levels & 0xFF
+        buffer[3] = self.levels >> 8
+
+
+class _FakeBus:
+    def __init__(self, flags):
+        self.int_flag = flags
+        self._device = _FakeI2CDevice(sum(1 << flag for flag in set(flags)))
+
+    def clear_ints(self):
+        pass
+
+
+class _NoGpio(_BackendBase):
+    def write(self, pin: int, value: int) -> None:
+        pass
+
+
+class _NoMessaging:
+    def publish_hardware_event(self, _board_id, _details, _pressed=None):
+        pass
+
+    def publish_hardware_event_batch(self, _board_id, _changes):
+        pass
+
+
+def _build_topology(bus_count: int, flags: list):
+    buses, bits = [], []
+    for bus_id in range(bus_count):
+        bus = {
+            "extender_bus_id": bus_id,
+            "extender_bus_name": f"Bus{bus_id}",
+            "bus_instance": _FakeBus(flags),
+            "interrupt_pin": INTERRUPT_PINS[bus_id],
+        }
+        buses.append(bus)
+        for bus_bit in range(16):
+            bits.append(dict(
+                extender_bus_id=bus_id,
+                extender_bus_name=f"Bus{bus_id}",
+                extender_bit_id=bus_id * 16 + bus_bit,
+                extender_bit_name=f"Bit{bus_bit}",
+                bus_bit=bus_bit,
+                is_input=True,
+                input_selector_name=f"Selector {bus_id}.{bus_bit}",
+                input_selector_id=bus_id * 16 + bus_bit,
+                extender_bit_instance=_FakePin(),
+                last_value=True,
+            ))
+    return buses, bits
+
+
+def _publish(_board_id, _details, _pressed=None):
+    pass
+
+
+def linear_scan_interrupt(port, buses, bits):
+    """The baseline bus_interrupt lookup path, minus logging and LEDs."""
+    _bus = None
+    _bus_instance = None
+    _bus_pins = []
+    for bus in buses:
+        if int(bus["interrupt_pin"]) == int(port):
+            _bus = bus
+            _bus_instance = bus["bus_instance"]
+            break
+    for bit in bits:
+        if bit["extender_bus_id"] == _bus["extender_bus_id"]:
+            _bus_pins.append(bit)
+    for pin_flag in list(_bus_instance.int_flag):
+        for pin in _bus_pins:
+            if int(pin["bus_bit"]) == int(pin_flag):
+                pin_value = pin["extender_bit_instance"].value
+                event = dict(pin)
+                event["pressed"] = not pin_value
+                _publish(1, event)
+                break
+    _bus_instance.clear_ints()
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buses", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--flags", type=int, nargs="*", default=[15],
+                        help="MCP23017 bits reported by int_flag per interrupt")
+    args = parser.parse_args()
+
+    # Per-event selector log lines are still formatted, but not emitted
+    logging.disable(logging.CRITICAL)
+    GPIO._backend = _NoGpio()
+    buses, bits = _build_topology(args.buses, args.flags)
+    service = OpenA3XXHardwareService(_NoMessaging(), 1)
+    service.event_batch_mode = False
+    for bus in buses:
+        # Registered as in _register_single_extender, without the I2C setup
+        record = ExtenderBusRecord(bus)
+        record.debouncer = BitDebouncer(0)
+        for bit in bits:
+            if bit["extender_bus_id"] == bus["extender_bus_id"]:
+                record.add_bit(bit)
+        record.input_state = 0xFFFF
+        service.dispatch_index.add_bus(record)
+
+    # Worst case for the linear scan: the last bus
+    port = INTERRUPT_PINS[args.buses - 1]
+    before = _time_per_call(lambda: linear_scan_interrupt(port, buses, bits), args.iterations)
+    after = _time_per_call(lambda: service.bus_interrupt(port), args.iterations)
+
+    print(f"buses={args.buses} bits={len(bits)} flags/interrupt={len(args.flags)}")
+    print(f"linear scan   : {before:9.1f} ns/interrupt")
+    print(f"bus_interrupt : {after:9.1f} ns/interrupt")
+    print(f"speedup       : {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
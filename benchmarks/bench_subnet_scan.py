@@ -0,0 +1,144 @@
+"""Benchmark: API discovery subnet scan, hosts scanned per second.
+
+Builds a fake subnet on loopback (every 127.x.y.z address reaches the local
+host on Linux): a few decoy listeners that accept connections but are not the
+API, and one heartbeat listener answering ``/core/heartbeat/ping`` on the last
+host of the range. Compares the former 64-thread ``connect_ex`` pool (every
+probe submitted up front, waits for all of them) with OpenA3XXSubnetScanner.
+
+Refused connects on loopback are much faster than silent hosts on a real LAN.
+``--silent`` instead binds a wildcard listener that never accepts and whose
+backlog is full, so every probe runs into the connect timeout (no API is
+found in that mode).
+
+Usage:
+    python benchmarks/bench_subnet_scan.py [--prefix 20] [--concurrency 2048] [--port 15000]
+"""
+
+import argparse
+import http.client
+import http.server
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ipaddress import IPv4Network
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from opena3xx.networking.opena3xx_subnet_scanner import OpenA3XXSubnetScanner  # noqa: E402
+
+
+class _PingHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"Pong from OpenA3XX" if self.path == "/core/heartbeat/ping" else b""
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _DecoyHandler(_PingHandler):
+    """Accepts the TCP connection but is not the API."""
+
+    def do_GET(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def _start_listener(host: str, port: int, handler) -> None:
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+_SILENT_SOCKETS = []
+
+
+def _start_silent_listener(port: int) -> None:
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("0.0.0.0", port))
+    listener.listen(0)
+    _SILENT_SOCKETS.append(listener)
+    for _ in range(4):
+        filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        filler.setblocking(False)
+        filler.connect_ex(("127.0.0.1", port))
+        _SILENT_SOCKETS.append(filler)
+    time.sleep(0.1)
+    # Further SYNs are dropped: connects hang until they time out
+
+
+def validate(host: str, port: int) -> bool:
+    connection = http.client.HTTPConnection(host, port, timeout=2)
+    try:
+        connection.request("GET", "/core/heartbeat/ping")
+        return connection.getresponse().status == 200
+    except OSError:
+        return False
+    finally:
+        connection.close()
+
+
+def thread_pool_scan(hosts, port: int, timeout: float):
+    """The former scan: one blocking connect_ex future per host on 64 workers."""
+    def probe(host):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            s.settimeout(timeout)
+            return s.connect_ex((host, port)) == 0
+        finally:
+            s.close()
+
+    found = None
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        futures = {executor.submit(probe, host): host for host in hosts}
+        for future in as_completed(futures):
+            if future.result() and found is None and validate(futures[future], port):
+                found = futures[future]
+    return found, len(hosts)
+
+
+def selector_scan(hosts, port: int, timeout: float, concurrency: int):
+    scanner = OpenA3XXSubnetScanner(port, concurrency, timeout)
+    found = scanner.scan(iter(hosts), lambda host: validate(host, port))
+    return found, scanner.hosts_scanned
+
+
+def _run(name: str, fn):
+    start = time.perf_counter()
+    found, scanned = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22}: {scanned:6d} hosts in {elapsed:7.3f} s = {scanned / elapsed:10.0f} hosts/s, found {found}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prefix", type=int, default=20, help="fake subnet prefix length (default /20)")
+    parser.add_argument("--port", type=int, default=15000)
+    parser.add_argument("--timeout", type=float, default=0.5, help="connect timeout in seconds")
+    parser.add_argument("--concurrency", type=int, default=2048)
+    parser.add_argument("--silent", action="store_true", help="every host times out instead of refusing")
+    args = parser.parse_args()
+
+    hosts = [str(ip) for ip in IPv4Network(f"127.1.0.0/{args.prefix}").hosts()]
+    if args.silent:
+        _start_silent_listener(args.port)
+    else:
+        for decoy in hosts[len(hosts) // 4::len(hosts) // 4][:3]:
+            _start_listener(decoy, args.port, _DecoyHandler)
+        _start_listener(hosts[-1], args.port, _PingHandler)
+    print(f"Scanning {len(hosts)} hosts on port {args.port}")
+
+    _run("thread pool (64)", lambda: thread_pool_scan(hosts, args.port, args.timeout))
+    _run(f"selectors ({args.concurrency})", lambda: selector_scan(hosts, args.port, args.timeout, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
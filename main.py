@@ -3,7 +3,7 @@
 Behavior:
 - Discovers the Peripheral API, fetches board details and configuration
 - Initializes RabbitMQ and the MCP23017-based hardware service
-- Enters a keepalive loop and clears MCP interrupts periodically
+- Enters a keepalive loop; IRQ line health is supervised by the hardware service
 - Restarts on failure; supports graceful shutdown via SIGINT/SIGTERM
 """
 
@@ -16,7 +16,7 @@ import click
 from opena3xx.hardware.gpio_shim import GPIO
 from art import *
 
-from opena3xx.amqp import OpenA3XXMessagingService
+from opena3xx.amqp import create_messaging_service
 from opena3xx.exceptions import OpenA3XXNetworkingException, OpenA3XXI2CRegistrationException, \
     OpenA3XXRabbitMqPublishingException
 from opena3xx.hardware.opena3xx_mcp23017 import OpenA3XXHardwareService
@@ -61,6 +61,8 @@ def main(hardware_board_id: int):
     tprint("OPENA3XX", font="rnd-large")
     tprint("Hardware Controller", font="rnd-large")
     print("------------------------------------------------------------------------------------------------------")
+    hardware_service = None
+    rabbitmq_client = None
     try:
         logger.info("OpenA3XX Hardware Controller: Application Started")
         networking_client = OpenA3XXNetworkingClient()
@@ -70,7 +72,7 @@ def main(hardware_board_id: int):
         board_details = http_client.get_hardware_board_details(hardware_board_id)
 
         if board_details is not None:
-            rabbitmq_client = OpenA3XXMessagingService(http_client)
+            rabbitmq_client = create_messaging_service(http_client)
             rabbitmq_client.init_and_start()
             hardware_service = OpenA3XXHardwareService(rabbitmq_client, hardware_board_id)
             hardware_service.init_and_start(board_details)
@@ -78,21 +80,8 @@ def main(hardware_board_id: int):
             while not SHUTDOWN_EVENT.is_set():
                 rabbitmq_client.keep_alive(hardware_board_id)
 
-                # Avoid clearing interrupts periodically as it can race with
-                # software edge detection and mask events. Only clear if the
-                # IRQ line appears stuck low.
-                for bus in hardware_service.extender_bus_details:
-                    try:
-                        irq_pin = int(bus["interrupt_pin"])
-                        if GPIO.input(irq_pin) == GPIO.LOW:
-                            logger.debug(
-                                f"IRQ line low for bus {bus['extender_bus_name']}; clearing pending interrupts"
-                            )
-                            _bus_instance = bus["bus_instance"]
-                            _bus_instance.clear_ints()
-                    except Exception:
-                        pass
-
+                # Stuck IRQ lines and interrupt storms are handled by the
+                # hardware service's IRQ supervision (see get_acquisition_metrics)
                 if GPIO.input(INPUT_SWITCH) == GPIO.LOW:
                     GPIO.output(FAULT_LED, GPIO.HIGH)
                     time.sleep(1)
@@ -123,6 +112,16 @@ def main(hardware_board_id: int):
         logger.critical(f"General Exception occurred with message {ex}")
         raise
     finally:
+        if hardware_service is not None:
+            try:
+                hardware_service.stop()
+            except Exception:
+                pass
+        if rabbitmq_client is not None:
+            try:
+                rabbitmq_client.stop()
+            except Exception:
+                pass
         try:
             GPIO.cleanup()
         except Exception:
@@ -1 +1,2 @@
-from .opena3xx_rabbitmq import *
\ No newline at end of file
+from .opena3xx_rabbitmq import *
+from .opena3xx_asyncio_messaging import *
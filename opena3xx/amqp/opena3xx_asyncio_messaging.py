@@ -0,0 +1,206 @@
+"""OpenA3XXMessagingService on pika's asyncio adapter.
+
+One asyncio event loop (thread ``amqp-asyncio``) owns a single AMQP connection
+with two channels: the data channel drains the event spool with pipelined
+publisher confirms (OpenA3XXPipelinedPublisher) and the keepalive channel
+publishes heartbeats. Connect outcomes feed the shared circuit breaker
+(OpenA3XXConnectionManager): reconnects run as loop timers paced by its retry
+delay, and while its circuit is open the loop only watches for the background
+probe to succeed. keep_alive() only schedules its publish on the loop, so the
+main thread never blocks on the broker. The public API is the one of OpenA3XXMessagingService.
+"""
+
+import asyncio
+import datetime as dt
+import json
+import os
+import threading
+
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from opena3xx.exceptions import OpenA3XXRabbitMqPublishingException
+from opena3xx.hardware.gpio_shim import GPIO
+from opena3xx.http import OpenA3xxHttpClient
+from opena3xx.models import FAULT_LED, MESSAGING_LED, AMQP_CONNECT_TIMEOUT_SECONDS, AMQP_ADAPTER, \
+    AMQP_ADAPTER_ASYNCIO, AMQP_CIRCUIT_POLL_SECONDS
+from .opena3xx_pipelined_publisher import OpenA3XXPipelinedPublisher
+from .opena3xx_rabbitmq import OpenA3XXMessagingService
+
+
+class OpenA3XXAsyncioMessagingService(OpenA3XXMessagingService):
+
+    def __init__(self, http_client: OpenA3xxHttpClient):
+        super().__init__(http_client)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._connection: AsyncioConnection | None = None
+        self._async_keepalive_channel = None
+        self._connected = threading.Event()
+
+    def init_and_start(self):
+        """Start the event loop thread and wait for the first connection.
+
+        Data and keepalive channels share one connection; publishing always
+        uses pipelined confirms (OPENA3XX_AMQP_CONFIRM_WINDOW).
+        """
+        try:
+            self.logger.info("RabbitMQ Connection Init Start: Started (asyncio adapter)")
+            configuration = self.configuration_data
+            self.logger.info(f"Connecting to AMQP Server on host: "
+                             f"{configuration['opena3xx-amqp-host']}:"
+                             f"{configuration['opena3xx-amqp-port']}")
+            self.rabbitmq_data_exchange = "opena3xx.hardware_events.input_selectors"
+            self.rabbitmq_keepalive_exchange = "opena3xx.hardware_boards.keep_alive"
+            if self._pipelined_publisher is None:
+                self._pipelined_publisher = OpenA3XXPipelinedPublisher(
+                    self._connection_parameters, self.rabbitmq_data_exchange, self._event_log,
+                    self.confirm_window, self._stop_publisher, self._replay_batcher, self._connection_manager)
+
+            if self._loop_thread is None or not self._loop_thread.is_alive():
+                self._stop_publisher.clear()
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._run_loop, name="amqp-asyncio", daemon=True)
+                self._loop_thread.start()
+
+            if not self._connected.wait(AMQP_CONNECT_TIMEOUT_SECONDS):
+                raise OpenA3XXRabbitMqPublishingException(
+                    f"No AMQP connection after {AMQP_CONNECT_TIMEOUT_SECONDS} seconds")
+            self.logger.info("RabbitMQ Connection Init Start: Completed")
+        except Exception as ex:
+            self.logger.critical(f"AMQP initialization error: {ex}")
+            raise ex
+
+    def keep_alive(self, hardware_board_id: int):
+        """Schedule a keepalive publish on the event loop (never blocks the caller)."""
+        self._report_spool_metrics()
+        if not self._connected.is_set():
+            self.logger.warning("Keepalive skipped: AMQP connection is down, reconnecting in the background")
+            return
+        message = {
+            "timestamp": str(dt.datetime.now(dt.UTC)),
+            "hardware_board_id": hardware_board_id,
+            "message": "Ping"
+        }
+        self.logger.debug(f"Publishing keepalive to exchange '{self.rabbitmq_keepalive_exchange}': {message}")
+        self._loop.call_soon_threadsafe(self._publish_keepalive, json.dumps(message))
+
+    def stop(self):
+        """Close the connection, stop the event loop and close the event spool."""
+        self._stop_publisher.set()
+        if self._loop is not None and self._loop_thread is not None and self._loop_thread.is_alive():
+            self._loop.call_soon_threadsafe(self._shutdown)
+            self._loop_thread.join(timeout=5.0)
+        self._connection_manager.stop()
+        try:
+            self._event_log.close()
+        except Exception as ex:
+            self.logger.warning(f"Failed closing event spool: {ex}")
+
+    # ----- Event loop thread -----
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._connect)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def _connect(self) -> None:
+        if self._stop_publisher.is_set():
+            return
+        try:
+            self._connection = AsyncioConnection(
+                self._connection_parameters(),
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_open_error,
+                on_close_callback=self._on_connection_closed,
+                custom_ioloop=self._loop,
+            )
+        except Exception as ex:
+            self.logger.warning(f"AMQP connection error: {ex}")
+            self._connection_manager.record_failure(ex)
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._stop_publisher.is_set():
+            self._loop.stop()
+            return
+        if self._connection_manager.is_open:
+            # The amqp-reconnect thread probes the broker; connect once it answers
+            self._loop.call_later(AMQP_CIRCUIT_POLL_SECONDS, self._schedule_reconnect)
+            return
+        delay = self._connection_manager.retry_delay()
+        self.logger.info(f"Reconnecting to AMQP server in {delay:.1f} s")
+        self._loop.call_later(delay, self._connect)
+
+    def _on_connection_open(self, connection) -> None:
+        self.logger.info("AMQP connection established")
+        connection.channel(on_open_callback=self._on_data_channel_open)
+        connection.channel(on_open_callback=self._on_keepalive_channel_open)
+
+    def _on_connection_open_error(self, _connection, error) -> None:
+        GPIO.output(FAULT_LED, GPIO.HIGH)
+        self.logger.warning(f"AMQP connection failed: {error}")
+        self._connection_manager.record_failure(error)
+        self._schedule_reconnect()
+
+    def _on_connection_closed(self, _connection, reason) -> None:
+        self._connected.clear()
+        self._async_keepalive_channel = None
+        self._pipelined_publisher.detach()
+        if self._stop_publisher.is_set():
+            self._loop.stop()
+            return
+        GPIO.output(FAULT_LED, GPIO.HIGH)
+        self.logger.warning(f"AMQP connection closed: {reason}")
+        self._connection_manager.record_failure(reason)
+        self._schedule_reconnect()
+
+    def _on_data_channel_open(self, channel) -> None:
+        channel.add_on_close_callback(self._on_channel_closed)
+        self._pipelined_publisher.attach(channel, self._loop.call_later, self._loop.call_soon_threadsafe)
+
+    def _on_keepalive_channel_open(self, channel) -> None:
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.exchange_declare(exchange=self.rabbitmq_keepalive_exchange, exchange_type='fanout', durable=True,
+                                 callback=lambda _frame: self._on_keepalive_channel_ready(channel))
+
+    def _on_keepalive_channel_ready(self, channel) -> None:
+        self._async_keepalive_channel = channel
+        self._connected.set()
+        self._connection_manager.record_success()
+        GPIO.output(FAULT_LED, GPIO.LOW)
+
+    def _on_channel_closed(self, _channel, reason) -> None:
+        # Recover both channels together through a reconnect
+        connection = self._connection
+        if connection is not None and not connection.is_closing and not connection.is_closed:
+            self.logger.warning(f"AMQP channel closed: {reason}; reconnecting")
+            connection.close()
+
+    def _publish_keepalive(self, body: str) -> None:
+        channel = self._async_keepalive_channel
+        if channel is None:
+            return
+        try:
+            GPIO.output(MESSAGING_LED, GPIO.HIGH)
+            channel.basic_publish(exchange=self.rabbitmq_keepalive_exchange, routing_key='*', body=body)
+            GPIO.output(MESSAGING_LED, GPIO.LOW)
+        except Exception as ex:
+            GPIO.output(FAULT_LED, GPIO.HIGH)
+            self.logger.critical(f"Keepalive publish failed: {ex}")
+
+    def _shutdown(self) -> None:
+        connection = self._connection
+        if connection is not None and not connection.is_closing and not connection.is_closed:
+            connection.close()
+        else:
+            self._loop.stop()
+
+
+def create_messaging_service(http_client: OpenA3xxHttpClient) -> OpenA3XXMessagingService:
+    """Messaging service for the adapter selected with OPENA3XX_AMQP_ADAPTER."""
+    adapter = os.getenv("OPENA3XX_AMQP_ADAPTER", AMQP_ADAPTER).strip().lower()
+    if adapter == AMQP_ADAPTER_ASYNCIO:
+        return OpenA3XXAsyncioMessagingService(http_client)
+    return OpenA3XXMessagingService(http_client)
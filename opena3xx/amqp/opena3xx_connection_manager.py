@@ -0,0 +1,160 @@
+"""Circuit breaker and background reconnection for the blocking AMQP connections.
+
+The data (publisher thread) and keepalive (main thread) connections report
+every publish or connect outcome here. After ``failure_threshold`` consecutive
+failures the circuit opens: callers stop touching the broker and the
+``amqp-reconnect`` thread probes it with a short single-attempt connection,
+waiting a jittered, exponentially growing delay between probes. A successful
+probe half-opens the circuit and releases parked callers, so publishing resumes
+within one backoff step of the broker returning; their next success closes the
+circuit, their next failure reopens it without resetting the backoff.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import pika
+
+CIRCUIT_CLOSED: str = "closed"
+CIRCUIT_OPEN: str = "open"
+CIRCUIT_HALF_OPEN: str = "half_open"
+
+
+class OpenA3XXConnectionManager:
+
+    def __init__(self, parameters_factory: Callable[[], pika.ConnectionParameters], stop_event: threading.Event,
+                 failure_threshold: int, initial_backoff_s: float, max_backoff_s: float):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._parameters_factory = parameters_factory
+        self._stop_event = stop_event
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.initial_backoff_s = max(0.01, float(initial_backoff_s))
+        self.max_backoff_s = max(self.initial_backoff_s, float(max_backoff_s))
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._backoff_s = self.initial_backoff_s
+        self._opened_at: Optional[float] = None
+        self._probe_thread: Optional[threading.Thread] = None
+        # Metrics
+        self.open_count = 0
+        self.probe_count = 0
+        self.last_recovery_s: Optional[float] = None
+        self.max_recovery_s = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == CIRCUIT_OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self.state == CIRCUIT_CLOSED:
+                return
+            recovery_s = time.monotonic() - self._opened_at
+            self.last_recovery_s = recovery_s
+            self.max_recovery_s = max(self.max_recovery_s, recovery_s)
+            self.state = CIRCUIT_CLOSED
+            self._backoff_s = self.initial_backoff_s
+            self._opened_at = None
+            self._available.notify_all()
+        self.logger.info(f"AMQP circuit closed: broker reachable again after {recovery_s:.1f} s")
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._failures += 1
+            failures = self._failures
+            if self.state == CIRCUIT_OPEN:
+                return
+            if self.state == CIRCUIT_CLOSED and failures < self.failure_threshold:
+                return
+            if self.state == CIRCUIT_CLOSED:
+                self._opened_at = time.monotonic()
+                self.open_count += 1
+            self.state = CIRCUIT_OPEN
+            self._start_probe_locked()
+        self.logger.warning(f"AMQP circuit open after {failures} failure(s): {error}")
+
+    def retry_delay(self) -> float:
+        """Jittered delay before retrying while the circuit is still closed."""
+        with self._lock:
+            failures = self._failures
+        return self._jitter(min(self.max_backoff_s, self.initial_backoff_s * 2 ** max(0, failures - 1)))
+
+    def wait_until_available(self, timeout: float) -> bool:
+        """Park the caller while the circuit is open; True once the broker may be used."""
+        with self._lock:
+            if self.state != CIRCUIT_OPEN:
+                return True
+            self._available.wait(timeout)
+            return self.state != CIRCUIT_OPEN
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            open_for_s = time.monotonic() - self._opened_at if self._opened_at is not None else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "open_count": self.open_count,
+                "probe_count": self.probe_count,
+                "open_for_s": round(open_for_s, 1),
+                "last_time_to_recover_s": round(self.last_recovery_s, 1) if self.last_recovery_s is not None else None,
+                "max_time_to_recover_s": round(self.max_recovery_s, 1),
+            }
+
+    def stop(self) -> None:
+        with self._lock:
+            self._available.notify_all()
+            probe_thread = self._probe_thread
+        if probe_thread is not None:
+            probe_thread.join(timeout=5.0)
+
+    # ----- Probe thread -----
+    def _start_probe_locked(self) -> None:
+        # The probe thread gives up ownership under the lock before it stops
+        # probing, so a failure right after a successful probe starts a new one
+        if self._probe_thread is not None:
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, name="amqp-reconnect", daemon=True)
+        self._probe_thread.start()
+
+    def _probe_loop(self) -> None:
+        while not self._stop_event.is_set():
+            with self._lock:
+                if self.state != CIRCUIT_OPEN:
+                    self._probe_thread = None
+                    return
+                delay = self._jitter(self._backoff_s)
+                self._backoff_s = min(self.max_backoff_s, self._backoff_s * 2)
+            if self._stop_event.wait(delay):
+                break
+            with self._lock:
+                self.probe_count += 1
+            try:
+                connection = pika.BlockingConnection(self._parameters_factory())
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            except Exception as ex:
+                self.logger.debug(f"AMQP reconnect probe failed: {ex}")
+                continue
+            with self._lock:
+                self.state = CIRCUIT_HALF_OPEN
+                self._probe_thread = None
+                self._available.notify_all()
+            self.logger.info("AMQP reconnect probe succeeded; resuming publishing")
+            return
+        # Stopped: a restarted service may open the circuit and probe again
+        with self._lock:
+            if self._probe_thread is threading.current_thread():
+                self._probe_thread = None
+
+    @staticmethod
+    def _jitter(delay_s: float) -> float:
+        # "Equal jitter": never less than half the step, spread over the other half
+        return delay_s / 2 + random.uniform(0, delay_s / 2)
@@ -0,0 +1,103 @@
+"""Pre-serialized hardware event bodies.
+
+A hardware event body only varies in ``pressed`` and ``timestamp``, so the JSON
+for one configured bit is rendered once into byte templates and each event
+just concatenates the template with the timestamp. The output is byte for byte
+what ``json.dumps`` produces for the event dict, and the timestamp keeps the
+``str(datetime.now(UTC))`` format (``2024-01-01 12:00:00.123456+00:00``).
+
+The opt-in compact binary format is a fixed little-endian struct (see
+``BINARY_EVENT``). Its sequence number is the event's spool sequence, stamped
+by the publisher, so consumers can drop replayed duplicates and spot gaps.
+"""
+
+import datetime as dt
+import json
+import struct
+import time
+from typing import Optional
+
+# version, hardware_board_id, input_selector_id (-1 if none), extender_bit_id,
+# pressed, sequence, timestamp_ns (UTC epoch)
+BINARY_EVENT = struct.Struct("<BIiiBQq")
+BINARY_EVENT_VERSION: int = 1
+BINARY_EVENT_CONTENT_TYPE: str = "application/vnd.opena3xx.hardware-event.v1+binary"
+_BINARY_SEQUENCE_OFFSET = 14
+
+
+def stamp_binary_sequence(payload: bytes, sequence: int) -> bytes:
+    """Return a binary event body with its sequence number set."""
+    body = bytearray(payload)
+    struct.pack_into("<Q", body, _BINARY_SEQUENCE_OFFSET, sequence)
+    return bytes(body)
+
+
+class _UtcTimestampFormatter:
+    """Formats epoch nanoseconds like ``str(datetime)`` with a cached per-second prefix."""
+
+    def __init__(self):
+        self._cached = (-1, b"")
+
+    def format(self, timestamp_ns: int) -> bytes:
+        seconds, remainder = divmod(timestamp_ns, 1_000_000_000)
+        cached_seconds, prefix = self._cached
+        if seconds != cached_seconds:
+            prefix = dt.datetime.fromtimestamp(seconds, dt.UTC).strftime("%Y-%m-%d %H:%M:%S").encode("ascii")
+            # One tuple assignment keeps the cache consistent across threads
+            self._cached = (seconds, prefix)
+        microseconds = remainder // 1000
+        if microseconds:
+            return b"%s.%06d+00:00" % (prefix, microseconds)
+        # str(datetime) omits the fraction when it is zero
+        return prefix + b"+00:00"
+
+
+utc_timestamp = _UtcTimestampFormatter()
+
+
+class OpenA3XXHardwareEventTemplate:
+    """Serialized single hardware event body for one board/bit."""
+
+    __slots__ = ("hardware_board_id", "input_selector_id", "_head_pressed", "_head_released", "_binary_ids")
+
+    _TAIL = b'"}'
+
+    def __init__(self, hardware_board_id: int, extender_bus_bit_details: dict):
+        self.hardware_board_id = hardware_board_id
+        self.input_selector_id = extender_bus_bit_details["input_selector_id"]
+        fields = {
+            "hardware_board_id": hardware_board_id,
+            "extender_bit_id": extender_bus_bit_details["extender_bit_id"],
+            "extender_bit_name": extender_bus_bit_details["extender_bit_name"],
+            "extender_bus_id": extender_bus_bit_details["extender_bus_id"],
+            "extender_bus_name": extender_bus_bit_details["extender_bus_name"],
+            "input_selector_name": extender_bus_bit_details["input_selector_name"],
+            "input_selector_id": self.input_selector_id,
+        }
+        # json.dumps of the full event with its two trailing keys spliced out
+        head = json.dumps(fields)[:-1] + ', "pressed": '
+        self._head_pressed = (head + 'true, "timestamp": "').encode("ascii")
+        self._head_released = (head + 'false, "timestamp": "').encode("ascii")
+        selector_id = self.input_selector_id
+        try:
+            self._binary_ids = (int(hardware_board_id), int(selector_id) if selector_id is not None else -1,
+                                int(extender_bus_bit_details["extender_bit_id"]))
+        except (TypeError, ValueError):
+            # Only the binary format needs numeric ids
+            self._binary_ids = None
+
+    def render(self, pressed: bool, timestamp_ns: Optional[int] = None) -> bytes:
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        head = self._head_pressed if pressed else self._head_released
+        return head + utc_timestamp.format(timestamp_ns) + self._TAIL
+
+    def render_binary(self, pressed: bool, timestamp_ns: Optional[int] = None) -> bytes:
+        """Compact binary body; the sequence is stamped when the event is published."""
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        if self._binary_ids is None:
+            raise ValueError("Binary hardware events need numeric board, selector and bit ids")
+        board_id, selector_id, bit_id = self._binary_ids
+        return BINARY_EVENT.pack(BINARY_EVENT_VERSION, board_id, selector_id, bit_id, 1 if pressed else 0, 0,
+                                 timestamp_ns)
@@ -0,0 +1,246 @@
+"""Pipelined AMQP publisher draining the event spool with asynchronous confirms.
+
+Runs a pika ``SelectConnection`` on the publisher thread and keeps up to
+``window`` published-but-unconfirmed messages in flight, instead of waiting a
+broker round trip per message as ``BlockingChannel.basic_publish`` does in
+confirm mode. Delivery tags are mapped to spool sequence numbers; a broker ack
+(including ``multiple`` ranges) confirms them, a nack republishes them. The
+spool offset only advances to just below the lowest unconfirmed sequence, so a
+crash or reconnect replays everything that was not confirmed. During backlog
+replay one message may carry several spooled events (see
+``OpenA3XXReplayBatcher``); they are confirmed together.
+
+``run()`` owns a dedicated connection and paces its reconnects through the
+shared ``OpenA3XXConnectionManager``; alternatively a service that owns the
+connection hands over an open channel with ``attach()``/``detach()``.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import pika
+from pika.spec import Basic
+
+from opena3xx.hardware.gpio_shim import GPIO
+from opena3xx.models import FAULT_LED
+from opena3xx.spool import OpenA3XXEventLog
+from .opena3xx_connection_manager import OpenA3XXConnectionManager
+from .opena3xx_replay_batcher import OpenA3XXReplayBatcher
+
+
+class OpenA3XXPipelinedPublisher:
+
+    def __init__(self, parameters_factory: Callable[[], pika.ConnectionParameters], exchange: str,
+                 event_log: OpenA3XXEventLog, window: int, stop_event: threading.Event,
+                 batcher: OpenA3XXReplayBatcher, connection_manager: OpenA3XXConnectionManager):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._parameters_factory = parameters_factory
+        self._exchange = exchange
+        self._event_log = event_log
+        self._window = max(1, int(window))
+        self._stop_event = stop_event
+        self._batcher = batcher
+        self._connection_manager = connection_manager
+        self._connection: Optional[pika.SelectConnection] = None
+        self._channel = None
+        self._ready = False
+        # IO loop scheduling of the connection owner: call_later(delay, fn), call_threadsafe(fn)
+        self._call_later: Optional[Callable] = None
+        self._call_threadsafe: Optional[Callable] = None
+        # Bumped on every attach/detach so stale pump timers stop rescheduling
+        self._generation = 0
+        self._next_delivery_tag = 0
+        # delivery tag -> (spool records, body, properties), in publish order
+        self._unconfirmed: "OrderedDict[int, tuple]" = OrderedDict()
+        # Highest sequence confirmed by the broker but not yet committed to the spool
+        self._confirmed_seq = -1
+        self.published_count = 0
+        self.confirmed_count = 0
+        self.nacked_count = 0
+
+    # ----- Thread entry point -----
+    def run(self) -> None:
+        """Publish until the stop event is set, reconnecting as the connection manager allows.
+
+        Connect outcomes are reported to the manager: while its circuit is
+        closed a failed connection is retried after its jittered delay, while
+        it is open the thread parks until a background probe succeeds.
+        """
+        while not self._stop_event.is_set():
+            if not self._connection_manager.wait_until_available(timeout=0.5):
+                continue
+            try:
+                self._connection = pika.SelectConnection(
+                    self._parameters_factory(),
+                    on_open_callback=self._on_connection_open,
+                    on_open_error_callback=self._on_connection_open_error,
+                    on_close_callback=self._on_connection_closed,
+                )
+                self._connection.ioloop.start()
+            except Exception as ex:
+                self.logger.warning(f"Pipelined publisher connection error: {ex}")
+                self._connection_manager.record_failure(ex)
+            self._reset_in_flight()
+            if not self._stop_event.is_set() and not self._connection_manager.is_open:
+                self._stop_event.wait(self._connection_manager.retry_delay())
+        self._connection = None
+
+    def attach(self, channel, call_later: Callable, call_threadsafe: Callable) -> None:
+        """Start publishing on an open channel of a connection owned by the caller (IO loop thread)."""
+        self._call_later = call_later
+        self._call_threadsafe = call_threadsafe
+        self._on_channel_open(channel)
+
+    def detach(self) -> None:
+        """Stop using the attached channel; unconfirmed records are replayed on the next attach."""
+        self._channel = None
+        self._reset_in_flight()
+
+    def wake(self) -> None:
+        """Thread-safe hint that new records were appended to the spool."""
+        call_threadsafe = self._call_threadsafe
+        if call_threadsafe is None or not self._ready:
+            return
+        try:
+            call_threadsafe(self._pump)
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        connection = self._connection
+        if connection is None:
+            return
+        try:
+            connection.ioloop.add_callback_threadsafe(self._close)
+        except Exception:
+            pass
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._unconfirmed)
+
+    # ----- Connection lifecycle (IO loop thread) -----
+    def _on_connection_open(self, connection) -> None:
+        self.logger.info("Pipelined publisher connected")
+        self._call_later = connection.ioloop.call_later
+        self._call_threadsafe = connection.ioloop.add_callback_threadsafe
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection, error) -> None:
+        self.logger.warning(f"Pipelined publisher failed to connect: {error}")
+        self._connection_manager.record_failure(error)
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reason) -> None:
+        self._ready = False
+        self._channel = None
+        if not self._stop_event.is_set():
+            GPIO.output(FAULT_LED, GPIO.HIGH)
+            self.logger.warning(f"Pipelined publisher connection closed: {reason}")
+            self._connection_manager.record_failure(reason)
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel) -> None:
+        self._generation += 1
+        self._channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.exchange_declare(exchange=self._exchange, exchange_type='fanout', durable=True,
+                                 callback=self._on_exchange_declared)
+
+    def _on_channel_closed(self, channel, reason) -> None:
+        self._ready = False
+        self._channel = None
+        # An attached channel is recovered by its connection owner
+        if self._connection is not None and not self._connection.is_closing and not self._connection.is_closed:
+            self.logger.warning(f"Pipelined publisher channel closed: {reason}")
+            self._connection.close()
+
+    def _on_exchange_declared(self, _frame) -> None:
+        self._channel.confirm_delivery(ack_nack_callback=self._on_delivery_confirmation,
+                                       callback=self._on_confirm_selected)
+
+    def _on_confirm_selected(self, _frame) -> None:
+        self._ready = True
+        self._connection_manager.record_success()
+        self._schedule_pump(self._generation)
+
+    def _close(self) -> None:
+        if self._connection is not None and not self._connection.is_closing and not self._connection.is_closed:
+            self._connection.close()
+
+    # ----- Publishing (IO loop thread) -----
+    def _schedule_pump(self, generation: int) -> None:
+        # Safety net for missed wake-ups
+        if generation != self._generation or self._stop_event.is_set():
+            return
+        self._pump()
+        self._call_later(0.5, lambda: self._schedule_pump(generation))
+
+    def _pump(self) -> None:
+        if not self._ready or self._channel is None:
+            return
+        while len(self._unconfirmed) < self._window:
+            message = self._batcher.next_message(self._event_log)
+            if message is None:
+                if not self._unconfirmed:
+                    # Drained and fully confirmed: persist the offset like the blocking publisher
+                    self._event_log.commit_offset()
+                return
+            self._publish(message)
+
+    def _publish(self, message: tuple) -> None:
+        _records, body, properties = message
+        self._next_delivery_tag += 1
+        self._unconfirmed[self._next_delivery_tag] = message
+        self._channel.basic_publish(exchange=self._exchange, routing_key="*", body=body, properties=properties)
+        self.published_count += 1
+
+    def _on_delivery_confirmation(self, frame) -> None:
+        method = frame.method
+        tag = method.delivery_tag
+        if method.multiple:
+            # Tags are kept in ascending order, so the acknowledged range is a prefix
+            tags = []
+            for unconfirmed_tag in self._unconfirmed:
+                if unconfirmed_tag > tag:
+                    break
+                tags.append(unconfirmed_tag)
+        else:
+            tags = [tag] if tag in self._unconfirmed else []
+        messages = [self._unconfirmed.pop(t) for t in tags]
+
+        if isinstance(method, Basic.Nack):
+            self.nacked_count += len(messages)
+            self.logger.warning(f"Broker rejected {len(messages)} message(s); republishing")
+            for message in messages:
+                self._publish(message)
+        else:
+            self.confirmed_count += len(messages)
+            for records, _body, _properties in messages:
+                if records[-1].seq > self._confirmed_seq:
+                    self._confirmed_seq = records[-1].seq
+            GPIO.output(FAULT_LED, GPIO.LOW)
+        self._commit_confirmed()
+        self._pump()
+
+    def _commit_confirmed(self) -> None:
+        # Only the prefix below the oldest unconfirmed record may be released
+        commit_seq = self._confirmed_seq
+        if self._unconfirmed:
+            lowest = min(records[0].seq for records, _body, _properties in self._unconfirmed.values())
+            commit_seq = min(commit_seq, lowest - 1)
+        if commit_seq >= 0:
+            self._event_log.ack(commit_seq)
+
+    def _reset_in_flight(self) -> None:
+        """Return unconfirmed records to the spool queue after a disconnect."""
+        self._generation += 1
+        self._ready = False
+        self._unconfirmed.clear()
+        self._next_delivery_tag = 0
+        # Confirmed records above an unconfirmed gap are replayed as well
+        self._confirmed_seq = -1
+        self._event_log.rewind()
@@ -1,7 +1,6 @@
 import datetime as dt
 import os
 from pathlib import Path
-import uuid
 import json
 import logging
 import threading
@@ -12,9 +11,56 @@ import pika
 from opena3xx.hardware.gpio_shim import GPIO
 from pika.adapters.blocking_connection import BlockingChannel
 
-from opena3xx.exceptions import OpenA3XXRabbitMqPublishingException
 from opena3xx.http import OpenA3xxHttpClient
-from opena3xx.models import FAULT_LED, MESSAGING_LED
+from .opena3xx_connection_manager import OpenA3XXConnectionManager
+from .opena3xx_event_templates import OpenA3XXHardwareEventTemplate
+from .opena3xx_pipelined_publisher import OpenA3XXPipelinedPublisher
+from .opena3xx_replay_batcher import OpenA3XXReplayBatcher
+from opena3xx.models import FAULT_LED, MESSAGING_LED, EVENT_LOG_SEGMENT_BYTES, EVENT_LOG_OFFSET_COMMIT_MS, \
+    AMQP_PUBLISH_MODE, AMQP_PUBLISH_MODE_PIPELINED, AMQP_CONFIRM_WINDOW, REPLAY_BATCH_THRESHOLD, \
+    REPLAY_BATCH_MAX_EVENTS, REPLAY_BATCH_MAX_BYTES, SPOOL_COMPACTION, SPOOL_COMPACTION_TTL_SECONDS, \
+    SPOOL_DURABILITY, SPOOL_DURABILITY_MEMORY, SPOOL_DURABILITY_PERIODIC, SPOOL_DURABILITY_EVENT, \
+    SPOOL_FSYNC_INTERVAL_MS, SPOOL_MEMORY_CAPACITY, SPOOL_METRICS_REPORT_SECONDS, EVENT_WIRE_FORMAT, \
+    EVENT_WIRE_FORMAT_JSON, EVENT_WIRE_FORMAT_BINARY, AMQP_CIRCUIT_FAILURE_THRESHOLD, AMQP_RECONNECT_BACKOFF_MS, \
+    AMQP_RECONNECT_BACKOFF_MAX_MS
+from opena3xx.helpers import parse_key_value_list, env_int, env_float
+from opena3xx.spool import OpenA3XXEventLog, OpenA3XXMemoryEventQueue, OpenA3XXCompactionPolicy, NO_KEY, \
+    RECORD_KIND_JSON, RECORD_KIND_BINARY, parse_compaction_rule
+
+
+class _EnqueueLatencyStats:
+    """Running enqueue latency statistics (count/mean/max plus recent-sample percentiles)."""
+
+    _SAMPLES = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = [0] * self._SAMPLES
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        with self._lock:
+            self._samples[self.count % self._SAMPLES] = elapsed_ns
+            self.count += 1
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples[:min(self.count, self._SAMPLES)])
+            count, total_ns, max_ns = self.count, self.total_ns, self.max_ns
+        if not samples:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean_us": round(total_ns / count / 1000.0, 1),
+            "p50_us": round(samples[len(samples) // 2] / 1000.0, 1),
+            "p99_us": round(samples[min(len(samples) - 1, len(samples) * 99 // 100)] / 1000.0, 1),
+            "max_us": round(max_ns / 1000.0, 1),
+        }
 
 
 class OpenA3XXMessagingService:
@@ -41,15 +87,55 @@ class OpenA3XXMessagingService:
         self._stop_publisher = threading.Event()
         self._data_connection: pika.BlockingConnection | None = None
         self._keepalive_connection: pika.BlockingConnection | None = None
-        # Disk spool for durable event storage
-        spool_dir = os.getenv("OPENA3XX_EVENT_SPOOL_DIR", "/tmp/opena3xx_event_spool")
-        self._spool_path = Path(spool_dir)
-        try:
-            self._spool_path.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            # Fallback to /tmp if provided path not writable
-            self._spool_path = Path("/tmp/opena3xx_event_spool")
-            self._spool_path.mkdir(parents=True, exist_ok=True)
+        # Shared by the data and keepalive connections: parks publishing while
+        # the broker is unreachable and probes it in the background
+        self._connection_manager = OpenA3XXConnectionManager(
+            self._connection_parameters, self._stop_publisher,
+            failure_threshold=env_int("OPENA3XX_AMQP_CIRCUIT_FAILURES", AMQP_CIRCUIT_FAILURE_THRESHOLD, self.logger),
+            initial_backoff_s=env_int("OPENA3XX_AMQP_RECONNECT_BACKOFF_MS", AMQP_RECONNECT_BACKOFF_MS,
+                                      self.logger) / 1000.0,
+            max_backoff_s=env_int("OPENA3XX_AMQP_RECONNECT_BACKOFF_MAX_MS", AMQP_RECONNECT_BACKOFF_MAX_MS,
+                                  self.logger) / 1000.0,
+        )
+        # "blocking" waits for each publisher confirm; "pipelined" keeps a
+        # window of unconfirmed messages in flight
+        self.publish_mode = os.getenv("OPENA3XX_AMQP_PUBLISH_MODE", AMQP_PUBLISH_MODE).strip().lower()
+        self.confirm_window = env_int("OPENA3XX_AMQP_CONFIRM_WINDOW", AMQP_CONFIRM_WINDOW, self.logger)
+        self._pipelined_publisher: OpenA3XXPipelinedPublisher | None = None
+        # Wire format of single hardware events: JSON (default) or the compact
+        # binary struct; other event types are always JSON
+        self.event_wire_format = os.getenv("OPENA3XX_EVENT_WIRE_FORMAT", EVENT_WIRE_FORMAT).strip().lower()
+        if self.event_wire_format not in (EVENT_WIRE_FORMAT_JSON, EVENT_WIRE_FORMAT_BINARY):
+            self.logger.warning(f"Unknown event wire format '{self.event_wire_format}'; using '{EVENT_WIRE_FORMAT}'")
+            self.event_wire_format = EVENT_WIRE_FORMAT
+        self._binary_events = self.event_wire_format == EVENT_WIRE_FORMAT_BINARY
+        # Backlog replay packs several spooled events per AMQP message
+        self._replay_batcher = OpenA3XXReplayBatcher(
+            threshold=env_int("OPENA3XX_AMQP_REPLAY_BATCH_THRESHOLD", REPLAY_BATCH_THRESHOLD, self.logger),
+            max_events=env_int("OPENA3XX_AMQP_REPLAY_BATCH_EVENTS", REPLAY_BATCH_MAX_EVENTS, self.logger),
+            max_bytes=env_int("OPENA3XX_AMQP_REPLAY_BATCH_BYTES", REPLAY_BATCH_MAX_BYTES, self.logger),
+        )
+        # Event spool: durability tier decides what an enqueue waits for
+        # (memory: nothing, periodic: nothing but a group fsync every N ms,
+        # event: its own record being fsynced)
+        self.spool_durability = os.getenv("OPENA3XX_SPOOL_DURABILITY", SPOOL_DURABILITY).strip().lower()
+        if self.spool_durability not in (SPOOL_DURABILITY_MEMORY, SPOOL_DURABILITY_PERIODIC, SPOOL_DURABILITY_EVENT):
+            self.logger.warning(f"Unknown spool durability '{self.spool_durability}'; using '{SPOOL_DURABILITY}'")
+            self.spool_durability = SPOOL_DURABILITY
+        self._sync_each_event = self.spool_durability == SPOOL_DURABILITY_EVENT
+        self._enqueue_latency = _EnqueueLatencyStats()
+        self._metrics_reported_at = time.monotonic()
+        if self.spool_durability == SPOOL_DURABILITY_MEMORY:
+            self._event_log = OpenA3XXMemoryEventQueue(
+                env_int("OPENA3XX_SPOOL_MEMORY_CAPACITY", SPOOL_MEMORY_CAPACITY, self.logger))
+            self.logger.warning("Spool durability 'memory': unpublished events are lost on restart")
+            if os.getenv("OPENA3XX_SPOOL_COMPACTION", SPOOL_COMPACTION).strip().lower() not in ("", "none") \
+                    or os.getenv("OPENA3XX_SPOOL_COMPACTION_SELECTORS"):
+                self.logger.warning("Spool compaction is not supported with spool durability 'memory'; "
+                                    "OPENA3XX_SPOOL_COMPACTION settings are ignored")
+        else:
+            self._event_log = self._open_event_log()
+            self._spool_import_legacy_files()
 
     def init_and_start(self):
         """Initialize RabbitMQ connection and channels, declare exchanges.
@@ -61,46 +147,41 @@ class OpenA3XXMessagingService:
             self.logger.info("RabbitMQ Connection Init Start: Started")
             configuration = self.configuration_data
 
-            username = configuration["opena3xx-amqp-username"]
-            password = configuration["opena3xx-amqp-password"]
             host = configuration["opena3xx-amqp-host"]
             port = int(configuration["opena3xx-amqp-port"])
             vhost = configuration.get("opena3xx-amqp-vhost", "/")
             self.logger.info(f"AMQP parameters: host={host}, port={port}, vhost={vhost}")
-            # Avoid logging credentials
-            credentials = pika.PlainCredentials(username, password)
-            parameters = pika.ConnectionParameters(
-                host=host,
-                port=port,
-                virtual_host=vhost,
-                credentials=credentials,
-                heartbeat=30,
-                blocked_connection_timeout=10,
-                connection_attempts=5,
-                retry_delay=2.0,
-                socket_timeout=10,
-            )
+            # Startup tolerates a broker that is still coming up; later
+            # reconnects are single attempts paced by the connection manager
+            parameters = self._connection_parameters(connection_attempts=5)
             self.rabbitmq_data_exchange = "opena3xx.hardware_events.input_selectors"
             self.rabbitmq_keepalive_exchange = "opena3xx.hardware_boards.keep_alive"
 
             self.logger.info(f"Connecting to AMQP Server on host: "
                              f"{configuration['opena3xx-amqp-host']}:"
                              f"{configuration['opena3xx-amqp-port']}")
-            # Create a dedicated connection for data publishing (publisher thread)
-            self.logger.debug("Opening data BlockingConnection ...")
-            self._data_connection = pika.BlockingConnection(parameters)
-            self.logger.debug("AMQP data connection established")
-            self.data_channel = self._data_connection.channel()
-            self.logger.debug("AMQP data channel created")
-            self.logger.info(f"Declaring Exchange: {self.rabbitmq_data_exchange}")
-            try:
-                self.data_channel.exchange_declare(exchange=self.rabbitmq_data_exchange, exchange_type='fanout', durable=True)
-            except Exception as ex:
-                self.logger.warning(f"Exchange declare warning (data): {ex}")
-            try:
-                self.data_channel.confirm_delivery()
-            except Exception:
-                pass
+            if self.publish_mode == AMQP_PUBLISH_MODE_PIPELINED:
+                # The pipelined publisher opens its own asynchronous connection
+                self.logger.info(f"Publishing with pipelined confirms (window={self.confirm_window})")
+                self._pipelined_publisher = OpenA3XXPipelinedPublisher(
+                    self._connection_parameters, self.rabbitmq_data_exchange, self._event_log,
+                    self.confirm_window, self._stop_publisher, self._replay_batcher, self._connection_manager)
+            else:
+                # Create a dedicated connection for data publishing (publisher thread)
+                self.logger.debug("Opening data BlockingConnection ...")
+                self._data_connection = pika.BlockingConnection(parameters)
+                self.logger.debug("AMQP data connection established")
+                self.data_channel = self._data_connection.channel()
+                self.logger.debug("AMQP data channel created")
+                self.logger.info(f"Declaring Exchange: {self.rabbitmq_data_exchange}")
+                try:
+                    self.data_channel.exchange_declare(exchange=self.rabbitmq_data_exchange, exchange_type='fanout', durable=True)
+                except Exception as ex:
+                    self.logger.warning(f"Exchange declare warning (data): {ex}")
+                try:
+                    self.data_channel.confirm_delivery()
+                except Exception:
+                    pass
 
             # Create a separate connection for keepalive publishing (main thread)
             self.logger.debug("Opening keepalive BlockingConnection ...")
@@ -120,52 +201,195 @@ class OpenA3XXMessagingService:
             # Start publisher thread once
             if self._publisher_thread is None or not self._publisher_thread.is_alive():
                 self._stop_publisher.clear()
-                self._publisher_thread = threading.Thread(target=self._publisher_loop, name="amqp-publisher", daemon=True)
+                target = self._pipelined_publisher.run if self._pipelined_publisher is not None else self._publisher_loop
+                self._publisher_thread = threading.Thread(target=target, name="amqp-publisher", daemon=True)
                 self._publisher_thread.start()
 
         except Exception as ex:
             self.logger.critical(f"AMQP initialization error: {ex}")
             raise ex
 
-    def publish_hardware_event(self, hardware_board_id: int, extender_bus_bit_details: dict):
+    def publish_hardware_event(self, hardware_board_id: int, extender_bus_bit_details: dict,
+                               pressed: bool | None = None):
         """Persist an event to disk spool and signal the publisher thread.
 
         Returns immediately from interrupt callbacks. The publisher thread
         reads spooled events and publishes in FIFO order, surviving restarts.
+        ``pressed`` overrides the ``pressed`` key of the bit details, so
+        callers can pass the shared bit dict without copying it.
+        """
+        if pressed is None:
+            pressed = extender_bus_bit_details.get("pressed", False)
+        try:
+            template = extender_bus_bit_details.get("event_template")
+            if template is None or template.hardware_board_id != hardware_board_id:
+                template = self.prepare_hardware_event(hardware_board_id, extender_bus_bit_details)
+            key = template.input_selector_id
+            key = key if isinstance(key, int) else NO_KEY
+            if self._binary_events:
+                self._enqueue_payload(template.render_binary(pressed), key, RECORD_KIND_BINARY)
+            else:
+                self._enqueue_payload(template.render(pressed), key)
+        except Exception as ex:
+            GPIO.output(FAULT_LED, GPIO.HIGH)
+            self.logger.critical(f"Failed to spool hardware event: {ex}")
+
+    def prepare_hardware_event(self, hardware_board_id: int,
+                               extender_bus_bit_details: dict) -> OpenA3XXHardwareEventTemplate:
+        """Pre-serialize the event body of an input bit (stored in its details as ``event_template``).
+
+        Called at bit registration so publish_hardware_event only splices in
+        the pressed flag and the timestamp; bits that were not prepared are
+        prepared on their first event.
+        """
+        template = OpenA3XXHardwareEventTemplate(hardware_board_id, extender_bus_bit_details)
+        extender_bus_bit_details["event_template"] = template
+        return template
+
+    def publish_hardware_event_batch(self, hardware_board_id: int, changes: list):
+        """Spool several bit changes observed together as one batched message.
+
+        ``changes`` is a list of (extender_bus_bit_details, pressed) tuples. The
+        message carries ``"event_type": "hardware_event_batch"`` and an
+        ``events`` list of regular single-event bodies sharing one timestamp.
+        """
+        timestamp = str(dt.datetime.now(dt.UTC))
+        message = {
+            "hardware_board_id": hardware_board_id,
+            "event_type": "hardware_event_batch",
+            "events": [self._hardware_event_message(hardware_board_id, details, pressed, timestamp)
+                       for details, pressed in changes],
+            "timestamp": timestamp,
+        }
+        self._enqueue_message(message)
+
+    @staticmethod
+    def _hardware_event_message(hardware_board_id: int, extender_bus_bit_details: dict, pressed: bool,
+                                timestamp: str) -> dict:
+        return {
+            "hardware_board_id": hardware_board_id,
+            "extender_bit_id": extender_bus_bit_details["extender_bit_id"],
+            "extender_bit_name": extender_bus_bit_details["extender_bit_name"],
+            "extender_bus_id": extender_bus_bit_details["extender_bus_id"],
+            "extender_bus_name": extender_bus_bit_details["extender_bus_name"],
+            "input_selector_name": extender_bus_bit_details["input_selector_name"],
+            "input_selector_id": extender_bus_bit_details["input_selector_id"],
+            "pressed": bool(pressed),
+            "timestamp": timestamp,
+        }
+
+    def publish_encoder_event(self, hardware_board_id: int, extender_bus_bit_details: dict, delta: int):
+        """Spool an aggregated rotary encoder event carrying a signed detent delta.
+
+        The bit details identify the encoder (its first bit); ``delta`` is the
+        number of detents turned during the coalescing window.
+        """
+        message = {
+            "hardware_board_id": hardware_board_id,
+            "event_type": "encoder",
+            "extender_bit_id": extender_bus_bit_details["extender_bit_id"],
+            "extender_bit_name": extender_bus_bit_details["extender_bit_name"],
+            "extender_bus_id": extender_bus_bit_details["extender_bus_id"],
+            "extender_bus_name": extender_bus_bit_details["extender_bus_name"],
+            "input_selector_name": extender_bus_bit_details["input_selector_name"],
+            "input_selector_id": extender_bus_bit_details["input_selector_id"],
+            "encoder_delta": int(delta),
+            "timestamp": str(dt.datetime.now(dt.UTC)),
+        }
+        self._enqueue_message(message)
+
+    def publish_selector_position_event(self, hardware_board_id: int, extender_bus_bit_details: dict,
+                                        position: int):
+        """Spool a settled multi-position selector event ("position = N").
+
+        The bit details identify the selector group (its first mapped bit);
+        ``position`` is the index of the selected bit in the group, -1 if none.
         """
         message = {
             "hardware_board_id": hardware_board_id,
+            "event_type": "selector_position",
             "extender_bit_id": extender_bus_bit_details["extender_bit_id"],
             "extender_bit_name": extender_bus_bit_details["extender_bit_name"],
             "extender_bus_id": extender_bus_bit_details["extender_bus_id"],
             "extender_bus_name": extender_bus_bit_details["extender_bus_name"],
             "input_selector_name": extender_bus_bit_details["input_selector_name"],
             "input_selector_id": extender_bus_bit_details["input_selector_id"],
-            "pressed": bool(extender_bus_bit_details.get("pressed", False)),
+            "selector_position": int(position),
             "timestamp": str(dt.datetime.now(dt.UTC)),
         }
+        self._enqueue_message(message)
+
+    def _enqueue_message(self, message: dict) -> None:
         try:
-            self._spool_write_message(message)
-            # Non-blocking signal to wake publisher
-            try:
-                self._event_queue.put_nowait(None)
-            except Exception:
-                pass
+            self._enqueue_payload(json.dumps(message).encode("utf-8"), self._spool_key(message))
         except Exception as ex:
             GPIO.output(FAULT_LED, GPIO.HIGH)
             self.logger.critical(f"Failed to spool hardware event: {ex}")
 
-    def keep_alive(self, hardware_board_id: int):
-        """Publish periodic keepalive messages to the keepalive exchange."""
+    def _enqueue_payload(self, payload: bytes, key: int, kind: int = RECORD_KIND_JSON) -> None:
+        """Append a serialized event body to the spool and wake the publisher."""
+        start_ns = time.perf_counter_ns()
+        self._event_log.append(payload, kind=kind, key=key, sync=self._sync_each_event)
+        self._enqueue_latency.add(time.perf_counter_ns() - start_ns)
+        # Non-blocking signal to wake publisher
+        if self._pipelined_publisher is not None:
+            self._pipelined_publisher.wake()
+            return
         try:
-            if self.keepalive_channel.is_closed:
-                self.logger.warning("Keepalive channel closed; reconnecting")
-                self._connect_keepalive_channel()
+            self._event_queue.put_nowait(None)
         except Exception:
-            self.logger.warning("Keepalive channel invalid; reconnecting")
-            self._connect_keepalive_channel()
+            pass
 
+    def get_spool_metrics(self) -> dict:
+        """Return the spool durability tier, its measured enqueue latency and backlog counters."""
+        return {
+            "durability": self.spool_durability,
+            "enqueue_latency": self._enqueue_latency.snapshot(),
+            "pending": self._event_log.pending_count(),
+            "compacted": self._event_log.compacted_count,
+            "dropped": getattr(self._event_log, "dropped_count", 0),
+        }
+
+    def get_connection_metrics(self) -> dict:
+        """Return the AMQP circuit breaker state, probe counters and time-to-recover (seconds)."""
+        return self._connection_manager.get_metrics()
+
+    def _report_spool_metrics(self) -> None:
+        now = time.monotonic()
+        if now - self._metrics_reported_at < SPOOL_METRICS_REPORT_SECONDS:
+            return
+        self._metrics_reported_at = now
+        metrics = self.get_spool_metrics()
+        latency = metrics["enqueue_latency"]
+        if latency["count"]:
+            self.logger.info(f"Event spool ({metrics['durability']}): enqueue p50 {latency['p50_us']} us, "
+                             f"p99 {latency['p99_us']} us, max {latency['max_us']} us over "
+                             f"{latency['count']} events; {metrics['pending']} pending")
+        connection = self.get_connection_metrics()
+        if connection["open_count"]:
+            self.logger.info(f"AMQP circuit {connection['state']}: opened {connection['open_count']} time(s), "
+                             f"last time to recover {connection['last_time_to_recover_s']} s, "
+                             f"max {connection['max_time_to_recover_s']} s")
+
+    def keep_alive(self, hardware_board_id: int):
+        """Publish periodic keepalive messages to the keepalive exchange.
+
+        Failures feed the AMQP circuit breaker instead of raising; while the
+        circuit is open the keepalive is skipped (the broker is being probed in
+        the background) instead of reconnecting inline.
+        """
+        self._report_spool_metrics()
+        if self._connection_manager.is_open:
+            self.logger.warning("Keepalive skipped: AMQP broker unreachable, reconnecting in the background")
+            return
         try:
+            try:
+                if self.keepalive_channel.is_closed:
+                    self.logger.warning("Keepalive channel closed; reconnecting")
+                    self._connect_keepalive_channel()
+            except Exception:
+                self.logger.warning("Keepalive channel invalid; reconnecting")
+                self._connect_keepalive_channel()
             message = {
                 "timestamp": str(dt.datetime.now(dt.UTC)),
                 "hardware_board_id": hardware_board_id,
@@ -179,30 +403,51 @@ class OpenA3XXMessagingService:
                                                  body=json.dumps(message))
             GPIO.output(MESSAGING_LED, GPIO.LOW)
             GPIO.output(FAULT_LED, GPIO.LOW)
+            self._connection_manager.record_success()
         except Exception as ex:
+            GPIO.output(MESSAGING_LED, GPIO.LOW)
+            GPIO.output(FAULT_LED, GPIO.HIGH)
             self.logger.critical(f"Keepalive publish failed: {ex}")
-            raise OpenA3XXRabbitMqPublishingException(ex)
+            self._connection_manager.record_failure(ex)
+
+    def stop(self):
+        """Stop the publisher thread, close AMQP connections and the event spool."""
+        self._stop_publisher.set()
+        if self._pipelined_publisher is not None:
+            self._pipelined_publisher.stop()
+        if self._publisher_thread is not None:
+            self._publisher_thread.join(timeout=5.0)
+        self._connection_manager.stop()
+        for connection in (self._data_connection, self._keepalive_connection):
+            try:
+                if connection is not None and connection.is_open:
+                    connection.close()
+            except Exception:
+                pass
+        try:
+            self._event_log.close()
+        except Exception as ex:
+            self.logger.warning(f"Failed closing event spool: {ex}")
 
     # ----- Internal helpers -----
-    def _connect_data_channel(self):
+    def _connection_parameters(self, connection_attempts: int = 1) -> pika.ConnectionParameters:
         configuration = self.configuration_data
-        username = configuration["opena3xx-amqp-username"]
-        password = configuration["opena3xx-amqp-password"]
-        host = configuration["opena3xx-amqp-host"]
-        port = int(configuration["opena3xx-amqp-port"])
-        vhost = configuration.get("opena3xx-amqp-vhost", "/")
-        credentials = pika.PlainCredentials(username, password)
-        parameters = pika.ConnectionParameters(
-            host=host,
-            port=port,
-            virtual_host=vhost,
+        credentials = pika.PlainCredentials(configuration["opena3xx-amqp-username"],
+                                            configuration["opena3xx-amqp-password"])
+        return pika.ConnectionParameters(
+            host=configuration["opena3xx-amqp-host"],
+            port=int(configuration["opena3xx-amqp-port"]),
+            virtual_host=configuration.get("opena3xx-amqp-vhost", "/"),
             credentials=credentials,
             heartbeat=30,
             blocked_connection_timeout=10,
-            connection_attempts=5,
+            connection_attempts=connection_attempts,
             retry_delay=2.0,
-            socket_timeout=10,
+            socket_timeout=5,
         )
+
+    def _connect_data_channel(self):
+        parameters = self._connection_parameters()
         try:
             if self._data_connection is not None:
                 try:
@@ -221,24 +466,7 @@ class OpenA3XXMessagingService:
             raise
 
     def _connect_keepalive_channel(self):
-        configuration = self.configuration_data
-        username = configuration["opena3xx-amqp-username"]
-        password = configuration["opena3xx-amqp-password"]
-        host = configuration["opena3xx-amqp-host"]
-        port = int(configuration["opena3xx-amqp-port"])
-        vhost = configuration.get("opena3xx-amqp-vhost", "/")
-        credentials = pika.PlainCredentials(username, password)
-        parameters = pika.ConnectionParameters(
-            host=host,
-            port=port,
-            virtual_host=vhost,
-            credentials=credentials,
-            heartbeat=30,
-            blocked_connection_timeout=10,
-            connection_attempts=5,
-            retry_delay=2.0,
-            socket_timeout=10,
-        )
+        parameters = self._connection_parameters()
         try:
             if self._keepalive_connection is not None:
                 try:
@@ -253,97 +481,134 @@ class OpenA3XXMessagingService:
             raise
 
     def _publisher_loop(self):
+        message = None
         while not self._stop_publisher.is_set():
-            # Process any spooled files first (FIFO by filename)
-            files = self._spool_list_paths()
-            if not files:
-                # Wait for a wake signal, then loop
-                try:
-                    self._event_queue.get(timeout=0.5)
+            # Spooled records are published in append (FIFO) order
+            if message is None:
+                message = self._replay_batcher.next_message(self._event_log)
+                if message is None:
+                    self._event_log.commit_offset()
+                    # Wait for a wake signal, then loop
                     try:
-                        self._event_queue.task_done()
-                    except Exception:
+                        self._event_queue.get(timeout=0.5)
+                        try:
+                            self._event_queue.task_done()
+                        except Exception:
+                            pass
+                    except Empty:
                         pass
-                except Empty:
-                    pass
-                continue
+                    continue
+            records, body, properties = message
 
-            path = files[0]
+            # Park while the circuit is open; the connection manager probes
+            # the broker in the background and releases us once it answers
+            if not self._connection_manager.wait_until_available(timeout=0.5):
+                continue
             try:
-                message = self._spool_read(path)
+                if getattr(self, 'data_channel', None) is None or self.data_channel.is_closed:
+                    self.logger.warning("Data channel not open; reconnecting")
+                    self._connect_data_channel()
+                # The spooled payload is the serialized JSON body
+                self.data_channel.basic_publish(
+                    exchange=self.rabbitmq_data_exchange,
+                    routing_key="*",
+                    body=body,
+                    properties=properties,
+                )
             except Exception as ex:
-                self.logger.warning(f"Failed reading spooled event {path.name}: {ex}; deleting file")
+                self.logger.warning(f"Publishing spooled event(s) {records[0].seq}..{records[-1].seq} failed: {ex}")
                 try:
-                    self._spool_delete(path)
+                    if self._data_connection is not None:
+                        self._data_connection.close()
                 except Exception:
                     pass
+                self._connection_manager.record_failure(ex)
+                if self._connection_manager.is_open:
+                    GPIO.output(FAULT_LED, GPIO.HIGH)
+                else:
+                    self._stop_publisher.wait(self._connection_manager.retry_delay())
                 continue
 
-            # Try to publish with backoff and reconnect
-            published = False
-            backoff = 0.5
-            for attempt in range(5):
-                try:
-                    if getattr(self, 'data_channel', None) is None or self.data_channel.is_closed:
-                        self.logger.warning("Data channel not open; reconnecting")
-                        self._connect_data_channel()
-                    self.data_channel.basic_publish(
-                        exchange=self.rabbitmq_data_exchange,
-                        routing_key="*",
-                        body=json.dumps(message),
-                    )
-                    GPIO.output(FAULT_LED, GPIO.LOW)
-                    published = True
-                    break
-                except Exception as ex:
-                    self.logger.warning(f"Publish attempt {attempt + 1} failed: {ex}")
-                    try:
-                        if self._data_connection is not None:
-                            self._data_connection.close()
-                    except Exception:
-                        pass
-                    time.sleep(backoff)
-                    backoff = min(5.0, backoff * 2)
-
-            if published:
-                try:
-                    self._spool_delete(path)
-                except Exception as ex:
-                    self.logger.warning(f"Published but failed to delete spool file {path.name}: {ex}")
-            else:
-                GPIO.output(FAULT_LED, GPIO.HIGH)
-                self.logger.warning(f"Will retry later for spooled event {path.name}")
+            self._connection_manager.record_success()
+            GPIO.output(FAULT_LED, GPIO.LOW)
+            try:
+                self._event_log.ack(records[-1].seq)
+            except Exception as ex:
+                self.logger.warning(f"Published but failed to commit spool offset {records[-1].seq}: {ex}")
+            message = None
 
     # ----- Spool helpers -----
-    def _spool_write_message(self, message: dict) -> None:
-        ts_ms = int(time.time() * 1000)
-        name = f"{ts_ms:013d}_{uuid.uuid4().hex}.json"
-        tmp = self._spool_path / (name + ".tmp")
-        final = self._spool_path / name
-        with open(tmp, "w", encoding="utf-8") as f:
-            f.write(json.dumps(message, separators=(",", ":")))
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, final)
-
-    def _spool_list_paths(self) -> list[Path]:
+    def _open_event_log(self) -> OpenA3XXEventLog:
+        """Open the disk spool (segmented write-ahead log) in OPENA3XX_EVENT_SPOOL_DIR."""
+        spool_dir = os.getenv("OPENA3XX_EVENT_SPOOL_DIR", "/tmp/opena3xx_event_spool")
+        self._spool_path = Path(spool_dir)
         try:
-            files = [p for p in self._spool_path.iterdir() if p.is_file() and p.suffix == ".json"]
-            return sorted(files, key=lambda p: p.name)
+            self._spool_path.mkdir(parents=True, exist_ok=True)
         except Exception:
-            return []
+            # Fallback to /tmp if provided path not writable
+            self._spool_path = Path("/tmp/opena3xx_event_spool")
+            self._spool_path.mkdir(parents=True, exist_ok=True)
+        sync_interval_ms = 0
+        if self.spool_durability == SPOOL_DURABILITY_PERIODIC:
+            sync_interval_ms = max(1, env_int("OPENA3XX_SPOOL_FSYNC_INTERVAL_MS", SPOOL_FSYNC_INTERVAL_MS, self.logger))
+        return OpenA3XXEventLog(
+            self._spool_path,
+            segment_bytes=env_int("OPENA3XX_EVENT_LOG_SEGMENT_BYTES", EVENT_LOG_SEGMENT_BYTES, self.logger),
+            offset_commit_ms=env_int("OPENA3XX_EVENT_LOG_OFFSET_COMMIT_MS", EVENT_LOG_OFFSET_COMMIT_MS,
+                                     self.logger),
+            compaction=self._spool_compaction_policy(),
+            sync_interval_ms=sync_interval_ms,
+        )
 
-    def _spool_read(self, path: Path) -> dict:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.loads(f.read())
+    def _spool_write_message(self, message: dict) -> None:
+        self._event_log.append(json.dumps(message).encode("utf-8"), key=self._spool_key(message),
+                               sync=self._sync_each_event)
+
+    @staticmethod
+    def _spool_key(message: dict) -> int:
+        # Only state-carrying events (single bit events without an event type,
+        # selector positions) are keyed for compaction; any other event type,
+        # e.g. encoder deltas and batches, must all be replayed
+        key = message.get("input_selector_id")
+        if not isinstance(key, int) or message.get("event_type") not in (None, "selector_position"):
+            return NO_KEY
+        return key
+
+    def _spool_compaction_policy(self) -> OpenA3XXCompactionPolicy:
+        ttl_seconds = env_float("OPENA3XX_SPOOL_COMPACTION_TTL_S", SPOOL_COMPACTION_TTL_SECONDS, self.logger)
+        try:
+            mode, default_ttl = parse_compaction_rule(os.getenv("OPENA3XX_SPOOL_COMPACTION", SPOOL_COMPACTION),
+                                                      ttl_seconds)
+        except ValueError as ex:
+            self.logger.warning(f"{ex}; spool compaction disabled by default")
+            mode, default_ttl = "none", ttl_seconds
+        overrides = {}
+        for selector_id, rule in parse_key_value_list(os.getenv("OPENA3XX_SPOOL_COMPACTION_SELECTORS")).items():
+            try:
+                overrides[int(selector_id)] = parse_compaction_rule(rule, ttl_seconds)
+            except ValueError:
+                self.logger.warning(f"Ignoring invalid spool compaction rule '{selector_id}={rule}'")
+        policy = OpenA3XXCompactionPolicy(mode, default_ttl, overrides)
+        if policy.enabled:
+            self.logger.info(f"Spool compaction: default={mode}, overrides={len(overrides)}")
+        return policy
 
-    def _spool_delete(self, path: Path) -> None:
+    def _spool_import_legacy_files(self) -> None:
+        """Move events left by the former file-per-event spool into the log."""
         try:
-            path.unlink(missing_ok=True)  # type: ignore[call-arg]
-        except TypeError:
-            # Python <3.8 compatibility
+            files = sorted((p for p in self._spool_path.iterdir() if p.is_file() and p.suffix == ".json"),
+                           key=lambda p: p.name)
+        except Exception:
+            return
+        for path in files:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._spool_write_message(json.loads(f.read()))
+            except Exception as ex:
+                self.logger.warning(f"Dropping unreadable legacy spool file {path.name}: {ex}")
             try:
-                if path.exists():
-                    path.unlink()
+                path.unlink()
             except Exception:
                 pass
+        if files:
+            self.logger.info(f"Imported {len(files)} legacy spooled event(s) into the event log")
@@ -1,12 +1,36 @@
 import logging
+import os
+import selectors
 import threading
 import time
-from typing import Callable, Dict, Optional
+from array import array
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
 class _BackendBase:
+    # Backends that can deliver kernel line events (with kernel timestamps)
+    # override these; others fall back to the software polling loop.
+    supports_edge_events: bool = False
+
+    def request_falling_edge(self, pin: int) -> None:
+        raise NotImplementedError
+
+    def edge_event_fd(self, pin: int) -> int:
+        raise NotImplementedError
+
+    def read_edge_events(self, pin: int) -> List[int]:
+        """Drain pending falling edges for pin; return kernel timestamps in ns."""
+        raise NotImplementedError
+
+    def release_edge_events(self, pin: int) -> None:
+        pass
+
+    def read_many(self, pins: List[int]) -> List[int]:
+        return [self.read(pin) for pin in pins]
+
     def setup_output(self, pin: int) -> None:
         raise NotImplementedError
 
@@ -31,6 +55,10 @@ class _GpiodBackend(_BackendBase):
         self.chip = gpiod.Chip('gpiochip0')
         self.lines_out: Dict[int, any] = {}
         self.lines_in: Dict[int, any] = {}
+        self.lines_ev: Dict[int, any] = {}
+        self.bias: Dict[int, int] = {}
+
+    supports_edge_events = True
 
     def setup_output(self, pin: int) -> None:
         if pin in self.lines_out:
@@ -54,6 +82,44 @@ class _GpiodBackend(_BackendBase):
             pass
         line.request(consumer='opena3xx', type=self.gpiod.LINE_REQ_DIR_IN, flags=flags)
         self.lines_in[pin] = line
+        self.bias[pin] = flags
+
+    def request_falling_edge(self, pin: int) -> None:
+        if pin in self.lines_ev:
+            return
+        # A line can only be requested once; swap the plain input request for
+        # an event request keeping the bias flags chosen in setup_input.
+        flags = self.bias.get(pin, 0)
+        line = self.lines_in.pop(pin, None)
+        if line is not None:
+            line.release()
+        line = self.chip.get_line(pin)
+        line.request(consumer='opena3xx', type=self.gpiod.LINE_REQ_EV_FALLING_EDGE, flags=flags)
+        # Event lines still support get_value(), so reads keep working
+        self.lines_in[pin] = line
+        self.lines_ev[pin] = line
+
+    def edge_event_fd(self, pin: int) -> int:
+        return self.lines_ev[pin].event_get_fd()
+
+    def read_edge_events(self, pin: int) -> List[int]:
+        line = self.lines_ev[pin]
+        try:
+            events = line.event_read_multiple()
+        except AttributeError:
+            events = [line.event_read()]
+        return [ev.sec * 1_000_000_000 + ev.nsec for ev in events
+                if ev.type == self.gpiod.LineEvent.FALLING_EDGE]
+
+    def release_edge_events(self, pin: int) -> None:
+        line = self.lines_ev.pop(pin, None)
+        if line is None:
+            return
+        self.lines_in.pop(pin, None)
+        try:
+            line.release()
+        except Exception:
+            pass
 
     def write(self, pin: int, value: int) -> None:
         self.lines_out[pin].set_value(1 if value else 0)
@@ -69,6 +135,7 @@ class _GpiodBackend(_BackendBase):
                 pass
         self.lines_out.clear()
         self.lines_in.clear()
+        self.lines_ev.clear()
 
 
 class _LgpioBackend(_BackendBase):
@@ -79,6 +146,14 @@ class _LgpioBackend(_BackendBase):
         self.handle = lgpio.gpiochip_open(0)
         self.outputs: Dict[int, bool] = {}
         self.inputs: Dict[int, bool] = {}
+        self.bias: Dict[int, int] = {}
+        # Per-pin alert plumbing: lgpio reports alerts on its own thread, the
+        # timestamps are queued and a pipe byte makes the fd readable.
+        self.alert_callbacks: Dict[int, any] = {}
+        self.alert_queues: Dict[int, Deque[int]] = {}
+        self.alert_pipes: Dict[int, tuple] = {}
+
+    supports_edge_events = True
 
     def setup_output(self, pin: int) -> None:
         if pin in self.outputs:
@@ -100,6 +175,62 @@ class _LgpioBackend(_BackendBase):
             pass
         self.lgpio.gpio_claim_input(self.handle, pin, flags)
         self.inputs[pin] = True
+        self.bias[pin] = flags
+
+    def request_falling_edge(self, pin: int) -> None:
+        if pin in self.alert_callbacks:
+            return
+        flags = self.bias.get(pin, 0)
+        if pin in self.inputs:
+            self.lgpio.gpio_free(self.handle, pin)
+        self.lgpio.gpio_claim_alert(self.handle, pin, self.lgpio.FALLING_EDGE, flags)
+        self.inputs[pin] = True
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        queue: Deque[int] = deque()
+        self.alert_queues[pin] = queue
+        self.alert_pipes[pin] = (read_fd, write_fd)
+
+        def _on_alert(_chip, gpio, level, timestamp):
+            if level != 0:
+                return
+            queue.append(int(timestamp))
+            try:
+                os.write(write_fd, b"\x00")
+            except BlockingIOError:
+                pass  # pipe already signalled
+
+        self.alert_callbacks[pin] = self.lgpio.callback(self.handle, pin, self.lgpio.FALLING_EDGE, _on_alert)
+
+    def edge_event_fd(self, pin: int) -> int:
+        return self.alert_pipes[pin][0]
+
+    def read_edge_events(self, pin: int) -> List[int]:
+        try:
+            os.read(self.alert_pipes[pin][0], 4096)
+        except BlockingIOError:
+            pass
+        queue = self.alert_queues[pin]
+        stamps: List[int] = []
+        while queue:
+            stamps.append(queue.popleft())
+        return stamps
+
+    def release_edge_events(self, pin: int) -> None:
+        cb = self.alert_callbacks.pop(pin, None)
+        if cb is None:
+            return
+        try:
+            cb.cancel()
+        except Exception:
+            pass
+        for fd in self.alert_pipes.pop(pin, ()):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.alert_queues.pop(pin, None)
 
     def write(self, pin: int, value: int) -> None:
         self.lgpio.gpio_write(self.handle, pin, 1 if value else 0)
@@ -108,6 +239,8 @@ class _LgpioBackend(_BackendBase):
         return self.lgpio.gpio_read(self.handle, pin)
 
     def cleanup(self) -> None:
+        for pin in list(self.alert_callbacks.keys()):
+            self.release_edge_events(pin)
         try:
             self.lgpio.gpiochip_close(self.handle)
         except Exception:
@@ -121,11 +254,20 @@ class _RPiBackend(_BackendBase):
         import RPi.GPIO as RPiGPIO
         self.GPIO = RPiGPIO
         self.GPIO.setmode(self.GPIO.BCM)
+        self.inputs: Dict[int, bool] = {}
+        # RPi.GPIO runs edge callbacks on its own thread and gives no
+        # timestamp: edges are stamped on arrival, queued, and a pipe byte
+        # makes the fd readable (same plumbing as the lgpio alerts).
+        self.edge_queues: Dict[int, Deque[int]] = {}
+        self.edge_pipes: Dict[int, tuple] = {}
+
+    supports_edge_events = True
 
     def setup_output(self, pin: int) -> None:
         self.GPIO.setup(pin, self.GPIO.OUT)
 
     def setup_input(self, pin: int, pull_up: bool = False, pull_down: bool = False) -> None:
+        self.inputs[pin] = True
         if pull_up:
             self.GPIO.setup(pin, self.GPIO.IN, pull_up_down=self.GPIO.PUD_UP)
         elif pull_down:
@@ -136,11 +278,113 @@ class _RPiBackend(_BackendBase):
     def write(self, pin: int, value: int) -> None:
         self.GPIO.output(pin, self.GPIO.HIGH if value else self.GPIO.LOW)
 
+    def request_falling_edge(self, pin: int) -> None:
+        if pin in self.edge_pipes:
+            return
+        if pin not in self.inputs:
+            self.setup_input(pin)
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        queue: Deque[int] = deque()
+
+        def _on_edge(_channel):
+            queue.append(time.monotonic_ns())
+            try:
+                os.write(write_fd, b"\x00")
+            except BlockingIOError:
+                pass  # pipe already signalled
+
+        try:
+            # Debounce stays with the dispatcher, like for the other backends
+            self.GPIO.add_event_detect(pin, self.GPIO.FALLING, callback=_on_edge)
+        except Exception:
+            os.close(read_fd)
+            os.close(write_fd)
+            raise
+        self.edge_queues[pin] = queue
+        self.edge_pipes[pin] = (read_fd, write_fd)
+
+    def edge_event_fd(self, pin: int) -> int:
+        return self.edge_pipes[pin][0]
+
+    def read_edge_events(self, pin: int) -> List[int]:
+        try:
+            os.read(self.edge_pipes[pin][0], 4096)
+        except BlockingIOError:
+            pass
+        queue = self.edge_queues[pin]
+        stamps: List[int] = []
+        while queue:
+            stamps.append(queue.popleft())
+        return stamps
+
+    def release_edge_events(self, pin: int) -> None:
+        pipe = self.edge_pipes.pop(pin, None)
+        if pipe is None:
+            return
+        try:
+            self.GPIO.remove_event_detect(pin)
+        except Exception:
+            pass
+        for fd in pipe:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.edge_queues.pop(pin, None)
+
     def read(self, pin: int) -> int:
         return self.GPIO.input(pin)
 
     def cleanup(self) -> None:
+        for pin in list(self.edge_pipes.keys()):
+            self.release_edge_events(pin)
         self.GPIO.cleanup()
+        self.inputs.clear()
+
+
+class _EdgeTable:
+    """Compact per-pin edge detection state shared by the dispatcher thread.
+
+    One slot per registered pin; debounce and polling state live in parallel
+    arrays instead of per-pin dicts.
+    """
+
+    def __init__(self):
+        self.slot_of: Dict[int, int] = {}
+        self.pins: List[int] = []
+        self.callbacks: List[Callable[[int], None]] = []
+        self.kernel = array('b')      # 1 = kernel event fd, 0 = software polled
+        self.bounce_ns = array('q')
+        self.last_ns = array('q')     # timestamp of the last dispatched edge
+        self.last_level = array('b')  # previous level for polled pins
+
+    def add(self, pin: int, callback: Callable[[int], None], bounce_ms: int, kernel: bool, level: int) -> int:
+        slot = len(self.pins)
+        self.slot_of[pin] = slot
+        self.pins.append(pin)
+        self.callbacks.append(callback)
+        self.kernel.append(1 if kernel else 0)
+        self.bounce_ns.append(max(0, bounce_ms) * 1_000_000)
+        self.last_ns.append(-(1 << 62))
+        self.last_level.append(level)
+        return slot
+
+    def remove(self, pin: int) -> None:
+        slot = self.slot_of.pop(pin)
+        last = len(self.pins) - 1
+        if slot != last:
+            # Move the last slot into the hole to keep the arrays dense
+            moved = self.pins[last]
+            self.slot_of[moved] = slot
+            for seq in (self.pins, self.callbacks, self.kernel, self.bounce_ns, self.last_ns, self.last_level):
+                seq[slot] = seq[last]
+        for seq in (self.pins, self.callbacks, self.kernel, self.bounce_ns, self.last_ns, self.last_level):
+            seq.pop()
+
+    def polled_slots(self) -> List[int]:
+        return [slot for slot, kernel in enumerate(self.kernel) if not kernel]
 
 
 class GPIO:
@@ -155,10 +399,15 @@ class GPIO:
     PUD_DOWN = 2
 
     _backend: _BackendBase = None  # type: ignore
-    _event_threads: Dict[int, threading.Thread] = {}
-    _event_stop_flags: Dict[int, bool] = {}
-    _event_callbacks: Dict[int, Callable[[int], None]] = {}
-    _event_bounce_ms: Dict[int, int] = {}
+    # All edge detection runs on a single dispatcher thread, whatever the
+    # number of registered pins.
+    _edge_table: _EdgeTable = _EdgeTable()
+    _edge_lock = threading.RLock()
+    _edge_selector: Optional[selectors.BaseSelector] = None
+    _edge_wake_pipe: Optional[tuple] = None
+    _edge_thread: Optional[threading.Thread] = None
+    _edge_stop = threading.Event()
+    _POLL_INTERVAL_S = 0.001
 
     @classmethod
     def _ensure_backend(cls):
@@ -231,34 +480,24 @@ class GPIO:
     @classmethod
     def add_event_detect(cls, pin: int, edge: int, callback: Callable[[int], None], bouncetime: int = 10):
         cls._ensure_backend()
-        # Software edge detection loop (falling edge)
-        if pin in cls._event_threads:
-            return
-        cls._event_callbacks[pin] = callback
-        cls._event_bounce_ms[pin] = max(0, bouncetime)
-        cls._event_stop_flags[pin] = False
-
-        def _loop():
-            last = cls._backend.read(pin)
-            last_time = 0.0
-            while not cls._event_stop_flags.get(pin, False):
-                val = cls._backend.read(pin)
-                now = time.monotonic()
-                if val != last:
-                    logger.debug(f"GPIO {pin} state changed {last} -> {val}")
-                if edge == cls.FALLING and last == 1 and val == 0:
-                    if (now - last_time) * 1000.0 >= cls._event_bounce_ms[pin]:
-                        try:
-                            cls._event_callbacks[pin](pin)
-                        except Exception as ex:
-                            logger.exception(ex)
-                        last_time = now
-                last = val
-                time.sleep(0.001)
+        with cls._edge_lock:
+            if pin in cls._edge_table.slot_of:
+                return
 
-        t = threading.Thread(target=_loop, daemon=True)
-        cls._event_threads[pin] = t
-        t.start()
+            use_kernel_events = False
+            if edge == cls.FALLING and cls._backend.supports_edge_events:
+                try:
+                    cls._backend.request_falling_edge(pin)
+                    use_kernel_events = True
+                except Exception as ex:
+                    logger.warning(f"GPIO {pin}: kernel edge events unavailable ({ex}); using polling")
+
+            level = cls._backend.read(pin)
+            cls._edge_table.add(pin, callback, bouncetime, use_kernel_events, level)
+            cls._ensure_dispatcher()
+            if use_kernel_events:
+                cls._edge_selector.register(cls._backend.edge_event_fd(pin), selectors.EVENT_READ, pin)
+            cls._wake_dispatcher()
 
         # If the line is already low, fire once to flush any pending active-low conditions
         try:
@@ -268,24 +507,153 @@ class GPIO:
         except Exception:
             pass
 
+    @classmethod
+    def _ensure_dispatcher(cls):
+        if cls._edge_thread is not None and cls._edge_thread.is_alive():
+            return
+        cls._edge_selector = selectors.DefaultSelector()
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        cls._edge_wake_pipe = (read_fd, write_fd)
+        cls._edge_selector.register(read_fd, selectors.EVENT_READ, None)
+        cls._edge_stop.clear()
+        cls._edge_thread = threading.Thread(target=cls._dispatch_loop, name="gpio-edge-dispatcher", daemon=True)
+        cls._edge_thread.start()
+
+    @classmethod
+    def _wake_dispatcher(cls):
+        if cls._edge_wake_pipe is None:
+            return
+        try:
+            os.write(cls._edge_wake_pipe[1], b"\x00")
+        except BlockingIOError:
+            pass
+
+    @classmethod
+    def _dispatch_loop(cls):
+        table = cls._edge_table
+        selector = cls._edge_selector
+        wake_fd = cls._edge_wake_pipe[0]
+        while not cls._edge_stop.is_set():
+            with cls._edge_lock:
+                polled = table.polled_slots()
+            # Kernel event fds need no timeout at all; software-polled pins
+            # (backends without line events) set the poll cadence.
+            timeout = cls._POLL_INTERVAL_S if polled else None
+            try:
+                ready = selector.select(timeout)
+            except (OSError, ValueError):
+                break
+
+            # Kernel event timestamps come from the backend's event clock,
+            # polled edges are stamped with time.monotonic_ns(): the two
+            # clocks are not comparable, so each source is ordered on its own.
+            edges: List[tuple] = []
+            polled_edges: List[tuple] = []
+            with cls._edge_lock:
+                for key, _mask in ready:
+                    if key.data is None:
+                        try:
+                            os.read(wake_fd, 4096)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    pin = key.data
+                    slot = table.slot_of.get(pin)
+                    if slot is None:
+                        continue
+                    try:
+                        for ts in cls._backend.read_edge_events(pin):
+                            edges.append((ts, slot))
+                    except Exception as ex:
+                        logger.exception(ex)
+
+                # Registrations may have changed while blocked in select()
+                polled = table.polled_slots()
+                if polled:
+                    now = time.monotonic_ns()
+                    try:
+                        levels = cls._backend.read_many([table.pins[slot] for slot in polled])
+                    except Exception as ex:
+                        logger.exception(ex)
+                        levels = []
+                    for slot, level in zip(polled, levels):
+                        last = table.last_level[slot]
+                        if level != last:
+                            logger.debug(f"GPIO {table.pins[slot]} state changed {last} -> {level}")
+                            table.last_level[slot] = level
+                            if last == 1 and level == 0:
+                                polled_edges.append((now, slot))
+
+                # Dispatch kernel edges in timestamp order, then the edges seen
+                # by this poll (they were sampled after the queued events),
+                # applying per-pin bouncetime in the pin's own clock
+                edges.sort()
+                edges.extend(polled_edges)
+                due: List[tuple] = []
+                for ts, slot in edges:
+                    if ts - table.last_ns[slot] < table.bounce_ns[slot]:
+                        continue
+                    table.last_ns[slot] = ts
+                    due.append((table.pins[slot], table.callbacks[slot]))
+
+            for pin, callback in due:
+                try:
+                    callback(pin)
+                except Exception as ex:
+                    logger.exception(ex)
+
+    @classmethod
+    def _stop_dispatcher(cls):
+        cls._edge_stop.set()
+        cls._wake_dispatcher()
+        thread = cls._edge_thread
+        if thread is not None and thread is not threading.current_thread():
+            try:
+                thread.join(timeout=0.5)
+            except Exception:
+                pass
+        cls._edge_thread = None
+        if cls._edge_selector is not None:
+            try:
+                cls._edge_selector.close()
+            except Exception:
+                pass
+            cls._edge_selector = None
+        if cls._edge_wake_pipe is not None:
+            for fd in cls._edge_wake_pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            cls._edge_wake_pipe = None
+
     @classmethod
     def remove_event_detect(cls, pin: int):
-        if pin in cls._event_threads:
-            cls._event_stop_flags[pin] = True
+        with cls._edge_lock:
+            slot = cls._edge_table.slot_of.get(pin)
+            if slot is None:
+                return
+            if cls._edge_table.kernel[slot] and cls._edge_selector is not None:
+                try:
+                    cls._edge_selector.unregister(cls._backend.edge_event_fd(pin))
+                except Exception:
+                    pass
+            cls._edge_table.remove(pin)
             try:
-                cls._event_threads[pin].join(timeout=0.5)
+                cls._backend.release_edge_events(pin)
             except Exception:
                 pass
-            cls._event_threads.pop(pin, None)
-            cls._event_callbacks.pop(pin, None)
-            cls._event_bounce_ms.pop(pin, None)
-            cls._event_stop_flags.pop(pin, None)
+            empty = not cls._edge_table.pins
+        if empty:
+            cls._stop_dispatcher()
+        else:
+            cls._wake_dispatcher()
 
     @classmethod
     def cleanup(cls):
-        for pin in list(cls._event_threads.keys()):
+        for pin in list(cls._edge_table.slot_of.keys()):
             cls.remove_event_detect(pin)
         if cls._backend is not None:
             cls._backend.cleanup()
-
-
@@ -0,0 +1,73 @@
+"""Per-bit software debounce for MCP23017 input bits.
+
+Each extender keeps one BitDebouncer: a timestamp state machine per bit stored
+in compact arrays. The first change of a bit is accepted immediately; further
+changes inside that bit's window are held as pending and re-evaluated from a
+fresh register read once the window has elapsed, so the final level is never
+lost and each switch only pays for its own window.
+"""
+
+from array import array
+from typing import Optional
+
+from opena3xx.hardware.opena3xx_dispatch import MCP23017_BITS_PER_BUS
+
+_NEVER_NS = -(1 << 62)
+
+
+class BitDebouncer:
+    """Debounce state for the 16 bits of one extender."""
+
+    __slots__ = ("window_ns", "last_accept_ns", "pending")
+
+    def __init__(self, window_ms: int):
+        self.window_ns = array('q', [max(0, int(window_ms)) * 1_000_000] * MCP23017_BITS_PER_BUS)
+        self.last_accept_ns = array('q', [_NEVER_NS] * MCP23017_BITS_PER_BUS)
+        # Bits that changed inside their window and must be settled later
+        self.pending: int = 0
+
+    def set_window_ms(self, bus_bit: int, window_ms: int) -> None:
+        self.window_ns[bus_bit] = max(0, int(window_ms)) * 1_000_000
+
+    def filter(self, changed_mask: int, now_ns: int) -> int:
+        """Return the subset of changed_mask accepted at now_ns; hold the rest as pending."""
+        accepted = 0
+        window_ns = self.window_ns
+        last_accept_ns = self.last_accept_ns
+        while changed_mask:
+            lowest = changed_mask & -changed_mask
+            changed_mask ^= lowest
+            bus_bit = lowest.bit_length() - 1
+            if now_ns - last_accept_ns[bus_bit] >= window_ns[bus_bit]:
+                last_accept_ns[bus_bit] = now_ns
+                accepted |= lowest
+                self.pending &= ~lowest
+            else:
+                self.pending |= lowest
+        return accepted
+
+    def next_due_ns(self) -> Optional[int]:
+        """Monotonic time at which the earliest pending bit can be settled."""
+        pending = self.pending
+        due: Optional[int] = None
+        while pending:
+            lowest = pending & -pending
+            pending ^= lowest
+            bus_bit = lowest.bit_length() - 1
+            bit_due = self.last_accept_ns[bus_bit] + self.window_ns[bus_bit]
+            if due is None or bit_due < due:
+                due = bit_due
+        return due
+
+    def take_due(self, now_ns: int) -> int:
+        """Remove and return the pending bits whose window has elapsed."""
+        pending = self.pending
+        due = 0
+        while pending:
+            lowest = pending & -pending
+            pending ^= lowest
+            bus_bit = lowest.bit_length() - 1
+            if now_ns - self.last_accept_ns[bus_bit] >= self.window_ns[bus_bit]:
+                due |= lowest
+        self.pending &= ~due
+        return due
@@ -0,0 +1,120 @@
+"""Precomputed interrupt dispatch structures for the MCP23017 extenders.
+
+Built once during extender registration so the GPIO interrupt callback can go
+from an IRQ pin to the bit details of a flagged MCP23017 bit in constant time,
+without scanning the bus/bit detail lists.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+MCP23017_BITS_PER_BUS: int = 16
+
+# IOCON.BANK=0 register layout: INTFA, INTFB, INTCAPA, INTCAPB are contiguous,
+# so with sequential addressing (IOCON.SEQOP=0) one 4-byte read returns the
+# interrupt flags together with the port levels latched at interrupt time.
+# Reading INTCAP also clears the interrupt and releases the IRQ line.
+MCP23017_REGISTER_INTFA: int = 0x0E
+MCP23017_REGISTER_GPIOA: int = 0x12
+_INTF_INTCAP_READ = bytes([MCP23017_REGISTER_INTFA])
+_GPIO_READ = bytes([MCP23017_REGISTER_GPIOA])
+
+
+class ExtenderBusRecord:
+    """Dispatch record for one extender bus: bus details plus a 16-slot bit table."""
+
+    __slots__ = ("bus_details", "bus_instance", "interrupt_pin", "bits", "input_mask", "input_state",
+                 "mode", "lock", "interrupt_count", "mode_changes", "stuck_line_events", "interrupt_storm_events",
+                 "interrupt_rate", "rate_window_start", "rate_window_count", "irq_low_since", "healthy_since",
+                 "debouncer", "encoders", "encoder_mask", "selector_groups", "selector_group_mask", "logical_mask",
+                 "_snapshot_buffer", "_gpio_buffer")
+
+    def __init__(self, bus_details: dict):
+        self.bus_details: dict = bus_details
+        self.bus_instance = bus_details["bus_instance"]
+        self.interrupt_pin: int = int(bus_details["interrupt_pin"])
+        # Indexed by MCP23017 bit number; None for unconfigured bits
+        self.bits: List[Optional[dict]] = [None] * MCP23017_BITS_PER_BUS
+        self.input_mask: int = 0
+        # Last published level of every input bit (bit N = MCP23017 bit N)
+        self.input_state: int = 0
+        # Current acquisition mode for this extender ("interrupt" or "polling")
+        # and the counters/timers used by IRQ health supervision.
+        self.mode: str = "interrupt"
+        self.lock = threading.Lock()
+        self.interrupt_count: int = 0
+        self.mode_changes: int = 0
+        self.stuck_line_events: int = 0
+        self.interrupt_storm_events: int = 0
+        self.interrupt_rate: float = 0.0
+        self.rate_window_start: float = 0.0
+        self.rate_window_count: int = 0
+        self.irq_low_since: Optional[float] = None
+        self.healthy_since: Optional[float] = None
+        # Per-bit debounce state (BitDebouncer), assigned at registration
+        self.debouncer = None
+        # Logical inputs decoded from groups of bits (quadrature encoders,
+        # multi-position selectors); bits in logical_mask are excluded from
+        # per-bit press/release events
+        self.encoders: list = []
+        self.encoder_mask: int = 0
+        self.selector_groups: list = []
+        self.selector_group_mask: int = 0
+        self.logical_mask: int = 0
+        self._snapshot_buffer = bytearray(4)
+        self._gpio_buffer = bytearray(2)
+
+    def add_bit(self, bit_details: dict) -> None:
+        bus_bit = int(bit_details["bus_bit"])
+        self.bits[bus_bit] = bit_details
+        if bit_details.get("is_input"):
+            self.input_mask |= (1 << bus_bit)
+
+    def add_encoder(self, encoder) -> None:
+        self.encoders.append(encoder)
+        self.encoder_mask |= encoder.mask
+        self.logical_mask |= encoder.mask
+        self.input_mask |= encoder.mask
+
+    def add_selector_group(self, group) -> None:
+        self.selector_groups.append(group)
+        self.selector_group_mask |= group.mask
+        self.logical_mask |= group.mask
+        self.input_mask |= group.mask
+
+    def read_interrupt_snapshot(self) -> Tuple[int, int]:
+        """Read INTF and INTCAP (ports A+B) in one I2C transaction.
+
+        Returns (int_flags, int_capture) as 16-bit words, bit N = MCP23017 bit N.
+        The read clears the pending interrupt on the extender.
+        """
+        buffer = self._snapshot_buffer
+        with self.bus_instance._device as i2c:
+            i2c.write_then_readinto(_INTF_INTCAP_READ, buffer)
+        return buffer[0] | (buffer[1] << 8), buffer[2] | (buffer[3] << 8)
+
+    def read_gpio_word(self) -> int:
+        """Read GPIOA+GPIOB in one I2C transaction as a 16-bit word."""
+        buffer = self._gpio_buffer
+        with self.bus_instance._device as i2c:
+            i2c.write_then_readinto(_GPIO_READ, buffer)
+        return buffer[0] | (buffer[1] << 8)
+
+
+class InterruptDispatchIndex:
+    """Maps Raspberry Pi IRQ pins to their extender bus records."""
+
+    def __init__(self):
+        self._by_pin: Dict[int, ExtenderBusRecord] = {}
+
+    def add_bus(self, record: ExtenderBusRecord) -> None:
+        self._by_pin[record.interrupt_pin] = record
+
+    def lookup(self, interrupt_pin: int) -> Optional[ExtenderBusRecord]:
+        return self._by_pin.get(interrupt_pin)
+
+    def records(self) -> List[ExtenderBusRecord]:
+        return list(self._by_pin.values())
+
+    def clear(self) -> None:
+        self._by_pin.clear()
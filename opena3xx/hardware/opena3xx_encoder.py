@@ -0,0 +1,115 @@
+"""Quadrature rotary encoder decoding on pairs of MCP23017 input bits.
+
+Encoders are declared with ``OPENA3XX_ENCODERS`` as a comma separated list of
+``<bus name>:<bit A>:<bit B>[:<steps per detent>]`` entries, e.g.
+``Bus0:0:1,Bus0:2:3:2``. Each register snapshot is fed through a quadrature
+state table; detent steps are accumulated and published as one signed delta
+per coalescing window instead of one event per raw edge.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from opena3xx.models import ENCODER_STEPS_PER_DETENT, ENCODER_COALESCE_MS
+
+logger = logging.getLogger(__name__)
+
+# Transition table indexed by (previous AB << 2) | current AB: +1/-1 for a
+# valid quarter step, 0 for no change, 2 for an invalid jump (both bits
+# changed, a state was skipped during a fast spin).
+_INVALID = 2
+_TRANSITIONS = (
+    0, -1, 1, _INVALID,
+    1, 0, _INVALID, -1,
+    -1, _INVALID, 0, 1,
+    _INVALID, 1, -1, 0,
+)
+
+
+class QuadratureEncoder:
+    """State machine for one encoder wired to two bits of the same extender."""
+
+    def __init__(self, bit_a: int, bit_b: int, steps_per_detent: int = ENCODER_STEPS_PER_DETENT,
+                 coalesce_ms: int = ENCODER_COALESCE_MS):
+        self.bit_a = bit_a
+        self.bit_b = bit_b
+        self.mask = (1 << bit_a) | (1 << bit_b)
+        self.steps_per_detent = max(1, int(steps_per_detent))
+        self.coalesce_ns = max(0, int(coalesce_ms)) * 1_000_000
+        # Bit details used as the identity of published events (bit A preferred)
+        self.bit_details: Optional[dict] = None
+        self._state: Optional[int] = None
+        self._last_direction = 0
+        self._quarter_steps = 0
+        self._pending_delta = 0
+        self._window_start_ns: Optional[int] = None
+
+    def _ab(self, levels: int) -> int:
+        return (((levels >> self.bit_a) & 1) << 1) | ((levels >> self.bit_b) & 1)
+
+    def reset(self, levels: int) -> None:
+        self._state = self._ab(levels)
+        self._quarter_steps = 0
+
+    def update(self, levels: int, now_ns: int) -> None:
+        """Feed a register word (GPIO or INTCAP) into the decoder."""
+        state = self._ab(levels)
+        if self._state is None:
+            self._state = state
+            return
+        step = _TRANSITIONS[(self._state << 2) | state]
+        self._state = state
+        if step == 0:
+            return
+        if step == _INVALID:
+            # A state was skipped; assume the knob kept turning the same way
+            if not self._last_direction:
+                return
+            step = 2 * self._last_direction
+        else:
+            self._last_direction = step
+        self._quarter_steps += step
+        detents = int(self._quarter_steps / self.steps_per_detent)
+        if detents:
+            self._quarter_steps -= detents * self.steps_per_detent
+            if self._pending_delta == 0 and self._window_start_ns is None:
+                self._window_start_ns = now_ns
+            self._pending_delta += detents
+
+    def next_due_ns(self) -> Optional[int]:
+        if self._window_start_ns is None:
+            return None
+        return self._window_start_ns + self.coalesce_ns
+
+    def take_delta(self, now_ns: int) -> int:
+        """Return and reset the accumulated detent delta once its window has elapsed."""
+        if self._window_start_ns is None or now_ns - self._window_start_ns < self.coalesce_ns:
+            return 0
+        delta = self._pending_delta
+        self._pending_delta = 0
+        self._window_start_ns = None
+        return delta
+
+
+def parse_encoder_spec(spec: Optional[str]) -> Dict[str, List[QuadratureEncoder]]:
+    """Parse an OPENA3XX_ENCODERS value into encoders grouped by bus name."""
+    encoders: Dict[str, List[QuadratureEncoder]] = {}
+    if not spec:
+        return encoders
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        try:
+            if len(parts) not in (3, 4):
+                raise ValueError("expected <bus>:<bit A>:<bit B>[:<steps per detent>]")
+            bit_a, bit_b = int(parts[1]), int(parts[2])
+            if not (0 <= bit_a <= 15 and 0 <= bit_b <= 15) or bit_a == bit_b:
+                raise ValueError("bits must be two distinct values in 0..15")
+            steps = int(parts[3]) if len(parts) == 4 else ENCODER_STEPS_PER_DETENT
+        except ValueError as ex:
+            logger.error(f"Ignoring encoder declaration '{item}': {ex}")
+            continue
+        encoders.setdefault(parts[0].strip(), []).append(QuadratureEncoder(bit_a, bit_b, steps))
+    return encoders
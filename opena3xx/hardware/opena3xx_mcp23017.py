@@ -1,4 +1,5 @@
 import logging
+import os
 import threading
 
 import board
@@ -11,11 +12,19 @@ from tabulate import tabulate
 
 from opena3xx.amqp import OpenA3XXMessagingService
 from opena3xx.exceptions import OpenA3XXI2CRegistrationException, OpenA3XXRabbitMqPublishingException
+from opena3xx.hardware.opena3xx_debounce import BitDebouncer
+from opena3xx.hardware.opena3xx_dispatch import ExtenderBusRecord, InterruptDispatchIndex
+from opena3xx.hardware.opena3xx_encoder import parse_encoder_spec
+from opena3xx.hardware.opena3xx_selector_group import parse_selector_group_spec
 from opena3xx.hardware.opena3xx_lights import OpenA3XXHardwareLightsService
-from opena3xx.helpers import parse_bit_from_name
+from opena3xx.helpers import parse_bit_from_name, parse_key_value_list
 from opena3xx.models import HardwareBoardDetailsDto, MESSAGING_LED, FAULT_LED, GENERAL_LED, EXTENDER_CHIPS_RESET, \
     INPUT_SWITCH
 from opena3xx.models import INTERRUPT_EXTENDER_MAP, EXTENDER_ADDRESS_START, DEBOUNCING_TIME
+from opena3xx.models import INPUT_ACQUISITION_MODE, INPUT_ACQUISITION_MODE_INTERRUPT, \
+    INPUT_ACQUISITION_MODE_POLLING, INPUT_ACQUISITION_MODE_ADAPTIVE, POLL_SCAN_RATE_HZ, POLL_SCAN_REPORT_SECONDS
+from opena3xx.models import EVENT_BATCH_MODE, EVENT_BATCH_WINDOW_US
+from opena3xx.models import IRQ_HEALTH_CHECK_MS, IRQ_STUCK_LOW_MS, IRQ_STORM_RATE_HZ, IRQ_RECOVERY_SECONDS
 
 
 class OpenA3XXHardwareService:
@@ -23,81 +32,208 @@ class OpenA3XXHardwareService:
     def __init__(self, messaging_service: OpenA3XXMessagingService, hardware_board_id: int):
         self.extender_bus_details: list = []
         self.extender_bus_bit_details: list = []
-        self.debouncing_time: int = DEBOUNCING_TIME
+        # IRQ pin -> bus record with a 16-slot bit table, built at registration
+        self.dispatch_index = InterruptDispatchIndex()
+        # Default per-bit debounce window; the IRQ lines themselves are not
+        # debounced. Per-selector windows: OPENA3XX_DEBOUNCE_SELECTOR_MS="<selector id>=<ms>,..."
+        try:
+            self.debouncing_time: int = int(os.getenv("OPENA3XX_DEBOUNCE_MS", DEBOUNCING_TIME))
+        except ValueError:
+            self.debouncing_time = DEBOUNCING_TIME
+        self.selector_debounce_ms: dict[str, int] = {}
+        for selector_id, window in parse_key_value_list(os.getenv("OPENA3XX_DEBOUNCE_SELECTOR_MS")).items():
+            try:
+                self.selector_debounce_ms[selector_id] = int(window)
+            except ValueError:
+                pass
         self.logger = logging.getLogger(self.__class__.__name__)
         self.messaging_service: OpenA3XXMessagingService = messaging_service
         self.hardware_board_id = hardware_board_id
         self._monitor_stop_event = threading.Event()
+        # Set when a batch window or deferred deadline is armed so the monitor
+        # re-plans its sleep instead of waiting for the next health check
+        self._monitor_wake_event = threading.Event()
+        self._input_monitor_thread: threading.Thread | None = None
+        # IRQ pins with edge detection registered by _wire_interrupt
+        self._wired_interrupt_pins: list[int] = []
+        self.acquisition_mode: str = os.getenv("OPENA3XX_INPUT_ACQUISITION_MODE", INPUT_ACQUISITION_MODE).lower()
+        if self.acquisition_mode not in (INPUT_ACQUISITION_MODE_INTERRUPT, INPUT_ACQUISITION_MODE_POLLING,
+                                         INPUT_ACQUISITION_MODE_ADAPTIVE):
+            self.logger.warning(
+                f"Unknown input acquisition mode '{self.acquisition_mode}'; using {INPUT_ACQUISITION_MODE_ADAPTIVE}"
+            )
+            self.acquisition_mode = INPUT_ACQUISITION_MODE_ADAPTIVE
+        try:
+            self.poll_scan_rate_hz: float = max(1.0, float(os.getenv("OPENA3XX_POLL_SCAN_RATE_HZ", POLL_SCAN_RATE_HZ)))
+        except ValueError:
+            self.poll_scan_rate_hz = float(POLL_SCAN_RATE_HZ)
+        # Quadrature encoders declared per bus (OPENA3XX_ENCODERS)
+        self.encoders_by_bus = parse_encoder_spec(os.getenv("OPENA3XX_ENCODERS"))
+        # Multi-position selectors declared per bus (OPENA3XX_SELECTOR_GROUPS)
+        self.selector_groups_by_bus = parse_selector_group_spec(os.getenv("OPENA3XX_SELECTOR_GROUPS"))
+        # Optional batching of simultaneous bit changes into one message
+        self.event_batch_mode: bool = os.getenv(
+            "OPENA3XX_EVENT_BATCH_MODE", "1" if EVENT_BATCH_MODE else "0") in ("1", "true", "True")
+        try:
+            self.event_batch_window_ns: int = max(
+                0, int(os.getenv("OPENA3XX_EVENT_BATCH_WINDOW_US", EVENT_BATCH_WINDOW_US))) * 1000
+        except ValueError:
+            self.event_batch_window_ns = EVENT_BATCH_WINDOW_US * 1000
+        self._batch_lock = threading.Lock()
+        self._batch_changes: list = []
+        self._batch_started_ns: int | None = None
+        # Achieved register scan period in polling mode, updated periodically
+        self.poll_scan_period_ms: float | None = None
+        # Service-wide acquisition mode switch counters (adaptive mode)
+        self.mode_switch_counters: dict = {"to_polling": 0, "to_interrupt": 0}
 
     def bus_interrupt(self, port):
         """GPIO interrupt callback for extender bus IRQ lines.
 
-        Identifies the associated extender bus, reads MCP23017 interrupt flags
-        to locate the triggered bit(s), and publishes an event if the bit is
-        mapped to a hardware input selector. LEDs provide brief visual feedback.
+        Looks up the extender bus record for the IRQ pin, snapshots the
+        MCP23017 INTF/INTCAP registers in a single I2C read, and publishes an
+        event for every flagged bit mapped to a hardware input selector. The
+        pressed state comes from the level latched at interrupt time. LEDs
+        provide brief visual feedback.
         """
         GPIO.output(GENERAL_LED, GPIO.HIGH)
-        self.logger.debug(f"Interrupt received on port {port}")
-        _bus = None
-        _bus_instance = None
-        _bus_pins = []
-
-        for bus in self.extender_bus_details:
-            if int(bus["interrupt_pin"]) == int(port):
-                _bus = bus
-                _bus_instance = bus["bus_instance"]
-                break
-
-        if _bus is None or _bus_instance is None:
+        record = self.dispatch_index.lookup(port)
+        if record is None:
             self.logger.warning(f"No extender bus matched for interrupt port {port}")
             GPIO.output(GENERAL_LED, GPIO.LOW)
             return
 
-        self.logger.debug(f"Matched interrupt to bus id={_bus['extender_bus_id']} name={_bus['extender_bus_name']}")
-
-        for bit in self.extender_bus_bit_details:
-            if bit["extender_bus_id"] == _bus["extender_bus_id"]:
-                _bus_pins.append(bit)
-
+        record.interrupt_count += 1
+        record.rate_window_count += 1
+        cleared = False
         try:
-            flags = list(_bus_instance.int_flag)
-            self.logger.debug(f"MCP int_flag values: {flags}")
-            for pin_flag in flags:
-                for pin in _bus_pins:
-                    if int(pin["bus_bit"]) == int(pin_flag):
-                        pin_value = pin["extender_bit_instance"].value
-                        pressed = not pin_value  # pull-up inputs: LOW means pressed
-                        self.logger.debug(
-                            f"Flag {pin_flag} -> bit {pin['bus_bit']} name={pin['extender_bit_name']} value={pin_value}"
-                        )
-                        if pin['input_selector_name'] is not None:
-                            try:
-                                GPIO.output(MESSAGING_LED, GPIO.HIGH)
-                                event = dict(pin)
-                                event["pressed"] = pressed
-                                self.messaging_service.publish_hardware_event(self.hardware_board_id, event)
-                                GPIO.output(MESSAGING_LED, GPIO.LOW)
-                                self.logger.warning(
-                                    f"Hardware Input Selector: {pin['input_selector_name']} ===> {'Pressed' if pressed else 'Released'}"
-                                )
-                                try:
-                                    pin["last_value"] = pin_value
-                                except Exception:
-                                    pass
-                            except OpenA3XXRabbitMqPublishingException as ex:
-                                GPIO.output(FAULT_LED, GPIO.HIGH)
-                                raise ex
-                        else:
-                            self.logger.debug("Interrupt from a non-mapped input selector; ignoring")
-                        break
+            with record.lock:
+                if record.mode == INPUT_ACQUISITION_MODE_POLLING:
+                    # Degraded to polling: the monitor owns this extender and
+                    # its register reads release the IRQ line.
+                    cleared = True
+                    return
+                int_flags, int_capture = record.read_interrupt_snapshot()
+                cleared = True  # reading INTCAP released the IRQ line
+                self._process_levels(record, int_flags, int_capture)
         finally:
-            # Always clear interrupts to release the IRQ line
-            try:
-                _bus_instance.clear_ints()
-            except Exception:
-                pass
+            # Make sure the IRQ line is released even if the snapshot failed
+            if not cleared:
+                try:
+                    record.bus_instance.clear_ints()
+                except Exception:
+                    pass
             GPIO.output(GENERAL_LED, GPIO.LOW)
 
+    def _process_levels(self, record, candidate_mask: int, levels: int) -> None:
+        """Debounce and publish bits in candidate_mask whose level differs from the last published one.
+
+        Shared by the IRQ snapshot and register polling paths (callers hold
+        record.lock); comparing against the published state suppresses the
+        duplicate when both paths observe the same change. Encoder and
+        selector group bits are routed to their decoders instead.
+        """
+        now_ns = time.monotonic_ns()
+        armed = False
+        if candidate_mask & record.logical_mask:
+            if candidate_mask & record.encoder_mask:
+                for encoder in record.encoders:
+                    if candidate_mask & encoder.mask:
+                        idle = encoder.next_due_ns() is None
+                        encoder.update(levels, now_ns)
+                        armed |= idle and encoder.next_due_ns() is not None
+            if candidate_mask & record.selector_group_mask:
+                for group in record.selector_groups:
+                    if candidate_mask & group.mask:
+                        idle = group.next_due_ns() is None
+                        group.update(levels, now_ns)
+                        armed |= idle and group.next_due_ns() is not None
+        if armed:
+            self._monitor_wake_event.set()
+        changed = (levels ^ record.input_state) & candidate_mask & record.input_mask & ~record.logical_mask
+        if not changed:
+            return
+        held = record.debouncer.pending
+        accepted = record.debouncer.filter(changed, now_ns)
+        if record.debouncer.pending & ~held:
+            self._monitor_wake_event.set()
+        if accepted:
+            self._publish_bit_changes(record, accepted, levels)
+
+    def _publish_bit_changes(self, record, changed_mask: int, levels: int) -> None:
+        """Publish an event for every bit set in changed_mask.
+
+        ``levels`` is a 16-bit register word (INTCAP or GPIO) holding the level
+        of each bit; inputs are pulled up, so a LOW level means pressed.
+        """
+        bits = record.bits
+        record.input_state = (record.input_state & ~changed_mask) | (levels & changed_mask)
+        batch = [] if self.event_batch_mode else None
+        while changed_mask:
+            lowest = changed_mask & -changed_mask
+            changed_mask ^= lowest
+            pin = bits[lowest.bit_length() - 1]
+            if pin is None:
+                continue
+            pin_value = bool(levels & lowest)
+            pressed = not pin_value
+            if pin['input_selector_name'] is not None:
+                self.logger.warning(
+                    f"Hardware Input Selector: {pin['input_selector_name']} ===> {'Pressed' if pressed else 'Released'}"
+                )
+                pin["last_value"] = pin_value
+                if batch is not None:
+                    batch.append((pin, pressed))
+                    continue
+                try:
+                    GPIO.output(MESSAGING_LED, GPIO.HIGH)
+                    self.messaging_service.publish_hardware_event(self.hardware_board_id, pin, pressed)
+                    GPIO.output(MESSAGING_LED, GPIO.LOW)
+                except OpenA3XXRabbitMqPublishingException as ex:
+                    GPIO.output(FAULT_LED, GPIO.HIGH)
+                    raise ex
+            else:
+                self.logger.debug("Change on a non-mapped input selector; ignoring")
+        if batch:
+            self._add_to_batch(batch)
+
+    def _add_to_batch(self, changes: list) -> None:
+        """Queue decoded changes; flush now (per-snapshot batching) or when the window ends."""
+        with self._batch_lock:
+            armed = self._batch_started_ns is None
+            if armed:
+                self._batch_started_ns = time.monotonic_ns()
+            self._batch_changes.extend(changes)
+        if self.event_batch_window_ns == 0:
+            self._flush_batch(force=True)
+        elif armed:
+            self._monitor_wake_event.set()
+
+    def _flush_batch(self, force: bool = False) -> int | None:
+        """Publish the pending batch if its window elapsed; return when it is due otherwise."""
+        with self._batch_lock:
+            if self._batch_started_ns is None:
+                return None
+            due_ns = self._batch_started_ns + self.event_batch_window_ns
+            if not force and time.monotonic_ns() < due_ns:
+                return due_ns
+            changes = self._batch_changes
+            self._batch_changes = []
+            self._batch_started_ns = None
+        try:
+            GPIO.output(MESSAGING_LED, GPIO.HIGH)
+            if len(changes) == 1:
+                # A lone change keeps the regular single-event message format
+                pin, pressed = changes[0]
+                self.messaging_service.publish_hardware_event(self.hardware_board_id, pin, pressed)
+            else:
+                self.messaging_service.publish_hardware_event_batch(self.hardware_board_id, changes)
+            GPIO.output(MESSAGING_LED, GPIO.LOW)
+        except OpenA3XXRabbitMqPublishingException as ex:
+            GPIO.output(FAULT_LED, GPIO.HIGH)
+            raise ex
+        return None
+
     def init_and_start(self, board_details: HardwareBoardDetailsDto):
         """Initialize GPIO, I2C, extenders, and register interrupt handlers."""
         self.logger.info("Initializing hardware service (GPIO/MCP23017)")
@@ -112,6 +248,49 @@ class OpenA3XXHardwareService:
         self._reset_extenders()
         self._register_extenders(i2c, board_details)
         self._log_summary()
+        self.logger.info(
+            f"Input acquisition mode: {self.acquisition_mode} (register polling at {self.poll_scan_rate_hz:g} Hz)"
+        )
+        # The monitor polls extenders in polling mode and supervises IRQ lines
+        # of the others
+        self._start_input_monitor()
+
+    def get_acquisition_metrics(self) -> dict:
+        """Return per-extender acquisition mode and IRQ health counters."""
+        buses = {}
+        for record in self.dispatch_index.records():
+            buses[record.bus_details["extender_bus_name"]] = {
+                "mode": record.mode,
+                "interrupts": record.interrupt_count,
+                "interrupt_rate_hz": round(record.interrupt_rate, 1),
+                "mode_changes": record.mode_changes,
+                "stuck_line_events": record.stuck_line_events,
+                "interrupt_storm_events": record.interrupt_storm_events,
+            }
+        return {
+            "acquisition_mode": self.acquisition_mode,
+            "poll_scan_period_ms": self.poll_scan_period_ms,
+            "mode_switches": dict(self.mode_switch_counters),
+            "buses": buses,
+        }
+
+    def stop(self) -> None:
+        """Stop input acquisition: IRQ edge callbacks first, then the monitor thread.
+
+        Called before the messaging service is stopped, so no input event
+        reaches a closed event spool.
+        """
+        for interrupt_pin in self._wired_interrupt_pins:
+            try:
+                GPIO.remove_event_detect(interrupt_pin)
+            except Exception as ex:
+                self.logger.warning(f"Failed removing edge detection of interrupt pin {interrupt_pin}: {ex}")
+        self._wired_interrupt_pins = []
+        self._monitor_stop_event.set()
+        self._monitor_wake_event.set()
+        if self._input_monitor_thread is not None:
+            self._input_monitor_thread.join(timeout=1.0)
+            self._input_monitor_thread = None
 
     def _init_i2c(self):
         self.logger.debug("Initializing I2C bus on board.SCL/board.SDA")
@@ -174,17 +353,65 @@ class OpenA3XXHardwareService:
             "bus_instance": bus,
             "interrupt_pin": INTERRUPT_EXTENDER_MAP[extender.name],
         }
+        bus_record = ExtenderBusRecord(extender_data_dict)
+        bus_record.debouncer = BitDebouncer(self.debouncing_time)
 
         # Configure MCP23017 core registers first
         self.logger.debug("Configuring MCP23017 core registers and defaults")
-        bus.io_control = 0x44  # Interrupt as open drain and mirrored
+        # Interrupt as open drain and mirrored; SEQOP stays 0 so the INTF/INTCAP
+        # snapshot in bus_interrupt can be read as one sequential block
+        bus.io_control = 0x44
         bus.default_value = 0x0000
         bus.interrupt_configuration = 0x0000  # interrupt on any change
         bus.clear_ints()  # clear any stale flags
 
+        # Encoder and selector group bits are always inputs, whether or not
+        # every bit carries a selector
+        encoders = self.encoders_by_bus.get(extender.name, [])
+        selector_groups = self.selector_groups_by_bus.get(extender.name, [])
+        logical_mask = 0
+        for logical_input in encoders + selector_groups:
+            if logical_mask & logical_input.mask:
+                self.logger.error(f"Overlapping encoder/selector group bits on {extender.name}; check declarations")
+            logical_mask |= logical_input.mask
+
         # Configure all extender bits for this bus (direction/pulls/defaults)
         for extender_bit in extender.io_extender_bus_bits:
-            self._configure_extender_bit(bus, extender, extender_bit)
+            bit_details = self._configure_extender_bit(bus, extender, extender_bit, logical_mask)
+            if bit_details is not None:
+                bus_record.add_bit(bit_details)
+                if bit_details["is_input"] and bit_details["input_selector_name"] is not None:
+                    self.messaging_service.prepare_hardware_event(self.hardware_board_id, bit_details)
+                window = self.selector_debounce_ms.get(str(bit_details["input_selector_id"]))
+                if window is not None:
+                    bus_record.debouncer.set_window_ms(bit_details["bus_bit"], window)
+        # Bits the API does not list (or lists as outputs) still have to be
+        # inputs for the decoders; interrupt-on-change is enabled below
+        self._configure_forced_input_bits(bus, extender.name, logical_mask)
+
+        for encoder in encoders:
+            candidates = [bus_record.bits[encoder.bit_a], bus_record.bits[encoder.bit_b]]
+            mapped = [b for b in candidates if b is not None and b["input_selector_name"] is not None]
+            if not mapped:
+                self.logger.warning(
+                    f"Encoder on {extender.name} bits {encoder.bit_a}/{encoder.bit_b} has no input selector; "
+                    f"it will be decoded but not published"
+                )
+            encoder.bit_details = mapped[0] if mapped else None
+            bus_record.add_encoder(encoder)
+            self.logger.info(f"Registered quadrature encoder on {extender.name} bits {encoder.bit_a}/{encoder.bit_b}")
+
+        for group in selector_groups:
+            mapped = [bus_record.bits[b] for b in group.bits
+                      if bus_record.bits[b] is not None and bus_record.bits[b]["input_selector_name"] is not None]
+            if not mapped:
+                self.logger.warning(
+                    f"Selector group on {extender.name} bits {group.bits} has no input selector; "
+                    f"it will be decoded but not published"
+                )
+            group.bit_details = mapped[0] if mapped else None
+            bus_record.add_selector_group(group)
+            self.logger.info(f"Registered selector group on {extender.name} bits {group.bits}")
 
         # Compute interrupt enable mask for input pins only
         input_interrupt_mask = 0
@@ -196,6 +423,7 @@ class OpenA3XXHardwareService:
             except Exception:
                 # Ignore malformed names here; they are already logged in _configure_extender_bit
                 continue
+        input_interrupt_mask |= logical_mask
 
         # Optional diagnostic override: enable all interrupt bits if requested
         try:
@@ -222,32 +450,58 @@ class OpenA3XXHardwareService:
                 f"No input bits found for {extender.name}. Interrupts will not fire for this extender."
             )
 
+        # The dispatch record must be in place before the IRQ can fire
+        try:
+            bus_record.input_state = bus_record.read_gpio_word()
+        except Exception as ex:
+            self.logger.warning(f"Unable to read initial input levels for {extender.name}: {ex}")
+            bus_record.input_state = 0xFFFF  # pull-ups: assume released
+        for logical_input in bus_record.encoders + bus_record.selector_groups:
+            logical_input.reset(bus_record.input_state)
+        self.dispatch_index.add_bus(bus_record)
+
+        if self.acquisition_mode == INPUT_ACQUISITION_MODE_POLLING:
+            bus_record.mode = INPUT_ACQUISITION_MODE_POLLING
+            self.logger.debug(f"Polling mode: not wiring interrupt GPIO pin for bus {extender.name}")
+        else:
+            self._wire_interrupt(extender.name, int(extender_data_dict["interrupt_pin"]))
+
+        self.extender_bus_details.append(extender_data_dict)
+
+    def _wire_interrupt(self, bus_name: str, interrupt_pin: int) -> None:
         # Wire the Raspberry Pi interrupt after MCP is fully configured
-        self.logger.debug(
-            f"Configuring interrupt GPIO pin {extender_data_dict['interrupt_pin']} for bus {extender.name}"
-        )
-        GPIO.setup(int(extender_data_dict["interrupt_pin"]), GPIO.IN, GPIO.PUD_UP)
+        self.logger.debug(f"Configuring interrupt GPIO pin {interrupt_pin} for bus {bus_name}")
+        GPIO.setup(interrupt_pin, GPIO.IN, GPIO.PUD_UP)
         GPIO.add_event_detect(
-            int(extender_data_dict["interrupt_pin"]),
+            interrupt_pin,
             GPIO.FALLING,
             callback=self.bus_interrupt,
-            bouncetime=self.debouncing_time,
+            bouncetime=0,  # debounced per bit in _process_levels
         )
+        self._wired_interrupt_pins.append(interrupt_pin)
 
         # If the IRQ line is already asserted low at registration time,
         # trigger the handler once to service any pending interrupts.
         try:
-            if GPIO.input(int(extender_data_dict["interrupt_pin"])) == GPIO.LOW:
+            if GPIO.input(interrupt_pin) == GPIO.LOW:
                 self.logger.debug(
-                    f"Interrupt line low at registration for {extender.name}; invoking handler immediately"
+                    f"Interrupt line low at registration for {bus_name}; invoking handler immediately"
                 )
-                self.bus_interrupt(int(extender_data_dict["interrupt_pin"]))
+                self.bus_interrupt(interrupt_pin)
         except Exception:
             pass
 
-        self.extender_bus_details.append(extender_data_dict)
+    def _configure_forced_input_bits(self, bus, bus_name: str, forced_input_mask: int) -> None:
+        """Configure every bit of forced_input_mask as a pulled-up input, whatever the API lists."""
+        for bus_bit in range(16):
+            if not forced_input_mask & (1 << bus_bit):
+                continue
+            pin = bus.get_pin(bus_bit)
+            pin.direction = Direction.INPUT
+            pin.pull = Pull.UP
+            self.logger.debug(f"Configured encoder/selector group bit {bus_bit} of {bus_name} as INPUT with PULL.UP")
 
-    def _configure_extender_bit(self, bus, extender, extender_bit) -> None:
+    def _configure_extender_bit(self, bus, extender, extender_bit, forced_input_mask: int = 0) -> dict | None:
         # Parse the bit index from the name defensively
         try:
             bus_bit = parse_bit_from_name(extender_bit.name)
@@ -255,11 +509,11 @@ class OpenA3XXHardwareService:
                 raise ValueError(f"Invalid bus_bit {bus_bit} for '{extender_bit.name}'")
         except Exception as ex:
             self.logger.error(f"Unable to parse bus bit for '{extender_bit.name}': {ex}")
-            return
+            return None
 
         pin = bus.get_pin(bus_bit)
 
-        is_input = bool(extender_bit.hardware_input_selector_fullname)
+        is_input = bool(extender_bit.hardware_input_selector_fullname) or bool(forced_input_mask & (1 << bus_bit))
         is_output = bool(extender_bit.hardware_output_selector_fullname)
 
         if is_input and is_output:
@@ -305,6 +559,7 @@ class OpenA3XXHardwareService:
         )
 
         self.extender_bus_bit_details.append(extender_bit_data_dict)
+        return extender_bit_data_dict
 
     def _log_summary(self):
         # Log a concise view by selecting specific columns from details
@@ -439,9 +694,10 @@ class OpenA3XXHardwareService:
         table = tabulate(rows, headers=headers, tablefmt='grid')
         self.logger.info(f"Extender IO Grid (columns=buses, rows=bits) ↓\n{table}")
 
-    # --- Input monitor (fallback for missed IRQs) ---
+    # --- Input monitor (register polling acquisition mode) ---
     def _start_input_monitor(self) -> None:
         try:
+            self._monitor_stop_event.clear()
             t = threading.Thread(target=self._input_monitor_loop, name="io-input-monitor", daemon=True)
             t.start()
             self._input_monitor_thread = t
@@ -449,27 +705,244 @@ class OpenA3XXHardwareService:
             self.logger.warning(f"Failed to start input monitor: {ex}")
 
     def _input_monitor_loop(self) -> None:
+        """Poll extenders in polling mode and supervise the IRQ lines of the others.
+
+        Polling reads each extender's GPIO register once per cycle (one 16-bit
+        I2C read) and publishes only the bits that differ from the last
+        published word. Every IRQ_HEALTH_CHECK_MS the IRQ lines are checked for
+        stuck-low levels and interrupt storms (see _check_irq_health). Bits held
+        back by the per-bit debounce are settled, and coalesced encoder deltas
+        and event batches published, once their window elapses; arming such a
+        deadline wakes the monitor so it is met to within scheduling latency.
+        """
+        records = [r for r in self.dispatch_index.records() if r.input_mask]
+        period = 1.0 / self.poll_scan_rate_hz
+        health_period = IRQ_HEALTH_CHECK_MS / 1000.0
+        supervise = self.acquisition_mode != INPUT_ACQUISITION_MODE_POLLING
+        now = time.monotonic()
+        for record in records:
+            record.rate_window_start = now
+        deadline = now
+        next_health_check = now + health_period
+        window_start = now
+        scans = 0
         while not self._monitor_stop_event.is_set():
-            try:
-                for bit in self.extender_bus_bit_details:
-                    if not bit.get("is_input"):
-                        continue
-                    pin = bit.get("extender_bit_instance")
+            # Clear before servicing: a deadline armed from here on wakes the next wait
+            self._monitor_wake_event.clear()
+            # A wake-up runs the deferred work only; register scans keep their schedule
+            scan_due = time.monotonic() >= deadline
+            polling = False
+            for record in records:
+                if record.mode != INPUT_ACQUISITION_MODE_POLLING:
+                    continue
+                polling = True
+                if scan_due:
+                    self._poll_record(record)
+
+            now_ns = time.monotonic_ns()
+            next_due_ns = None
+            if self.event_batch_window_ns:
+                try:
+                    next_due_ns = self._flush_batch()
+                except Exception as ex:
+                    self.logger.warning(f"Failed publishing event batch: {ex}")
+            for record in records:
+                due_ns = self._service_deferred(record, now_ns)
+                if due_ns is not None and (next_due_ns is None or due_ns < next_due_ns):
+                    next_due_ns = due_ns
+
+            now = time.monotonic()
+            if polling and scan_due:
+                scans += 1
+                if now - window_start >= POLL_SCAN_REPORT_SECONDS:
+                    self.poll_scan_period_ms = (now - window_start) * 1000.0 / scans
+                    self.logger.info(
+                        f"Input polling: achieved scan period {self.poll_scan_period_ms:.2f} ms "
+                        f"(target {period * 1000.0:.2f} ms)"
+                    )
+                    window_start = now
+                    scans = 0
+            elif not polling:
+                window_start = now
+                scans = 0
+
+            if supervise and now >= next_health_check:
+                for record in records:
                     try:
-                        current = bool(pin.value)
-                    except Exception:
-                        continue
-                    last = bool(bit.get("last_value", current))
-                    if current != last and bit.get("input_selector_name") is not None:
-                        pressed = not current  # pull-up logic
-                        event = dict(bit)
-                        event["pressed"] = pressed
-                        try:
-                            GPIO.output(MESSAGING_LED, GPIO.HIGH)
-                            self.messaging_service.publish_hardware_event(self.hardware_board_id, event)
-                        finally:
-                            GPIO.output(MESSAGING_LED, GPIO.LOW)
-                        bit["last_value"] = current
-            except Exception:
-                pass
-            time.sleep(0.02)
+                        self._check_irq_health(record, now)
+                    except Exception as ex:
+                        self.logger.debug(f"IRQ health check failed: {ex}")
+                next_health_check = now + health_period
+
+            if scan_due:
+                if polling:
+                    deadline += period
+                else:
+                    deadline = next_health_check if supervise else now + period
+            delay = deadline - time.monotonic()
+            if next_due_ns is not None:
+                delay = min(delay, (next_due_ns - time.monotonic_ns()) / 1e9)
+            if delay > 0:
+                self._monitor_wake_event.wait(delay)
+            else:
+                # Overrun: restart the schedule instead of bursting to catch up
+                deadline = time.monotonic()
+
+    def _poll_record(self, record) -> None:
+        with record.lock:
+            try:
+                word = record.read_gpio_word()
+            except Exception as ex:
+                self.logger.debug(f"GPIO register read failed for {record.bus_details['extender_bus_name']}: {ex}")
+                return
+            try:
+                self._process_levels(record, record.input_mask, word)
+            except Exception as ex:
+                self.logger.warning(f"Failed publishing polled input change: {ex}")
+
+    def _service_deferred(self, record, now_ns: int) -> int | None:
+        """Run time-based work for one extender; return when it is next due."""
+        next_due_ns = None
+        if record.debouncer.pending:
+            self._settle_pending(record, now_ns)
+            next_due_ns = record.debouncer.next_due_ns()
+        for encoder in record.encoders:
+            with record.lock:
+                delta = encoder.take_delta(now_ns)
+            if delta:
+                self._publish_encoder_delta(record, encoder, delta)
+            due_ns = encoder.next_due_ns()
+            if due_ns is not None and (next_due_ns is None or due_ns < next_due_ns):
+                next_due_ns = due_ns
+        for group in record.selector_groups:
+            due_ns = group.next_due_ns()
+            if due_ns is None:
+                continue
+            if now_ns >= due_ns:
+                position = self._settle_selector_group(record, group, now_ns)
+                if position is not None:
+                    self._publish_selector_position(group, position)
+                due_ns = group.next_due_ns()
+            if due_ns is not None and (next_due_ns is None or due_ns < next_due_ns):
+                next_due_ns = due_ns
+        return next_due_ns
+
+    def _settle_selector_group(self, record, group, now_ns: int) -> int | None:
+        # Confirm the settled position from one fresh register snapshot; a
+        # different reading restarts the settle timer
+        with record.lock:
+            try:
+                group.update(record.read_gpio_word(), now_ns)
+            except Exception as ex:
+                self.logger.debug(f"GPIO register read failed for {record.bus_details['extender_bus_name']}: {ex}")
+                return None
+            return group.take_position(now_ns)
+
+    def _publish_selector_position(self, group, position: int) -> None:
+        if group.bit_details is None:
+            return
+        try:
+            GPIO.output(MESSAGING_LED, GPIO.HIGH)
+            self.messaging_service.publish_selector_position_event(self.hardware_board_id, group.bit_details, position)
+            self.logger.warning(f"Hardware Input Selector: {group.bit_details['input_selector_name']} ===> position {position}")
+        except Exception as ex:
+            self.logger.warning(f"Failed publishing selector position: {ex}")
+        finally:
+            GPIO.output(MESSAGING_LED, GPIO.LOW)
+
+    def _publish_encoder_delta(self, record, encoder, delta: int) -> None:
+        if encoder.bit_details is None:
+            return
+        try:
+            GPIO.output(MESSAGING_LED, GPIO.HIGH)
+            self.messaging_service.publish_encoder_event(self.hardware_board_id, encoder.bit_details, delta)
+            self.logger.warning(f"Hardware Input Selector: {encoder.bit_details['input_selector_name']} ===> {delta:+d}")
+        except Exception as ex:
+            self.logger.warning(f"Failed publishing encoder delta: {ex}")
+        finally:
+            GPIO.output(MESSAGING_LED, GPIO.LOW)
+
+    def _settle_pending(self, record, now_ns: int) -> None:
+        """Re-read bits whose debounce window elapsed with a change held back."""
+        with record.lock:
+            due = record.debouncer.take_due(now_ns)
+            if not due:
+                return
+            try:
+                word = record.read_gpio_word()
+            except Exception as ex:
+                self.logger.debug(f"GPIO register read failed for {record.bus_details['extender_bus_name']}: {ex}")
+                return
+            try:
+                self._process_levels(record, due, word)
+            except Exception as ex:
+                self.logger.warning(f"Failed publishing debounced input change: {ex}")
+
+    def _check_irq_health(self, record, now: float) -> None:
+        """Detect stuck-low IRQ lines and interrupt storms for one extender.
+
+        In adaptive mode an unhealthy extender is switched to register polling
+        and switched back once its line has been idle-high with a normal
+        interrupt rate for IRQ_RECOVERY_SECONDS. In interrupt mode a stuck line
+        is serviced with a register read (publishing any missed change).
+        """
+        elapsed = now - record.rate_window_start
+        if elapsed >= 1.0:
+            record.interrupt_rate = record.rate_window_count / elapsed
+            record.rate_window_count = 0
+            record.rate_window_start = now
+
+        line_low = GPIO.input(record.interrupt_pin) == GPIO.LOW
+        adaptive = self.acquisition_mode == INPUT_ACQUISITION_MODE_ADAPTIVE
+        bus_name = record.bus_details["extender_bus_name"]
+
+        if record.mode == INPUT_ACQUISITION_MODE_INTERRUPT:
+            if not line_low:
+                record.irq_low_since = None
+            elif record.irq_low_since is None:
+                record.irq_low_since = now
+            elif (now - record.irq_low_since) * 1000.0 >= IRQ_STUCK_LOW_MS:
+                record.stuck_line_events += 1
+                record.irq_low_since = None
+                if adaptive:
+                    self._switch_mode(record, INPUT_ACQUISITION_MODE_POLLING,
+                                      f"IRQ line stuck low for more than {IRQ_STUCK_LOW_MS} ms")
+                else:
+                    self.logger.debug(f"IRQ line low for bus {bus_name}; servicing pending interrupts")
+                    self._poll_record(record)
+                return
+            if adaptive and record.interrupt_rate > IRQ_STORM_RATE_HZ:
+                record.interrupt_storm_events += 1
+                self._switch_mode(record, INPUT_ACQUISITION_MODE_POLLING,
+                                  f"interrupt storm at {record.interrupt_rate:.0f}/s")
+            return
+
+        if not adaptive:
+            return
+        healthy = not line_low and record.interrupt_rate <= IRQ_STORM_RATE_HZ / 4
+        if not healthy:
+            record.healthy_since = None
+        elif record.healthy_since is None:
+            record.healthy_since = now
+        elif now - record.healthy_since >= IRQ_RECOVERY_SECONDS:
+            self._switch_mode(record, INPUT_ACQUISITION_MODE_INTERRUPT,
+                              f"IRQ line healthy for {IRQ_RECOVERY_SECONDS} s")
+
+    def _switch_mode(self, record, mode: str, reason: str) -> None:
+        with record.lock:
+            if record.mode == mode:
+                return
+            record.mode = mode
+            record.mode_changes += 1
+            record.irq_low_since = None
+            record.healthy_since = None
+        if mode == INPUT_ACQUISITION_MODE_POLLING:
+            self.mode_switch_counters["to_polling"] += 1
+        else:
+            self.mode_switch_counters["to_interrupt"] += 1
+            # Resync: publish anything that changed while polling was stopped
+            # and release the IRQ line before edges are trusted again
+            self._poll_record(record)
+        self.logger.warning(
+            f"Extender {record.bus_details['extender_bus_name']} switched to {mode} mode: {reason}"
+        )
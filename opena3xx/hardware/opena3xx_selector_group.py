@@ -0,0 +1,88 @@
+"""Multi-position rotary selectors wired as one MCP23017 input bit per position.
+
+Groups are declared with ``OPENA3XX_SELECTOR_GROUPS`` as a comma separated list
+of ``<bus name>:<bit>+<bit>+...[:<settle ms>]`` entries, e.g.
+``Bus1:0+1+2+3+4:80``. Position N is the N-th declared bit (active low). The
+group publishes a single position event once it has been stable for the settle
+time, instead of the release/press burst of every position crossed.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from opena3xx.models import SELECTOR_GROUP_SETTLE_MS
+
+logger = logging.getLogger(__name__)
+
+NO_POSITION = -1
+
+
+class SelectorGroup:
+    """Settling decoder for one multi-position selector."""
+
+    def __init__(self, bits: List[int], settle_ms: int = SELECTOR_GROUP_SETTLE_MS):
+        self.bits = list(bits)
+        self.mask = 0
+        for bus_bit in self.bits:
+            self.mask |= (1 << bus_bit)
+        self.settle_ns = max(0, int(settle_ms)) * 1_000_000
+        # Bit details used as the identity of published events (first mapped bit)
+        self.bit_details: Optional[dict] = None
+        self._published = NO_POSITION
+        self._candidate = NO_POSITION
+        self._candidate_since_ns = 0
+
+    def decode(self, levels: int) -> int:
+        """Return the position selected in a register word (first active-low bit)."""
+        active = ~levels & self.mask
+        if not active:
+            return NO_POSITION
+        for position, bus_bit in enumerate(self.bits):
+            if active & (1 << bus_bit):
+                return position
+        return NO_POSITION
+
+    def reset(self, levels: int) -> None:
+        self._published = self._candidate = self.decode(levels)
+
+    def update(self, levels: int, now_ns: int) -> None:
+        position = self.decode(levels)
+        if position != self._candidate:
+            self._candidate = position
+            self._candidate_since_ns = now_ns
+
+    def next_due_ns(self) -> Optional[int]:
+        if self._candidate == self._published:
+            return None
+        return self._candidate_since_ns + self.settle_ns
+
+    def take_position(self, now_ns: int) -> Optional[int]:
+        """Return the new position once it has settled, else None."""
+        if self._candidate == self._published or now_ns - self._candidate_since_ns < self.settle_ns:
+            return None
+        self._published = self._candidate
+        return self._published
+
+
+def parse_selector_group_spec(spec: Optional[str]) -> Dict[str, List[SelectorGroup]]:
+    """Parse an OPENA3XX_SELECTOR_GROUPS value into groups keyed by bus name."""
+    groups: Dict[str, List[SelectorGroup]] = {}
+    if not spec:
+        return groups
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        try:
+            if len(parts) not in (2, 3):
+                raise ValueError("expected <bus>:<bit>+<bit>+...[:<settle ms>]")
+            bits = [int(b) for b in parts[1].split("+")]
+            if len(bits) < 2 or len(set(bits)) != len(bits) or not all(0 <= b <= 15 for b in bits):
+                raise ValueError("need at least two distinct bits in 0..15")
+            settle_ms = int(parts[2]) if len(parts) == 3 else SELECTOR_GROUP_SETTLE_MS
+        except ValueError as ex:
+            logger.error(f"Ignoring selector group declaration '{item}': {ex}")
+            continue
+        groups.setdefault(parts[0].strip(), []).append(SelectorGroup(bits, settle_ms))
+    return groups
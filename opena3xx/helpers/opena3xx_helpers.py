@@ -1,2 +1,45 @@
+import logging
+import os
+
+
 def parse_bit_from_name(name: str) -> int:
     return int(name.split("Bit")[1])
+
+
+def parse_key_value_list(spec: str | None) -> dict[str, str]:
+    """Parse an ``key=value,key=value`` override string (e.g. from an env var)."""
+    result: dict[str, str] = {}
+    if not spec:
+        return result
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        key, value = item.split("=", 1)
+        key, value = key.strip(), value.strip()
+        if key:
+            result[key] = value
+    return result
+
+
+def env_int(name: str, default: int, logger: logging.Logger | None = None) -> int:
+    """Read an integer setting from the environment, falling back to ``default`` if unset or invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return int(default)
+    try:
+        return int(value)
+    except ValueError:
+        (logger or logging.getLogger(__name__)).warning(f"Invalid {name}='{value}'; using {default}")
+        return int(default)
+
+
+def env_float(name: str, default: float, logger: logging.Logger | None = None) -> float:
+    """Read a float setting from the environment, falling back to ``default`` if unset or invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return float(default)
+    try:
+        return float(value)
+    except ValueError:
+        (logger or logging.getLogger(__name__)).warning(f"Invalid {name}='{value}'; using {default}")
+        return float(default)
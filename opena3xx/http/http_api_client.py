@@ -13,11 +13,13 @@ class OpenA3xxHttpClient:
     base_url: str
     port: int
 
-    def __init__(self, scheme: str, base_url: str, port: int):
+    def __init__(self, scheme: str = "http", base_url: str = "", port: int = 0):
         """Initialize an HTTP client bound to a discovered API endpoint.
 
         The client reuses a requests.Session with conservative retries for
-        transient server/network errors and a consistent 10s timeout.
+        transient server/network errors and a consistent 10s timeout. A second
+        session without retries serves quick probes. Discovery creates one
+        client without an endpoint, which can only send ping requests.
         """
         self.scheme = scheme
         self.base_url = base_url
@@ -32,15 +34,25 @@ class OpenA3xxHttpClient:
             "User-Agent": "OpenA3XX-HardwareController/1.0",
             "Accept": "application/json",
         })
+        self._probe_session = requests.Session()
+        probe_adapter = HTTPAdapter(max_retries=0)
+        self._probe_session.mount("http://", probe_adapter)
+        self._probe_session.mount("https://", probe_adapter)
+        self._probe_session.headers.update(self._session.headers)
 
-    def send_ping_request(self, scheme: str, target_ip: str, target_port: int) -> Response:
+    def send_ping_request(self, scheme: str, target_ip: str, target_port: int, timeout: float = 10,
+                          retry: bool = True) -> Response:
         """Send a ping request to the target API heartbeat endpoint.
 
         Returns the raw Response so the caller can inspect status and body.
+        ``retry=False`` uses the probe session, which never retries, for quick
+        probes that have a fallback.
         """
         endpoint = f'{scheme}://{target_ip}:{target_port}/core/heartbeat/ping'
         self.logger.info(f"Sending request to endpoint: {endpoint}")
-        r = self._session.get(endpoint, timeout=10)
+        if not retry:
+            return self._probe_session.get(endpoint, timeout=timeout)
+        r = self._session.get(endpoint, timeout=timeout)
         # log_response(r)
         return r
 
@@ -1,5 +1,97 @@
 DEBOUNCING_TIME = 100
 
+# Input acquisition: "interrupt" (IRQ lines), "polling" (register scans) or
+# "adaptive" (IRQ lines, falling back to polling per extender when its IRQ
+# line is stuck or storming).
+# Overridable with OPENA3XX_INPUT_ACQUISITION_MODE / OPENA3XX_POLL_SCAN_RATE_HZ.
+INPUT_ACQUISITION_MODE_INTERRUPT: str = "interrupt"
+INPUT_ACQUISITION_MODE_POLLING: str = "polling"
+INPUT_ACQUISITION_MODE_ADAPTIVE: str = "adaptive"
+INPUT_ACQUISITION_MODE: str = INPUT_ACQUISITION_MODE_ADAPTIVE
+POLL_SCAN_RATE_HZ: int = 200
+POLL_SCAN_REPORT_SECONDS: int = 30
+
+# Quadrature encoders declared with OPENA3XX_ENCODERS
+ENCODER_STEPS_PER_DETENT: int = 4
+ENCODER_COALESCE_MS: int = 50
+
+# Multi-position selector groups declared with OPENA3XX_SELECTOR_GROUPS
+SELECTOR_GROUP_SETTLE_MS: int = 80
+
+# Optional event batching (OPENA3XX_EVENT_BATCH_MODE / OPENA3XX_EVENT_BATCH_WINDOW_US):
+# a window of 0 batches the changes decoded from one register snapshot.
+EVENT_BATCH_MODE: bool = False
+EVENT_BATCH_WINDOW_US: int = 0
+
+# Event spool write-ahead log (OPENA3XX_EVENT_SPOOL_DIR): segment rollover size
+# and how often the consumer offset is persisted (replays after a crash are
+# bounded by this window).
+EVENT_LOG_SEGMENT_BYTES: int = 4 * 1024 * 1024
+EVENT_LOG_OFFSET_COMMIT_MS: int = 100
+
+# Spool durability tier (OPENA3XX_SPOOL_DURABILITY): "memory" keeps events in
+# a bounded ring buffer only, "periodic" fsyncs the log every
+# OPENA3XX_SPOOL_FSYNC_INTERVAL_MS, "event" fsyncs every event before returning.
+SPOOL_DURABILITY_MEMORY: str = "memory"
+SPOOL_DURABILITY_PERIODIC: str = "periodic"
+SPOOL_DURABILITY_EVENT: str = "event"
+SPOOL_DURABILITY: str = SPOOL_DURABILITY_EVENT
+SPOOL_FSYNC_INTERVAL_MS: int = 50
+SPOOL_MEMORY_CAPACITY: int = 10000
+SPOOL_METRICS_REPORT_SECONDS: int = 60
+
+# Spool compaction of unpublished events (OPENA3XX_SPOOL_COMPACTION: none,
+# latest, ttl or ttl:<seconds>; per selector with
+# OPENA3XX_SPOOL_COMPACTION_SELECTORS="<selector id>=<rule>,...").
+SPOOL_COMPACTION: str = "none"
+SPOOL_COMPACTION_TTL_SECONDS: int = 60
+
+# AMQP publishing of spooled events (OPENA3XX_AMQP_PUBLISH_MODE): "blocking"
+# waits for each publisher confirm, "pipelined" keeps up to
+# OPENA3XX_AMQP_CONFIRM_WINDOW unconfirmed messages in flight.
+AMQP_PUBLISH_MODE_BLOCKING: str = "blocking"
+AMQP_PUBLISH_MODE_PIPELINED: str = "pipelined"
+AMQP_PUBLISH_MODE: str = AMQP_PUBLISH_MODE_BLOCKING
+AMQP_CONFIRM_WINDOW: int = 256
+
+# AMQP client adapter (OPENA3XX_AMQP_ADAPTER): "blocking" uses pika
+# BlockingConnections and a publisher thread, "asyncio" runs data publishing,
+# confirms, keepalives and reconnection on one asyncio event loop and one
+# connection (always with pipelined confirms).
+AMQP_ADAPTER_BLOCKING: str = "blocking"
+AMQP_ADAPTER_ASYNCIO: str = "asyncio"
+AMQP_ADAPTER: str = AMQP_ADAPTER_BLOCKING
+AMQP_CONNECT_TIMEOUT_SECONDS: int = 30
+
+# Circuit breaker of the AMQP connections: it opens after
+# OPENA3XX_AMQP_CIRCUIT_FAILURES consecutive failures, then the broker is
+# probed with a jittered exponential backoff between these bounds. The asyncio
+# adapter checks every POLL_SECONDS whether a probe closed it again.
+AMQP_CIRCUIT_FAILURE_THRESHOLD: int = 3
+AMQP_RECONNECT_BACKOFF_MS: int = 500
+AMQP_RECONNECT_BACKOFF_MAX_MS: int = 30000
+AMQP_CIRCUIT_POLL_SECONDS: float = 0.1
+
+# Wire format of single hardware events (OPENA3XX_EVENT_WIRE_FORMAT): "json"
+# or the compact fixed-layout "binary" struct.
+EVENT_WIRE_FORMAT_JSON: str = "json"
+EVENT_WIRE_FORMAT_BINARY: str = "binary"
+EVENT_WIRE_FORMAT: str = EVENT_WIRE_FORMAT_JSON
+
+# Backlog replay (OPENA3XX_AMQP_REPLAY_BATCH_*): above this many unpublished
+# spooled events, up to MAX_EVENTS events / MAX_BYTES payload bytes are sent
+# per AMQP message. MAX_EVENTS of 1 disables packing (default): consumers must
+# understand the batch content type before it is turned on.
+REPLAY_BATCH_THRESHOLD: int = 100
+REPLAY_BATCH_MAX_EVENTS: int = 1
+REPLAY_BATCH_MAX_BYTES: int = 65536
+
+# IRQ line health supervision
+IRQ_HEALTH_CHECK_MS: int = 50
+IRQ_STUCK_LOW_MS: int = 250
+IRQ_STORM_RATE_HZ: int = 500
+IRQ_RECOVERY_SECONDS: int = 5
+
 EXTENDER_ADDRESS_START: int = 32
 
 INTERRUPT_EXTENDER_MAP: dict = {
@@ -21,3 +113,31 @@ FAULT_LED: int = 5
 GENERAL_LED: int = 6
 
 INPUT_SWITCH: int = 7
+
+# API discovery: the last validated endpoint is cached in
+# OPENA3XX_API_ENDPOINT_CACHE and pinged (OPENA3XX_API_CACHE_PING_TIMEOUT_MS)
+# before falling back to a subnet scan.
+API_ENDPOINT_CACHE_FILE: str = "/tmp/opena3xx_api_endpoint.json"
+API_ENDPOINT_CACHE_PING_TIMEOUT_MS: int = 500
+
+# Subnet scan: concurrent non-blocking connects (clipped to the open file
+# limit), connect timeout and heartbeat ping timeout of open hosts.
+API_SCAN_CONCURRENCY: int = 2048
+API_SCAN_CONNECT_TIMEOUT_MS: int = 500
+API_SCAN_PING_TIMEOUT_MS: int = 2000
+# Hosts within this distance of the local IP and the default gateway are
+# probed right after the kernel neighbour table, before the full sweep.
+API_SCAN_NEAR_RADIUS: int = 16
+# Interfaces not scanned for the API (OPENA3XX_API_SCAN_SKIP_INTERFACES,
+# comma-separated shell patterns): container and VM bridges. The default
+# route interface is always scanned; link-local addresses never are.
+API_SCAN_SKIP_INTERFACES: str = "docker*,br-*,veth*,virbr*"
+
+# API discovery mode (OPENA3XX_API_DISCOVERY_MODE): "scan" probes the subnets,
+# "beacon" first broadcasts a UDP query answered by tools/beacon_responder.py
+# and falls back to the scan.
+API_DISCOVERY_MODE_SCAN: str = "scan"
+API_DISCOVERY_MODE_BEACON: str = "beacon"
+API_DISCOVERY_MODE: str = API_DISCOVERY_MODE_SCAN
+API_BEACON_PORT: int = 5099
+API_BEACON_TIMEOUT_MS: int = 1000
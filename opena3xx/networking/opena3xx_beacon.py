@@ -0,0 +1,101 @@
+"""UDP beacon discovery of the Peripheral API.
+
+The controller broadcasts a small JSON query on the beacon port; a beacon
+responder next to the API (``tools/beacon_responder.py``) answers with a
+unicast JSON reply naming the API endpoint::
+
+    query: {"type": "opena3xx.discover", "version": 1}
+    reply: {"type": "opena3xx.api", "version": 1, "scheme": "http", "host": "192.168.1.20", "port": 5000}
+
+``host`` may be omitted, in which case the reply's source address is used.
+Replies are only candidates: the caller still validates them with the
+heartbeat ping. Discovery takes the reply timeout regardless of subnet size.
+"""
+
+import json
+import logging
+import select
+import socket
+import time
+from typing import Iterable, Iterator, Optional, Tuple
+
+BEACON_QUERY_TYPE: str = "opena3xx.discover"
+BEACON_REPLY_TYPE: str = "opena3xx.api"
+BEACON_PROTOCOL_VERSION: int = 1
+
+
+def parse_beacon_reply(data: bytes, source_ip: str) -> Optional[Tuple[str, str, int]]:
+    """Return (scheme, host, port) of a valid beacon reply, else None."""
+    try:
+        reply = json.loads(data.decode("utf-8"))
+        if not isinstance(reply, dict) or reply.get("type") != BEACON_REPLY_TYPE:
+            return None
+        scheme = str(reply.get("scheme", "http"))
+        if scheme not in ("http", "https"):
+            return None
+        port = int(reply["port"])
+        if not 0 < port < 65536:
+            return None
+        return scheme, str(reply.get("host") or source_ip), port
+    except (ValueError, KeyError, TypeError, UnicodeDecodeError):
+        return None
+
+
+class OpenA3XXBeaconClient:
+
+    def __init__(self, beacon_port: int, timeout: float, retransmits: int = 2):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.beacon_port = int(beacon_port)
+        self.timeout = max(0.05, float(timeout))
+        self.retransmits = max(0, int(retransmits))
+
+    def replies(self, targets: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+        """Broadcast the query to the target addresses and yield distinct endpoints as replies arrive.
+
+        The query is re-sent ``retransmits`` times within the timeout to cover
+        a lost datagram; the generator ends when the timeout expires.
+        """
+        targets = list(dict.fromkeys(targets))
+        query = json.dumps({"type": BEACON_QUERY_TYPE, "version": BEACON_PROTOCOL_VERSION}).encode("utf-8")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            sock.bind(("", 0))
+            sock.setblocking(False)
+            started = time.monotonic()
+            deadline = started + self.timeout
+            send_times = [started + self.timeout * i / (self.retransmits + 1) for i in range(self.retransmits + 1)]
+            seen = set()
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    return
+                while send_times and send_times[0] <= now:
+                    send_times.pop(0)
+                    self._send(sock, query, targets)
+                wait = min([deadline] + send_times[:1]) - now
+                readable, _, _ = select.select([sock], [], [], max(0.0, wait))
+                if not readable:
+                    continue
+                try:
+                    data, (source_ip, _) = sock.recvfrom(2048)
+                except OSError:
+                    continue
+                endpoint = parse_beacon_reply(data, source_ip)
+                if endpoint is None:
+                    self.logger.debug(f"Ignoring unexpected beacon datagram from {source_ip}")
+                    continue
+                if endpoint not in seen:
+                    seen.add(endpoint)
+                    self.logger.info(f"Beacon reply from {source_ip}: {endpoint[0]}://{endpoint[1]}:{endpoint[2]} "
+                                     f"after {(time.monotonic() - started) * 1000:.0f} ms")
+                    yield endpoint
+        finally:
+            sock.close()
+
+    def _send(self, sock: socket.socket, query: bytes, targets) -> None:
+        for target in targets:
+            try:
+                sock.sendto(query, (target, self.beacon_port))
+            except OSError as ex:
+                self.logger.debug(f"Beacon query to {target}:{self.beacon_port} failed: {ex}")
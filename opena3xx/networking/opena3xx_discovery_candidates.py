@@ -0,0 +1,134 @@
+"""Probe order of the API discovery subnet scan.
+
+Hosts the kernel already talked to (complete entries of the neighbour table,
+``/proc/net/arp``) are probed first, then addresses in widening rings around
+the local IP and the default gateway (servers on home and LAN setups are
+usually numbered next to them), then the rest of the subnet in numeric
+order. Candidates are generated lazily; only the few prioritized hosts are
+remembered to skip them in the final pass.
+
+``interleave_candidates`` merges the candidates of several interfaces into
+one probe stream: the prioritized hosts of every interface come before any
+subnet sweep, and interfaces take turns within each stage.
+"""
+
+import logging
+import time
+from ipaddress import IPv4Address, IPv4Network
+from typing import Iterator, List, Optional, Sequence
+
+PRIORITY_NEIGHBOUR: int = 0
+PRIORITY_NEAR: int = 1
+PRIORITY_SUBNET: int = 2
+
+PRIORITY_NAMES = {PRIORITY_NEIGHBOUR: "neighbour table", PRIORITY_NEAR: "near local/gateway",
+                  PRIORITY_SUBNET: "subnet sweep"}
+
+_ATF_COM = 0x2  # neighbour entry complete (resolved hardware address)
+
+
+def read_neighbour_table(interface: Optional[str] = None, path: str = "/proc/net/arp") -> List[str]:
+    """Return the IPv4 addresses of complete neighbour entries (optionally of one interface)."""
+    try:
+        with open(path) as arp:
+            lines = arp.read().splitlines()[1:]
+    except OSError:
+        return []
+    neighbours = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        try:
+            flags = int(fields[2], 16)
+        except ValueError:
+            continue
+        if flags & _ATF_COM and (interface is None or fields[5] == interface):
+            neighbours.append(fields[0])
+    return neighbours
+
+
+class OpenA3XXDiscoveryCandidates:
+    """Iterable of host strings in probe order, with a priority per host."""
+
+    def __init__(self, network: IPv4Network, local_ip: str, gateway: Optional[str] = None,
+                 neighbours: Optional[List[str]] = None, near_radius: int = 16):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.network = network
+        self._first = int(network.network_address) + (1 if network.num_addresses > 2 else 0)
+        self._last = int(network.broadcast_address) - (1 if network.num_addresses > 2 else 0)
+        self._priority = {}
+        for host in neighbours or []:
+            self._add(host, PRIORITY_NEIGHBOUR)
+        anchors = [a for a in (local_ip, gateway) if a and self._in_range(int(IPv4Address(a)))]
+        for distance in range(0, max(0, int(near_radius)) + 1):
+            for anchor in anchors:
+                for offset in ((0,) if distance == 0 else (distance, -distance)):
+                    value = int(IPv4Address(anchor)) + offset
+                    if self._in_range(value):
+                        self._add(str(IPv4Address(value)), PRIORITY_NEAR)
+        counts = [sum(1 for p in self._priority.values() if p == level)
+                  for level in (PRIORITY_NEIGHBOUR, PRIORITY_NEAR)]
+        self.logger.debug(f"Discovery candidates in {network}: {counts[0]} neighbours, {counts[1]} near "
+                          f"local/gateway, then subnet sweep")
+
+    def priority_of(self, host: str) -> int:
+        return self._priority.get(host, PRIORITY_SUBNET)
+
+    def prioritized(self) -> Iterator[str]:
+        # dict order: neighbours first, then near hosts by distance
+        return iter(self._priority)
+
+    def sweep(self) -> Iterator[str]:
+        prioritized = self._priority
+        for value in range(self._first, self._last + 1):
+            host = str(IPv4Address(value))
+            if host not in prioritized:
+                yield host
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.prioritized()
+        yield from self.sweep()
+
+    def __len__(self) -> int:
+        return max(0, self._last - self._first + 1)
+
+    def _in_range(self, value: int) -> bool:
+        return self._first <= value <= self._last
+
+    def _add(self, host: str, priority: int) -> None:
+        try:
+            value = int(IPv4Address(host))
+        except ValueError:
+            return
+        if self._in_range(value) and host not in self._priority:
+            self._priority[host] = priority
+
+
+class OpenA3XXInterfaceCandidates:
+    """Candidates of one interface plus its probe accounting for the discovery log."""
+
+    def __init__(self, interface: str, candidates: OpenA3XXDiscoveryCandidates):
+        self.interface = interface
+        self.candidates = candidates
+        self.issued = 0
+        self.exhausted_after: Optional[float] = None
+
+
+def interleave_candidates(interfaces: Sequence[OpenA3XXInterfaceCandidates]) -> Iterator[str]:
+    """Round-robin merge of the interfaces' candidates, prioritized stages first."""
+    started = time.monotonic()
+    for stage in ("prioritized", "sweep"):
+        active = [(entry, getattr(entry.candidates, stage)()) for entry in interfaces]
+        while active:
+            remaining = []
+            for entry, hosts in active:
+                host = next(hosts, None)
+                if host is None:
+                    if stage == "sweep":
+                        entry.exhausted_after = time.monotonic() - started
+                    continue
+                entry.issued += 1
+                remaining.append((entry, hosts))
+                yield host
+            active = remaining
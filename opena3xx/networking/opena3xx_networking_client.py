@@ -1,56 +1,166 @@
+import fnmatch
+import json
 import logging
+import os
 import socket
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from ipaddress import IPv4Network
-from typing import Optional, Tuple
+from ipaddress import IPv4Address, IPv4Network
+from pathlib import Path
+from typing import List, Optional, Tuple
 import time
 import netifaces as ni
 
 from opena3xx.exceptions import OpenA3XXNetworkingException
+from opena3xx.helpers import env_int
 from opena3xx.http import OpenA3xxHttpClient
+from opena3xx.models import API_ENDPOINT_CACHE_FILE, API_ENDPOINT_CACHE_PING_TIMEOUT_MS, API_SCAN_CONCURRENCY, \
+    API_SCAN_CONNECT_TIMEOUT_MS, API_SCAN_PING_TIMEOUT_MS, API_SCAN_NEAR_RADIUS, API_DISCOVERY_MODE, \
+    API_DISCOVERY_MODE_BEACON, API_DISCOVERY_MODE_SCAN, API_BEACON_PORT, API_BEACON_TIMEOUT_MS, API_SCAN_SKIP_INTERFACES
+from .opena3xx_beacon import OpenA3XXBeaconClient
+from .opena3xx_discovery_candidates import OpenA3XXDiscoveryCandidates, OpenA3XXInterfaceCandidates, \
+    PRIORITY_NAMES, interleave_candidates, read_neighbour_table
+from .opena3xx_subnet_scanner import OpenA3XXSubnetScanner
 
 
 class OpenA3XXNetworkingClient:
     """Discovers the Peripheral API on the local subnet and validates it.
 
-    The client determines the active interface via the default route, derives
-    the subnet from the interface netmask, scans for TCP port 5000, and
-    validates candidates by calling the API heartbeat endpoint.
+    The client derives the subnet of every IPv4 interface (default route
+    first) from its netmask, scans them together for TCP port 5000 with one
+    non-blocking connect scanner, and validates candidates by calling the API
+    heartbeat endpoint. Known neighbours and hosts next to the local IP and
+    gateway are probed before the rest of the subnet. In ``beacon`` mode a UDP
+    broadcast query is tried first and the scan is the fallback. The last
+    validated endpoint is cached on disk and re-checked with one quick ping
+    before any scan.
     """
 
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        # An empty OPENA3XX_API_ENDPOINT_CACHE disables the cache
+        cache_file = os.getenv("OPENA3XX_API_ENDPOINT_CACHE", API_ENDPOINT_CACHE_FILE).strip()
+        self._endpoint_cache = Path(cache_file) if cache_file else None
+        self._cache_ping_timeout = env_int("OPENA3XX_API_CACHE_PING_TIMEOUT_MS", API_ENDPOINT_CACHE_PING_TIMEOUT_MS,
+                                           self.logger) / 1000.0
+        self._scan_concurrency = env_int("OPENA3XX_API_SCAN_CONCURRENCY", API_SCAN_CONCURRENCY, self.logger)
+        self._scan_connect_timeout = env_int("OPENA3XX_API_SCAN_CONNECT_TIMEOUT_MS", API_SCAN_CONNECT_TIMEOUT_MS,
+                                             self.logger) / 1000.0
+        self._scan_ping_timeout = env_int("OPENA3XX_API_SCAN_PING_TIMEOUT_MS", API_SCAN_PING_TIMEOUT_MS,
+                                          self.logger) / 1000.0
+        self._scan_near_radius = env_int("OPENA3XX_API_SCAN_NEAR_RADIUS", API_SCAN_NEAR_RADIUS, self.logger)
+        self._scan_skip_interfaces = [p.strip() for p in os.getenv("OPENA3XX_API_SCAN_SKIP_INTERFACES",
+                                                                   API_SCAN_SKIP_INTERFACES).split(",") if p.strip()]
+        self.discovery_mode = os.getenv("OPENA3XX_API_DISCOVERY_MODE", API_DISCOVERY_MODE).strip().lower()
+        if self.discovery_mode not in (API_DISCOVERY_MODE_SCAN, API_DISCOVERY_MODE_BEACON):
+            self.logger.warning(f"Unknown API discovery mode '{self.discovery_mode}'; using '{API_DISCOVERY_MODE}'")
+            self.discovery_mode = API_DISCOVERY_MODE
+        self._beacon_client = OpenA3XXBeaconClient(
+            env_int("OPENA3XX_API_BEACON_PORT", API_BEACON_PORT, self.logger),
+            env_int("OPENA3XX_API_BEACON_TIMEOUT_MS", API_BEACON_TIMEOUT_MS, self.logger) / 1000.0)
+        self._beacon_targets = [t.strip() for t in os.getenv("OPENA3XX_API_BEACON_TARGETS", "").split(",") if t.strip()]
+        # One HTTP client (and its no-retry probe session) validates the cached
+        # endpoint, beacon replies and every scan candidate
+        self._ping_client = OpenA3xxHttpClient()
 
     def start_api_discovery(self) -> Tuple[str, str, int]:
         """Discover the API and return (scheme, host, port)."""
         try:
+            cached = self.__load_cached_endpoint()
+            if cached is not None and self.__revalidate_cached_endpoint(*cached):
+                return cached
+
             scheme = "http"
             port = 5000
             self.logger.info(f"Discovery parameters: scheme={scheme}, port={port}")
 
-            interface = self.__discover_default_interface()
-            local_ip, netmask = self.__discover_local_ip_and_netmask(interface)
-            network = self.__compute_network(local_ip, netmask)
-            self.logger.info(f"Scanning subnet {network} for OpenA3XX API on port {port}")
-            total_hosts_count = sum(1 for _ in network.hosts())
-            self.logger.info(f"Total hosts to scan: {total_hosts_count}")
+            interfaces = []
+            for interface, local_ip, netmask in self.__discover_ipv4_interfaces():
+                network = self.__compute_network(local_ip, netmask)
+                if any(entry.candidates.network == network for entry in interfaces):
+                    self.logger.debug(f"Skipping {interface}: subnet {network} already scanned")
+                    continue
+                candidates = OpenA3XXDiscoveryCandidates(network, local_ip, self.__discover_gateway(interface),
+                                                         read_neighbour_table(interface), self._scan_near_radius)
+                self.logger.info(f"Discovery subnet {network} on interface {interface}")
+                interfaces.append(OpenA3XXInterfaceCandidates(interface, candidates))
+
+            if self.discovery_mode == API_DISCOVERY_MODE_BEACON:
+                endpoint = self.__discover_via_beacon([entry.candidates.network for entry in interfaces])
+                if endpoint is not None:
+                    self.__store_cached_endpoint(*endpoint)
+                    return endpoint
+                self.logger.info("No validated beacon reply; falling back to subnet scan")
+
+            self.logger.info(f"Scanning for OpenA3XX API on port {port}")
+            self.logger.info(f"Total hosts to scan: {sum(len(entry.candidates) for entry in interfaces)} "
+                             f"on {len(interfaces)} interface(s)")
             t0 = time.monotonic()
-            host = self.__scan_network_for_api(scheme, network, port)
+            host = self.__scan_network_for_api(scheme, interfaces, port)
             duration = time.monotonic() - t0
             self.logger.info(f"Scan completed in {duration:.2f}s")
+            self.__log_interface_timing(interfaces, host, duration)
             if host:
+                self.__store_cached_endpoint(scheme, host, port)
                 return scheme, host, port
             self.logger.info("OpenA3XX API not found on local subnet; will retry after controller backoff")
             raise OpenA3XXNetworkingException("OpenA3XX API not found on local subnet")
         except Exception as ex:
             raise OpenA3XXNetworkingException(ex)
 
+    def __load_cached_endpoint(self) -> Optional[Tuple[str, str, int]]:
+        if self._endpoint_cache is None:
+            return None
+        try:
+            data = json.loads(self._endpoint_cache.read_text())
+            return str(data["scheme"]), str(data["host"]), int(data["port"])
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            self.logger.warning(f"Ignoring unreadable API endpoint cache {self._endpoint_cache}: {ex}")
+            return None
+
+    def __store_cached_endpoint(self, scheme: str, host: str, port: int) -> None:
+        if self._endpoint_cache is None:
+            return
+        try:
+            tmp = self._endpoint_cache.with_name(self._endpoint_cache.name + ".tmp")
+            tmp.write_text(json.dumps({"scheme": scheme, "host": host, "port": port, "validated_at": time.time()}))
+            os.replace(tmp, self._endpoint_cache)
+        except Exception as ex:
+            self.logger.warning(f"Failed caching API endpoint in {self._endpoint_cache}: {ex}")
+
+    def __revalidate_cached_endpoint(self, scheme: str, host: str, port: int) -> bool:
+        """Single short ping (no retries) of the cached endpoint; False means scan."""
+        t0 = time.monotonic()
+        try:
+            r = self._ping_client.send_ping_request(scheme, host, port, timeout=self._cache_ping_timeout,
+                                                    retry=False)
+            if r.status_code == 200:
+                self.logger.info(f"Cached API endpoint {scheme}://{host}:{port} validated in "
+                                 f"{(time.monotonic() - t0) * 1000:.0f} ms; skipping subnet scan")
+                return True
+            self.logger.info(f"Cached API endpoint {host}:{port} answered status={r.status_code}; scanning subnet")
+        except Exception as ex:
+            self.logger.info(f"Cached API endpoint {host}:{port} not reachable ({ex}); scanning subnet")
+        return False
+
+    def __discover_via_beacon(self, networks: List[IPv4Network]) -> Optional[Tuple[str, str, int]]:
+        """Broadcast a beacon query and return the first reply that answers the heartbeat ping."""
+        targets = self._beacon_targets or (
+            [str(network.broadcast_address) for network in networks if network.prefixlen < 31] + ["255.255.255.255"])
+        self.logger.info(f"Beacon discovery on UDP {self._beacon_client.beacon_port} via {', '.join(targets)}")
+        t0 = time.monotonic()
+        for scheme, host, port in self._beacon_client.replies(targets):
+            if self.__ping_request_target(scheme, host, port):
+                self.logger.info(f"API discovered by beacon in {(time.monotonic() - t0) * 1000:.0f} ms")
+                return scheme, host, port
+        return None
+
     def __ping_request_target(self, scheme: str, target_ip: str, target_port: int) -> bool:
         """Send a heartbeat ping to confirm a valid API is responding."""
         try:
-            http_client = OpenA3xxHttpClient(scheme, target_ip, target_port)
             self.logger.debug(f"Sending ping request to {scheme}://{target_ip}:{target_port}/core/heartbeat/ping")
-            r = http_client.send_ping_request(scheme, target_ip, target_port)
+            r = self._ping_client.send_ping_request(scheme, target_ip, target_port,
+                                                    timeout=self._scan_ping_timeout, retry=False)
             # Accept any HTTP 200 as success; log a snippet for diagnostics
             if r.status_code == 200:
                 snippet = (r.text or "")[:80].replace("\n", " ")
@@ -62,59 +172,89 @@ class OpenA3XXNetworkingClient:
             self.logger.critical(f"Ping error for {target_ip}:{target_port}: {ex}")
             return False
 
-    def __scan_network_for_api(self, scheme: str, network: IPv4Network, port: int) -> Optional[str]:
-        """Scan the subnet for a host accepting connections on the API port."""
+    def __scan_network_for_api(self, scheme: str, interfaces: List[OpenA3XXInterfaceCandidates],
+                               port: int) -> Optional[str]:
+        """Scan the subnets, in candidate priority order, for a host accepting connections on the API port.
+
+        All interfaces share one scanner, so the probe concurrency is a budget
+        for the whole scan rather than per interface.
+        """
         self.logger.info("Started Scanning Network")
-        max_workers = 64
-        # small pool to avoid overwhelming the Pi
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {}
-            total_hosts = 0
-            for ip in network.hosts():
-                future = executor.submit(self.__probe_host, str(ip), port)
-                futures[future] = str(ip)
-                total_hosts += 1
-            self.logger.debug(f"Submitted probes for {total_hosts} hosts")
-            processed = 0
-            for future in as_completed(futures):
-                host = futures[future]
-                try:
-                    open_port = future.result()
-                    processed += 1
-                    if processed % 64 == 0:
-                        self.logger.debug(f"Probes completed: {processed}/{total_hosts}")
-                    if open_port:
-                        self.logger.info(f"Found open port on {host}:{port}, verifying API ping")
-                        if self.__ping_request_target(scheme, host, port):
-                            return host
-                except Exception:
+        scanner = OpenA3XXSubnetScanner(port, self._scan_concurrency, self._scan_connect_timeout)
+        self.logger.debug(f"Probing up to {scanner.max_concurrency} hosts concurrently")
+        host = scanner.scan(interleave_candidates(interfaces),
+                            lambda candidate: self.__verify_open_host(scheme, candidate, port))
+        self.logger.info(f"Probed {scanner.hosts_scanned} hosts, {scanner.open_hosts} with port {port} open")
+        return host
+
+    def __log_interface_timing(self, interfaces: List[OpenA3XXInterfaceCandidates], host: Optional[str],
+                               duration: float) -> None:
+        for entry in interfaces:
+            candidates = entry.candidates
+            if host is not None and IPv4Address(host) in candidates.network:
+                outcome = f"API found at {host} ({PRIORITY_NAMES[candidates.priority_of(host)]}) after {duration:.2f}s"
+            elif entry.exhausted_after is not None:
+                outcome = f"all issued after {entry.exhausted_after:.2f}s, no API"
+            else:
+                outcome = "scan ended first"
+            self.logger.info(f"Interface {entry.interface} ({candidates.network}): "
+                             f"{entry.issued}/{len(candidates)} probes, {outcome}")
+
+    def __verify_open_host(self, scheme: str, host: str, port: int) -> bool:
+        self.logger.info(f"Found open port on {host}:{port}, verifying API ping")
+        return self.__ping_request_target(scheme, host, port)
+
+    def __discover_ipv4_interfaces(self) -> List[Tuple[str, str, str]]:
+        """Return (interface, ip, netmask) of every scannable IPv4 address, default route interface first.
+
+        Loopback and link-local (169.254/16) addresses are left out, and so are
+        interfaces matching OPENA3XX_API_SCAN_SKIP_INTERFACES (container and VM
+        bridges) unless they carry the default route.
+        """
+        default_interface = None
+        try:
+            default = ni.gateways().get('default', {})
+            if ni.AF_INET in default and default[ni.AF_INET]:
+                default_interface = default[ni.AF_INET][1]
+                self.logger.debug(f"Default IPv4 gateway interface detected: {default_interface}")
+        except Exception as ex:
+            self.logger.debug(f"Default gateway lookup failed: {ex}")
+        interfaces = ni.interfaces()
+        if default_interface in interfaces:
+            interfaces = [default_interface] + [i for i in interfaces if i != default_interface]
+        result = []
+        for interface in interfaces:
+            if interface != default_interface and any(fnmatch.fnmatchcase(interface, pattern)
+                                                      for pattern in self._scan_skip_interfaces):
+                self.logger.info(f"Skipping interface {interface}: matches OPENA3XX_API_SCAN_SKIP_INTERFACES")
+                continue
+            try:
+                addresses = ni.ifaddresses(interface).get(ni.AF_INET, [])
+            except ValueError:
+                # Interface disappeared since it was listed
+                continue
+            for address in addresses:
+                ip, netmask = address.get('addr'), address.get('netmask')
+                if not ip or not netmask or IPv4Address(ip).is_loopback:
                     continue
-        return None
+                if IPv4Address(ip).is_link_local:
+                    self.logger.info(f"Skipping link-local address {ip} on interface {interface}")
+                    continue
+                self.logger.info(f"Local IP {ip} with netmask {netmask} on interface {interface}")
+                result.append((interface, ip, netmask))
+        if not result:
+            raise RuntimeError("No IPv4 interface found")
+        return result
 
-    def __discover_default_interface(self) -> str:
-        """Return the interface name that has the default IPv4 gateway."""
-        gateways = ni.gateways()
-        default = gateways.get('default', {})
-        if ni.AF_INET in default and default[ni.AF_INET]:
-            iface = default[ni.AF_INET][1]
-            self.logger.debug(f"Default IPv4 gateway interface detected: {iface}")
-            return iface
-        # Fallback to first interface with IPv4
-        for interface in ni.interfaces():
-            addrs = ni.ifaddresses(interface)
-            if ni.AF_INET in addrs:
-                self.logger.debug(f"Falling back to first IPv4-capable interface: {interface}")
-                return interface
-        raise RuntimeError("No IPv4 interface found")
-
-    def __discover_local_ip_and_netmask(self, interface: str) -> tuple[str, str]:
-        """Return (ip, netmask) for the given interface."""
-        self.logger.info(f"Discovering Local IP and netmask on interface {interface}")
-        addrs = ni.ifaddresses(interface)
-        ip = addrs[ni.AF_INET][0]['addr']
-        netmask = addrs[ni.AF_INET][0]['netmask']
-        self.logger.info(f"Local IP {ip} with netmask {netmask}")
-        return ip, netmask
+    def __discover_gateway(self, interface: str) -> Optional[str]:
+        """Return the default IPv4 gateway if it is reached through the given interface."""
+        try:
+            default = ni.gateways().get('default', {}).get(ni.AF_INET)
+        except Exception:
+            return None
+        if default and default[1] == interface:
+            return default[0]
+        return None
 
     def __compute_network(self, ip: str, netmask: str) -> IPv4Network:
         """Compute the IPv4Network from an IP and dotted netmask string."""
@@ -124,18 +264,3 @@ class OpenA3XXNetworkingClient:
         network = IPv4Network(f"{ip}/{bits}", strict=False)
         self.logger.debug(f"Computed network {network} from ip={ip}, netmask={netmask} (/ {bits})")
         return network
-
-    @staticmethod
-    def __probe_host(host: str, port: int) -> bool:
-        """Attempt a TCP connect to (host, port); return True if open."""
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.settimeout(0.5)
-            result = s.connect_ex((host, int(port)))
-            if result == 0:
-                # Debug only on open to avoid log noise
-                logging.getLogger("OpenA3XXNetworkingClient").debug(f"TCP {port} open on {host}")
-                return True
-            return False
-        finally:
-            s.close()
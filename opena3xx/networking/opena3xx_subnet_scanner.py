@@ -0,0 +1,126 @@
+"""Single-threaded non-blocking TCP connect scanner.
+
+Candidates are consumed lazily from an iterator and probed with non-blocking
+``connect()`` calls multiplexed through ``selectors`` (epoll on Linux), so
+thousands of probes can be in flight from one thread while memory stays
+bounded by the concurrency limit. A host that accepts the connection is handed
+to a validate callback (the API heartbeat ping); the first validated host ends
+the scan and every outstanding probe is closed.
+"""
+
+import errno
+import logging
+import selectors
+import socket
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None
+
+_IN_PROGRESS = (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK)
+
+
+class OpenA3XXSubnetScanner:
+
+    def __init__(self, port: int, max_concurrency: int, connect_timeout: float):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.port = int(port)
+        self.max_concurrency = self._clip_to_fd_limit(max(1, int(max_concurrency)))
+        self.connect_timeout = max(0.01, float(connect_timeout))
+        self.hosts_scanned = 0
+        self.open_hosts = 0
+
+    def scan(self, candidates: Iterable[str], validate: Callable[[str], bool],
+             deadline: Optional[float] = None) -> Optional[str]:
+        """Probe candidates and return the first host that accepts and validates.
+
+        ``deadline`` is a ``time.monotonic()`` value after which the scan gives up.
+        """
+        selector = selectors.DefaultSelector()
+        # fd -> (socket, host, expiry); insertion order is expiry order because
+        # every probe gets the same timeout
+        in_flight: Dict[int, Tuple[socket.socket, str, float]] = {}
+        pending = iter(candidates)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.max_concurrency:
+                    host = next(pending, None)
+                    if host is None:
+                        exhausted = True
+                        break
+                    if self._start_probe(selector, in_flight, host) and validate(host):
+                        return host
+                if not in_flight:
+                    return None
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    self.logger.info("Subnet scan deadline reached")
+                    return None
+                oldest_expiry = next(iter(in_flight.values()))[2]
+                for key, _ in selector.select(max(0.0, oldest_expiry - now)):
+                    sock, host, _ = in_flight.pop(key.fd)
+                    selector.unregister(sock)
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    sock.close()
+                    if error == 0:
+                        self.open_hosts += 1
+                        self.logger.debug(f"TCP {self.port} open on {host}")
+                        if validate(host):
+                            return host
+                # Expire only after select, so connects that completed while a
+                # validation ping was blocking are still reported
+                now = time.monotonic()
+                while in_flight:
+                    fd, (sock, _, expiry) = next(iter(in_flight.items()))
+                    if expiry > now:
+                        break
+                    del in_flight[fd]
+                    selector.unregister(sock)
+                    sock.close()
+        finally:
+            for sock, _, _ in in_flight.values():
+                try:
+                    selector.unregister(sock)
+                except Exception:
+                    pass
+                sock.close()
+            selector.close()
+
+    def _start_probe(self, selector: selectors.BaseSelector, in_flight: dict, host: str) -> bool:
+        """Start a non-blocking connect; True if it connected immediately."""
+        self.hosts_scanned += 1
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            result = sock.connect_ex((host, self.port))
+        except OSError:
+            sock.close()
+            return False
+        if result in _IN_PROGRESS:
+            selector.register(sock, selectors.EVENT_WRITE)
+            in_flight[sock.fileno()] = (sock, host, time.monotonic() + self.connect_timeout)
+            return False
+        sock.close()
+        if result == 0:
+            self.open_hosts += 1
+            return True
+        return False
+
+    def _clip_to_fd_limit(self, concurrency: int) -> int:
+        if resource is None:
+            return concurrency
+        try:
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        except (OSError, ValueError):
+            return concurrency
+        if soft == resource.RLIM_INFINITY:
+            return concurrency
+        # Leave room for the descriptors the rest of the controller holds
+        limit = max(16, soft - 128)
+        if concurrency > limit:
+            self.logger.info(f"Subnet scan concurrency {concurrency} clipped to {limit} (open file limit {soft})")
+        return min(concurrency, limit)
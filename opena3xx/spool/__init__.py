@@ -0,0 +1,3 @@
+from .opena3xx_compaction import *
+from .opena3xx_event_log import *
+from .opena3xx_memory_queue import *
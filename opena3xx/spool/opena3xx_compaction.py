@@ -0,0 +1,52 @@
+"""Compaction policy for unpublished spool records.
+
+Records are keyed by ``input_selector_id`` (records without a key are never
+compacted). Per key the policy is one of:
+
+- ``none``: every record is kept (default).
+- ``latest``: a newer record for the same key supersedes unpublished older ones,
+  so only the latest state of the input is replayed.
+- ``ttl``: records older than the TTL when the publisher reaches them are dropped.
+"""
+
+from typing import Dict, Optional, Tuple
+
+COMPACTION_NONE: str = "none"
+COMPACTION_LATEST: str = "latest"
+COMPACTION_TTL: str = "ttl"
+COMPACTION_MODES = (COMPACTION_NONE, COMPACTION_LATEST, COMPACTION_TTL)
+
+
+class OpenA3XXCompactionPolicy:
+
+    def __init__(self, default_mode: str = COMPACTION_NONE, default_ttl_seconds: float = 0.0,
+                 overrides: Optional[Dict[int, Tuple[str, float]]] = None):
+        self._default = self._rule(default_mode, default_ttl_seconds)
+        self._overrides: Dict[int, Tuple[str, int]] = {
+            key: self._rule(mode, ttl_seconds) for key, (mode, ttl_seconds) in (overrides or {}).items()
+        }
+
+    @staticmethod
+    def _rule(mode: str, ttl_seconds: float) -> Tuple[str, int]:
+        if mode not in COMPACTION_MODES:
+            raise ValueError(f"Unknown spool compaction mode '{mode}'")
+        if mode == COMPACTION_TTL and ttl_seconds <= 0:
+            mode = COMPACTION_NONE
+        return mode, int(ttl_seconds * 1_000_000_000)
+
+    @property
+    def enabled(self) -> bool:
+        return self._default[0] != COMPACTION_NONE or any(
+            mode != COMPACTION_NONE for mode, _ in self._overrides.values())
+
+    def rule(self, key: int) -> Tuple[str, int]:
+        """Return (mode, ttl_ns) for a record key."""
+        return self._overrides.get(key, self._default)
+
+
+def parse_compaction_rule(spec: str, default_ttl_seconds: float) -> Tuple[str, float]:
+    """Parse ``none``, ``latest``, ``ttl`` or ``ttl:<seconds>``."""
+    mode, _, ttl = spec.strip().lower().partition(":")
+    if mode not in COMPACTION_MODES:
+        raise ValueError(f"Unknown spool compaction mode '{mode}'")
+    return mode, float(ttl) if ttl else default_ttl_seconds
@@ -0,0 +1,456 @@
+"""Segmented append-only write-ahead log for spooled hardware events.
+
+Events are appended as length-prefixed, CRC-checked records to segment files
+(``<first sequence>.seg``). Concurrent writers share fsyncs (group commit): the
+first writer to sync flushes every record written so far, later writers whose
+records are already covered return without another fsync. The consumer offset
+(next sequence to publish) is persisted in ``consumer.offset``; fully consumed
+segments are deleted. On startup the segments are scanned once, a torn tail
+record is truncated and reading resumes at the persisted offset, so events
+survive restarts with at-least-once delivery.
+
+Unconsumed records are tracked by an in-memory FIFO index of record locators
+(segment, file offset, length) built by that startup scan and extended by
+every append, so the reader never scans or lists files to find the next
+record.
+
+An optional compaction policy (see ``opena3xx_compaction``) marks unpublished
+records dead when a newer record for the same key supersedes them or when
+they outlive a TTL; dead records are skipped by the reader, and sealed
+segments holding no live record are deleted early.
+"""
+
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from opena3xx.models import EVENT_LOG_SEGMENT_BYTES, EVENT_LOG_OFFSET_COMMIT_MS
+from .opena3xx_compaction import OpenA3XXCompactionPolicy, COMPACTION_LATEST, COMPACTION_TTL
+
+# length, crc32, kind, key, timestamp_ns; the crc covers kind..payload
+_RECORD_HEADER = struct.Struct("<IIBiq")
+_CRC_COVERED = struct.Struct("<Biq")
+_SEGMENT_SUFFIX = ".seg"
+_OFFSET_FILE = "consumer.offset"
+
+# Record kinds (payload encodings)
+RECORD_KIND_JSON: int = 0
+RECORD_KIND_BINARY: int = 1
+
+NO_KEY: int = -1
+
+
+class OpenA3XXEventLogRecord:
+    __slots__ = ("seq", "kind", "key", "timestamp_ns", "payload")
+
+    def __init__(self, seq: int, kind: int, key: int, timestamp_ns: int, payload: bytes):
+        self.seq = seq
+        self.kind = kind
+        self.key = key
+        self.timestamp_ns = timestamp_ns
+        self.payload = payload
+
+
+class _Segment:
+    __slots__ = ("first_seq", "path", "size", "read_fd", "live")
+
+    def __init__(self, first_seq: int, path: Path, size: int = 0):
+        self.first_seq = first_seq
+        self.path = path
+        self.size = size
+        self.read_fd: Optional[int] = None
+        # Indexed records that were not compacted away
+        self.live = 0
+
+    def pread(self, length: int, offset: int) -> bytes:
+        if self.read_fd is None:
+            self.read_fd = os.open(self.path, os.O_RDONLY)
+        return os.pread(self.read_fd, length, offset)
+
+    def close_reader(self) -> None:
+        if self.read_fd is not None:
+            os.close(self.read_fd)
+            self.read_fd = None
+
+
+class _Locator:
+    """Position of one record's payload inside a segment."""
+
+    __slots__ = ("seq", "segment", "offset", "length", "kind", "key", "timestamp_ns", "dead")
+
+    def __init__(self, seq: int, segment: _Segment, offset: int, length: int, kind: int, key: int,
+                 timestamp_ns: int):
+        self.seq = seq
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.kind = kind
+        self.key = key
+        self.timestamp_ns = timestamp_ns
+        self.dead = False
+
+
+class OpenA3XXEventLog:
+    """Durable FIFO of event records with group commit and a persisted consumer offset."""
+
+    def __init__(self, directory: Path, segment_bytes: int = EVENT_LOG_SEGMENT_BYTES,
+                 offset_commit_ms: int = EVENT_LOG_OFFSET_COMMIT_MS,
+                 compaction: Optional[OpenA3XXCompactionPolicy] = None, sync_interval_ms: int = 0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._path = Path(directory)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = max(4096, int(segment_bytes))
+        self._offset_commit_ns = max(0, int(offset_commit_ms)) * 1_000_000
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._segments: List[_Segment] = []
+        self._write_fd: Optional[int] = None
+        self._next_seq = 0
+        self._written_seq = -1
+        self._durable_seq = -1
+        self._consumer_offset = 0
+        self._offset_committed = 0
+        self._offset_committed_at_ns = 0
+        # FIFO index of unconsumed records: not yet read, and read but not acknowledged
+        self._pending: Deque[_Locator] = deque()
+        self._in_flight: Deque[_Locator] = deque()
+        # Compaction: latest unread record per key, dead records still queued,
+        # and fully dead segments awaiting durability of the records superseding them
+        self._compaction = compaction if compaction is not None and compaction.enabled else None
+        self._latest_by_key: Dict[int, _Locator] = {}
+        self._dead_pending = 0
+        self._dead_segments: List[Tuple[_Segment, int]] = []
+        self.compacted_count = 0
+        self._recover()
+        # Periodic group fsync for appends made with sync=False
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        if sync_interval_ms > 0:
+            self._sync_thread = threading.Thread(target=self._periodic_sync_loop, args=(sync_interval_ms / 1000.0,),
+                                                 name="spool-fsync", daemon=True)
+            self._sync_thread.start()
+
+    # ----- Writer side -----
+    def append(self, payload: bytes, kind: int = RECORD_KIND_JSON, key: int = NO_KEY,
+               timestamp_ns: Optional[int] = None, sync: bool = True) -> int:
+        """Append one record and return its sequence number.
+
+        With ``sync`` the call returns once the record is on stable storage;
+        concurrent appenders share a single fsync. Raises ValueError once the
+        log is closed.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        covered = _CRC_COVERED.pack(kind, key, timestamp_ns)
+        crc = zlib.crc32(payload, zlib.crc32(covered))
+        record = _RECORD_HEADER.pack(len(payload), crc, kind, key, timestamp_ns) + payload
+        with self._lock:
+            if self._write_fd is None:
+                raise ValueError(f"Event spool {self._path} is closed; record not appended")
+            segment = self._segments[-1]
+            if segment.size and segment.size + len(record) > self._segment_bytes:
+                segment = self._roll_segment()
+            seq = self._next_seq
+            os.write(self._write_fd, record)
+            self._next_seq = seq + 1
+            self._written_seq = seq
+            self._index_locked(_Locator(seq, segment, segment.size + _RECORD_HEADER.size, len(payload),
+                                        kind, key, timestamp_ns))
+            segment.size += len(record)
+        if sync:
+            self.sync(seq)
+        return seq
+
+    def sync(self, seq: Optional[int] = None) -> None:
+        """Make every record up to ``seq`` (default: all written) durable."""
+        with self._sync_lock:
+            with self._lock:
+                target = self._written_seq
+                fd = self._write_fd
+            if seq is None:
+                seq = target
+            if self._durable_seq >= seq or fd is None:
+                # fd is None once closed: close() fsynced everything written
+                return
+            try:
+                os.fsync(fd)
+            except OSError:
+                # The segment was rolled (and fsynced) while we waited
+                if self._durable_seq >= seq:
+                    return
+                raise
+            self._durable_seq = max(self._durable_seq, target)
+            if self._dead_segments:
+                with self._lock:
+                    self._delete_dead_segments_locked()
+
+    def _periodic_sync_loop(self, interval: float) -> None:
+        while not self._sync_stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as ex:
+                self.logger.warning(f"Periodic spool fsync failed: {ex}")
+
+    def _roll_segment(self) -> _Segment:
+        # Caller holds self._lock; the sealed segment is fsynced before closing
+        os.fsync(self._write_fd)
+        self._durable_seq = max(self._durable_seq, self._written_seq)
+        os.close(self._write_fd)
+        segment = self._open_segment(self._next_seq)
+        self._segments.append(segment)
+        return segment
+
+    def _open_segment(self, first_seq: int) -> _Segment:
+        path = self._path / f"{first_seq:020d}{_SEGMENT_SUFFIX}"
+        self._write_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._fsync_directory()
+        return _Segment(first_seq, path, os.fstat(self._write_fd).st_size)
+
+    def _fsync_directory(self) -> None:
+        try:
+            fd = os.open(self._path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # ----- Reader side -----
+    def read(self, max_records: int = 1, max_bytes: Optional[int] = None,
+             uniform_kind: bool = False) -> List[OpenA3XXEventLogRecord]:
+        """Return up to max_records unread records in FIFO order.
+
+        With ``max_bytes`` reading stops before the payloads (plus one
+        separator byte each) would exceed it; with ``uniform_kind`` it stops
+        at the first record of another kind. At least one record is returned.
+        Returned records stay in flight until acknowledged (or rewound).
+        """
+        records: List[OpenA3XXEventLogRecord] = []
+        total = 0
+        with self._lock:
+            pending = self._pending
+            now_ns = time.time_ns() if self._compaction is not None else 0
+            while pending and len(records) < max_records:
+                if self._skip_compacted_locked(pending[0], now_ns):
+                    continue
+                if uniform_kind and records and pending[0].kind != records[0].kind:
+                    break
+                if max_bytes is not None:
+                    total += pending[0].length + 1
+                    if records and total > max_bytes:
+                        break
+                locator = pending.popleft()
+                self._in_flight.append(locator)
+                payload = locator.segment.pread(locator.length, locator.offset)
+                records.append(OpenA3XXEventLogRecord(locator.seq, locator.kind, locator.key,
+                                                      locator.timestamp_ns, payload))
+        return records
+
+    def _skip_compacted_locked(self, locator: _Locator, now_ns: int) -> bool:
+        """Drop the head of the queue if it is dead or expired; True if it was dropped."""
+        if self._compaction is None:
+            return False
+        if not locator.dead and locator.key != NO_KEY:
+            mode, ttl_ns = self._compaction.rule(locator.key)
+            if mode == COMPACTION_TTL and now_ns - locator.timestamp_ns > ttl_ns:
+                self._mark_dead_locked(locator, -1)
+        if self._latest_by_key.get(locator.key) is locator:
+            del self._latest_by_key[locator.key]
+        if not locator.dead:
+            return False
+        self._pending.popleft()
+        self._dead_pending -= 1
+        return True
+
+    def _index_locked(self, locator: _Locator) -> None:
+        """Queue a record for reading, compacting older unread records with the same key."""
+        locator.segment.live += 1
+        self._pending.append(locator)
+        if self._compaction is None or locator.key == NO_KEY:
+            return
+        if self._compaction.rule(locator.key)[0] != COMPACTION_LATEST:
+            return
+        previous = self._latest_by_key.get(locator.key)
+        if previous is not None:
+            self._mark_dead_locked(previous, locator.seq)
+        self._latest_by_key[locator.key] = locator
+
+    def _mark_dead_locked(self, locator: _Locator, superseded_by: int) -> None:
+        locator.dead = True
+        self._dead_pending += 1
+        self.compacted_count += 1
+        segment = locator.segment
+        segment.live -= 1
+        if segment.live == 0:
+            # Deleted once sealed and the superseding record is durable
+            self._dead_segments.append((segment, superseded_by))
+
+    def _delete_dead_segments_locked(self) -> None:
+        remaining = []
+        for segment, superseded_by in self._dead_segments:
+            if segment.live or segment not in self._segments:
+                continue
+            if segment is self._segments[-1] or superseded_by > self._durable_seq:
+                remaining.append((segment, superseded_by))
+                continue
+            self._segments.remove(segment)
+            segment.close_reader()
+            try:
+                segment.path.unlink()
+            except OSError as ex:
+                self.logger.warning(f"Failed deleting compacted segment {segment.path.name}: {ex}")
+        self._dead_segments = remaining
+
+    def rewind(self) -> None:
+        """Return every in-flight record to the front of the queue (e.g. after a failed publish)."""
+        with self._lock:
+            self._pending.extendleft(reversed(self._in_flight))
+            self._in_flight.clear()
+
+    def ack(self, seq: int) -> None:
+        """Mark every record up to and including ``seq`` as consumed."""
+        with self._lock:
+            if seq < self._consumer_offset:
+                return
+            in_flight = self._in_flight
+            while in_flight and in_flight[0].seq <= seq:
+                in_flight.popleft()
+            self._consumer_offset = seq + 1
+            now_ns = time.monotonic_ns()
+            if now_ns - self._offset_committed_at_ns >= self._offset_commit_ns:
+                self._commit_offset_locked(now_ns)
+
+    def commit_offset(self) -> None:
+        """Persist the consumer offset now (e.g. when the consumer goes idle)."""
+        with self._lock:
+            self._commit_offset_locked(time.monotonic_ns())
+
+    def _commit_offset_locked(self, now_ns: int) -> None:
+        if self._consumer_offset == self._offset_committed:
+            return
+        tmp = self._path / (_OFFSET_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(self._consumer_offset))
+        os.replace(tmp, self._path / _OFFSET_FILE)
+        self._offset_committed = self._consumer_offset
+        self._offset_committed_at_ns = now_ns
+        self._delete_consumed_segments_locked()
+        if self._dead_segments:
+            self._delete_dead_segments_locked()
+
+    def _delete_consumed_segments_locked(self) -> None:
+        # A sealed segment is consumed once the next segment starts at or
+        # below the committed offset
+        while len(self._segments) > 1 and self._segments[1].first_seq <= self._offset_committed:
+            segment = self._segments.pop(0)
+            segment.close_reader()
+            try:
+                segment.path.unlink()
+            except OSError as ex:
+                self.logger.warning(f"Failed deleting consumed segment {segment.path.name}: {ex}")
+
+    def unread_count(self) -> int:
+        """Number of records not yet handed out by read()."""
+        with self._lock:
+            return len(self._pending) - self._dead_pending
+
+    def pending_count(self) -> int:
+        """Number of records not yet acknowledged."""
+        with self._lock:
+            return len(self._pending) - self._dead_pending + len(self._in_flight)
+
+    def close(self) -> None:
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_thread.join(timeout=1.0)
+            self._sync_thread = None
+        with self._lock:
+            if self._write_fd is not None:
+                try:
+                    os.fsync(self._write_fd)
+                finally:
+                    os.close(self._write_fd)
+                    self._write_fd = None
+            for segment in self._segments:
+                segment.close_reader()
+            self._commit_offset_locked(time.monotonic_ns())
+
+    # ----- Recovery -----
+    def _recover(self) -> None:
+        offset_path = self._path / _OFFSET_FILE
+        try:
+            offset = int(offset_path.read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            offset = None
+
+        paths = sorted(p for p in self._path.iterdir() if p.suffix == _SEGMENT_SUFFIX)
+        next_seq = 0
+        for path in paths:
+            try:
+                first_seq = int(path.stem)
+            except ValueError:
+                continue
+            segment = _Segment(first_seq, path)
+            if offset is None:
+                offset = first_seq
+            count = self._scan_segment(segment, offset)
+            if segment.size < path.stat().st_size:
+                self.logger.warning(f"Truncating torn tail of spool segment {path.name} at byte {segment.size}")
+                with open(path, "r+b") as f:
+                    f.truncate(segment.size)
+            if count == 0 and self._segments:
+                path.unlink()
+                continue
+            self._segments.append(segment)
+            next_seq = first_seq + count
+        if offset is None:
+            offset = 0
+
+        if self._segments:
+            self._write_fd = os.open(self._segments[-1].path, os.O_WRONLY | os.O_APPEND)
+        else:
+            self._segments.append(self._open_segment(offset))
+            next_seq = offset
+        self._next_seq = max(next_seq, offset)
+        self._written_seq = self._durable_seq = self._next_seq - 1
+        self._consumer_offset = self._offset_committed = min(offset, self._next_seq)
+        self._delete_dead_segments_locked()
+        if self._pending:
+            self.logger.info(f"Recovered {len(self._pending) - self._dead_pending} spooled event(s) from "
+                             f"{len(self._segments)} segment(s), {self._dead_pending} compacted")
+
+    def _scan_segment(self, segment: _Segment, offset: int) -> int:
+        """Validate a segment, index its records at or after ``offset`` and return the record count.
+
+        ``segment.size`` is set to the length of the valid prefix.
+        """
+        count = 0
+        position = 0
+        with open(segment.path, "rb") as f:
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, crc, kind, key, timestamp_ns = _RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+                if zlib.crc32(payload, zlib.crc32(_CRC_COVERED.pack(kind, key, timestamp_ns))) != crc:
+                    break
+                seq = segment.first_seq + count
+                if seq >= offset:
+                    self._index_locked(_Locator(seq, segment, position + _RECORD_HEADER.size, length,
+                                                kind, key, timestamp_ns))
+                count += 1
+                position += _RECORD_HEADER.size + length
+        segment.size = position
+        return count
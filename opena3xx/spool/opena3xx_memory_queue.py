@@ -0,0 +1,84 @@
+"""Memory-only event queue with the OpenA3XXEventLog reader/writer interface.
+
+Used for the ``memory`` spool durability tier: appends never touch the disk,
+so events are lost on a crash or restart. The queue is a bounded ring buffer;
+when it is full the oldest unpublished event is dropped.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+from .opena3xx_event_log import OpenA3XXEventLogRecord, RECORD_KIND_JSON, NO_KEY
+
+
+class OpenA3XXMemoryEventQueue:
+
+    def __init__(self, capacity: int):
+        self._capacity = max(1, int(capacity))
+        self._lock = threading.Lock()
+        self._pending: Deque[OpenA3XXEventLogRecord] = deque()
+        self._in_flight: Deque[OpenA3XXEventLogRecord] = deque()
+        self._next_seq = 0
+        self.compacted_count = 0
+        self.dropped_count = 0
+
+    def append(self, payload: bytes, kind: int = RECORD_KIND_JSON, key: int = NO_KEY,
+               timestamp_ns: Optional[int] = None, sync: bool = False) -> int:
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq = seq + 1
+            if self._pending and len(self._pending) + len(self._in_flight) >= self._capacity:
+                self._pending.popleft()
+                self.dropped_count += 1
+            self._pending.append(OpenA3XXEventLogRecord(seq, kind, key, timestamp_ns, payload))
+        return seq
+
+    def sync(self, seq: Optional[int] = None) -> None:
+        pass
+
+    def read(self, max_records: int = 1, max_bytes: Optional[int] = None,
+             uniform_kind: bool = False) -> List[OpenA3XXEventLogRecord]:
+        records: List[OpenA3XXEventLogRecord] = []
+        total = 0
+        with self._lock:
+            pending = self._pending
+            while pending and len(records) < max_records:
+                if uniform_kind and records and pending[0].kind != records[0].kind:
+                    break
+                if max_bytes is not None:
+                    total += len(pending[0].payload) + 1
+                    if records and total > max_bytes:
+                        break
+                record = pending.popleft()
+                self._in_flight.append(record)
+                records.append(record)
+        return records
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._pending.extendleft(reversed(self._in_flight))
+            self._in_flight.clear()
+
+    def ack(self, seq: int) -> None:
+        with self._lock:
+            in_flight = self._in_flight
+            while in_flight and in_flight[0].seq <= seq:
+                in_flight.popleft()
+
+    def commit_offset(self) -> None:
+        pass
+
+    def unread_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._in_flight)
+
+    def close(self) -> None:
+        pass
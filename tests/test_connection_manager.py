@@ -0,0 +1,96 @@
+"""Circuit breaker of the AMQP connections (opena3xx/amqp/opena3xx_connection_manager.py)."""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from opena3xx.amqp import opena3xx_connection_manager as connection_manager
+from opena3xx.amqp.opena3xx_connection_manager import OpenA3XXConnectionManager, CIRCUIT_OPEN, \
+    CIRCUIT_HALF_OPEN, CIRCUIT_CLOSED
+
+
+class _Broker:
+    """Stands in for pika.BlockingConnection: connects only while up."""
+
+    def __init__(self):
+        self.up = False
+
+    def connect(self, _parameters):
+        if not self.up:
+            raise ConnectionError("broker down")
+        return mock.Mock()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+class ConnectionManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.broker = _Broker()
+        patcher = mock.patch.object(connection_manager.pika, "BlockingConnection", side_effect=self.broker.connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stop_event = threading.Event()
+        self.manager = OpenA3XXConnectionManager(lambda: None, self.stop_event, failure_threshold=2,
+                                                 initial_backoff_s=0.02, max_backoff_s=0.05)
+        self.addCleanup(self._stop)
+
+    def _stop(self):
+        self.stop_event.set()
+        self.manager.stop()
+
+    def _open_circuit(self):
+        for _ in range(self.manager.failure_threshold):
+            self.manager.record_failure(ConnectionError("publish failed"))
+        self.assertEqual(self.manager.state, CIRCUIT_OPEN)
+
+    def test_opens_after_threshold_and_closes_after_probe_and_success(self):
+        self.manager.record_failure(ConnectionError("publish failed"))
+        self.assertEqual(self.manager.state, CIRCUIT_CLOSED)
+        self._open_circuit()
+        self.assertFalse(self.manager.wait_until_available(timeout=0.05))
+
+        self.broker.up = True
+        self.assertTrue(self.manager.wait_until_available(timeout=2.0))
+        self.assertEqual(self.manager.state, CIRCUIT_HALF_OPEN)
+        self.manager.record_success()
+        self.assertEqual(self.manager.state, CIRCUIT_CLOSED)
+        self.assertEqual(self.manager.get_metrics()["open_count"], 1)
+
+    def test_failure_right_after_successful_probe_keeps_probing(self):
+        self._open_circuit()
+        original_info = self.manager.logger.info
+        failed_in_window = threading.Event()
+
+        def fail_after_probe(message, *args, **kwargs):
+            # Runs on the probe thread after HALF_OPEN is set but before it
+            # returns: the released publisher fails again in that window
+            if "probe succeeded" in message and not failed_in_window.is_set():
+                failed_in_window.set()
+                self.broker.up = False
+                self.manager.record_failure(ConnectionError("publish failed again"))
+            original_info(message, *args, **kwargs)
+
+        with mock.patch.object(self.manager.logger, "info", side_effect=fail_after_probe):
+            self.broker.up = True
+            self.assertTrue(_wait_for(failed_in_window.is_set))
+            self.assertEqual(self.manager.state, CIRCUIT_OPEN)
+            probes = self.manager.get_metrics()["probe_count"]
+
+            # A new probe thread must take over and recover the circuit
+            self.assertTrue(_wait_for(lambda: self.manager.get_metrics()["probe_count"] > probes))
+            self.broker.up = True
+            self.assertTrue(self.manager.wait_until_available(timeout=2.0))
+        self.assertEqual(self.manager.state, CIRCUIT_HALF_OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Crash recovery of the segmented event spool (opena3xx/spool/opena3xx_event_log.py).
+
+A crash is simulated by copying the spool directory while the log is still
+open: the copy holds exactly what a restart would find on disk.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from opena3xx.spool import OpenA3XXEventLog
+
+# Offsets are only persisted on commit_offset()/close() within this window
+_NO_AUTO_COMMIT_MS = 3_600_000
+
+
+def _payload(i: int) -> bytes:
+    return f'{{"event": {i}}}'.encode("utf-8")
+
+
+class EventLogRecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.mkdtemp(prefix="opena3xx-spool-test-")
+        self.spool_dir = Path(self._tmp) / "spool"
+        self.logs = []
+
+    def tearDown(self):
+        for log in self.logs:
+            try:
+                log.close()
+            except Exception:
+                pass
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _open(self, directory: Path, **kwargs) -> OpenA3XXEventLog:
+        kwargs.setdefault("offset_commit_ms", _NO_AUTO_COMMIT_MS)
+        log = OpenA3XXEventLog(directory, **kwargs)
+        self.logs.append(log)
+        return log
+
+    def _crash_image(self, name: str = "restart") -> Path:
+        image = Path(self._tmp) / name
+        shutil.copytree(self.spool_dir, image)
+        return image
+
+    def _drain(self, log: OpenA3XXEventLog) -> list:
+        records = []
+        while True:
+            batch = log.read(16)
+            if not batch:
+                return records
+            records.extend(batch)
+            log.ack(batch[-1].seq)
+
+    def _segments(self, directory: Path) -> list:
+        return sorted(directory.glob("*.seg"))
+
+    def test_replay_resumes_at_committed_offset(self):
+        log = self._open(self.spool_dir)
+        for i in range(10):
+            log.append(_payload(i))
+        for record in log.read(4):
+            log.ack(record.seq)
+        log.commit_offset()
+        # Acknowledged after the last commit: inside the commit window
+        log.ack(log.read(2)[-1].seq)
+
+        restarted = self._open(self._crash_image())
+        records = self._drain(restarted)
+        self.assertEqual([r.seq for r in records], list(range(4, 10)))
+        self.assertEqual([r.payload for r in records], [_payload(i) for i in range(4, 10)])
+
+    def test_torn_tail_is_truncated_and_appends_continue(self):
+        log = self._open(self.spool_dir)
+        for i in range(5):
+            log.append(_payload(i))
+        log.ack(log.read(2)[-1].seq)
+        log.commit_offset()
+
+        image = self._crash_image()
+        segment = self._segments(image)[-1]
+        intact_size = segment.stat().st_size
+        # Cut the last record in the middle of its payload
+        with open(segment, "r+b") as f:
+            f.truncate(intact_size - 3)
+
+        restarted = self._open(image)
+        self.assertLess(segment.stat().st_size, intact_size - 3)
+        self.assertEqual(restarted.append(_payload(99)), 4)
+        records = self._drain(restarted)
+        self.assertEqual([r.seq for r in records], [2, 3, 4])
+        self.assertEqual([r.payload for r in records], [_payload(2), _payload(3), _payload(99)])
+
+    def test_torn_header_is_truncated(self):
+        log = self._open(self.spool_dir)
+        for i in range(3):
+            log.append(_payload(i))
+        image = self._crash_image()
+        segment = self._segments(image)[-1]
+        with open(segment, "ab") as f:
+            f.write(b"\x10\x00\x00")  # partial header of a record that never made it
+
+        restarted = self._open(image)
+        self.assertEqual([r.payload for r in self._drain(restarted)], [_payload(i) for i in range(3)])
+
+    def test_corrupted_record_ends_the_valid_prefix(self):
+        log = self._open(self.spool_dir)
+        for i in range(4):
+            log.append(_payload(i))
+        image = self._crash_image()
+        segment = self._segments(image)[-1]
+        data = bytearray(segment.read_bytes())
+        data[-2] ^= 0xFF  # flip a payload byte of the last record: CRC mismatch
+        segment.write_bytes(bytes(data))
+
+        restarted = self._open(image)
+        self.assertEqual([r.seq for r in self._drain(restarted)], [0, 1, 2])
+
+    def test_recovery_across_segments_without_loss_or_duplication(self):
+        log = self._open(self.spool_dir, segment_bytes=4096)
+        payloads = [_payload(i) + b" " * 200 for i in range(100)]
+        for payload in payloads:
+            log.append(payload)
+        self.assertGreater(len(self._segments(self.spool_dir)), 2)
+
+        consumed = []
+        while len(consumed) < 60:
+            batch = log.read(7)
+            consumed.extend(batch)
+            log.ack(batch[-1].seq)
+        committed = consumed[-1].seq + 1
+        log.commit_offset()
+        consumed.extend(log.read(5))
+        log.ack(consumed[-1].seq)
+
+        # Segments consumed before the committed offset are deleted
+        first_seqs = [int(p.stem) for p in self._segments(self.spool_dir)]
+        self.assertLessEqual(first_seqs[0], committed)
+        self.assertTrue(all(later > committed for later in first_seqs[1:]))
+
+        image = self._crash_image()
+        segment = self._segments(image)[-1]
+        with open(segment, "r+b") as f:
+            f.truncate(segment.stat().st_size - 50)
+
+        restarted = self._open(image, segment_bytes=4096)
+        replayed = self._drain(restarted)
+        # Replay starts at the committed offset: only the commit window is delivered twice
+        self.assertEqual(replayed[0].seq, committed)
+        self.assertEqual([r.seq for r in replayed], list(range(committed, 99)))
+        self.assertEqual([r.payload for r in replayed], payloads[committed:99])
+        self.assertEqual(restarted.pending_count(), 0)
+
+    def test_clean_close_commits_the_offset(self):
+        log = self._open(self.spool_dir)
+        for i in range(6):
+            log.append(_payload(i))
+        log.ack(log.read(3)[-1].seq)
+        log.close()
+        self.logs.remove(log)
+
+        restarted = self._open(self.spool_dir)
+        self.assertEqual([r.seq for r in self._drain(restarted)], [3, 4, 5])
+
+    def test_append_after_close_raises(self):
+        log = self._open(self.spool_dir)
+        log.append(_payload(0))
+        log.close()
+        self.logs.remove(log)
+        with self.assertRaisesRegex(ValueError, "closed"):
+            log.append(_payload(1))
+        log.sync()
+
+
+if __name__ == "__main__":
+    unittest.main()
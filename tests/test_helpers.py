@@ -0,0 +1,31 @@
+"""Environment setting helpers (opena3xx/helpers/opena3xx_helpers.py)."""
+
+import os
+import unittest
+from unittest import mock
+
+from opena3xx.helpers import env_int, env_float
+
+
+class EnvSettingTest(unittest.TestCase):
+
+    def test_unset_uses_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(env_int("OPENA3XX_TEST_SETTING", 7), 7)
+            self.assertEqual(env_float("OPENA3XX_TEST_SETTING", 2.5), 2.5)
+
+    def test_valid_value_is_parsed(self):
+        with mock.patch.dict(os.environ, {"OPENA3XX_TEST_SETTING": "42"}):
+            self.assertEqual(env_int("OPENA3XX_TEST_SETTING", 7), 42)
+            self.assertEqual(env_float("OPENA3XX_TEST_SETTING", 2.5), 42.0)
+
+    def test_invalid_value_warns_and_falls_back(self):
+        with mock.patch.dict(os.environ, {"OPENA3XX_TEST_SETTING": "fast"}):
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertEqual(env_int("OPENA3XX_TEST_SETTING", 7), 7)
+                self.assertEqual(env_float("OPENA3XX_TEST_SETTING", 2.5), 2.5)
+        self.assertIn("OPENA3XX_TEST_SETTING", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""OpenA3XX Peripheral API beacon responder.
+
+Answers the hardware controllers' UDP discovery broadcast
+(``OPENA3XX_API_DISCOVERY_MODE=beacon``) with the API endpoint, so they find
+the API without scanning the subnet. Run it on the machine hosting the API,
+or locally as a stand-in when testing discovery. Standalone: standard library
+only, no OpenA3XX imports.
+
+Protocol (JSON datagrams, see opena3xx/networking/opena3xx_beacon.py):
+    query: {"type": "opena3xx.discover", "version": 1}
+    reply: {"type": "opena3xx.api", "version": 1, "scheme": "http", "host": "<api host>", "port": 5000}
+
+Usage:
+    python tools/beacon_responder.py [--api-host HOST] [--api-port 5000] [--scheme http] [--beacon-port 5099]
+
+Without --api-host the reply names the local address that routes to the
+querying controller.
+"""
+
+import argparse
+import json
+import logging
+import socket
+
+QUERY_TYPE = "opena3xx.discover"
+REPLY_TYPE = "opena3xx.api"
+PROTOCOL_VERSION = 1
+
+
+def local_address_towards(peer_ip: str) -> str:
+    """Source address the kernel would use to reach peer_ip (no packet is sent)."""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect((peer_ip, 9))
+        return probe.getsockname()[0]
+    except OSError:
+        return ""
+    finally:
+        probe.close()
+
+
+def serve(bind: str, beacon_port: int, scheme: str, api_host: str, api_port: int) -> None:
+    logger = logging.getLogger("beacon_responder")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((bind, beacon_port))
+    logger.info(f"Answering OpenA3XX discovery queries on UDP {bind}:{beacon_port}")
+    while True:
+        try:
+            data, (peer_ip, peer_port) = sock.recvfrom(2048)
+        except OSError as ex:
+            # e.g. ICMP port unreachable from an earlier reply; keep serving
+            logger.warning(f"Receive failed: {ex}")
+            continue
+        try:
+            query = json.loads(data.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            continue
+        if not isinstance(query, dict) or query.get("type") != QUERY_TYPE:
+            continue
+        host = api_host or local_address_towards(peer_ip)
+        reply = {"type": REPLY_TYPE, "version": PROTOCOL_VERSION, "scheme": scheme, "port": api_port}
+        if host:
+            # Without a host the controller uses the reply's source address
+            reply["host"] = host
+        try:
+            sock.sendto(json.dumps(reply).encode("utf-8"), (peer_ip, peer_port))
+        except OSError as ex:
+            logger.warning(f"Reply to {peer_ip}:{peer_port} failed: {ex}")
+            continue
+        logger.info(f"Query from {peer_ip}:{peer_port} -> {scheme}://{host or '<source address>'}:{api_port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenA3XX Peripheral API beacon responder")
+    parser.add_argument("--api-host", default="", help="API host to announce (default: address facing the controller)")
+    parser.add_argument("--api-port", type=int, default=5000)
+    parser.add_argument("--scheme", default="http", choices=("http", "https"))
+    parser.add_argument("--beacon-port", type=int, default=5099)
+    parser.add_argument("--bind", default="0.0.0.0")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    try:
+        serve(args.bind, args.beacon_port, args.scheme, args.api_host, args.api_port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()